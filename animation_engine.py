@@ -2,13 +2,13 @@
 Animation Engine with Cubic Easing
 """
 
-import time
 import numpy as np
 
 
 class AnimationEngine:
     def __init__(self):
         self.active_animations = []
+        self.current_time = None  # App clock at the last update
     
     def ease_in_out_cubic(self, t):
         """Cubic ease-in-out easing function"""
@@ -41,12 +41,12 @@ class AnimationEngine:
     def create_animation(self, duration, start_value, end_value, 
                         easing="ease_in_out", callback=None):
         """
-        Create a new animation
+        Create a new animation, starting at the time of the last update
         Returns animation ID
         """
         animation = {
             'id': len(self.active_animations),
-            'start_time': time.time(),
+            'start_time': self.current_time,
             'duration': duration,
             'start_value': start_value,
             'end_value': end_value,
@@ -58,13 +58,15 @@ class AnimationEngine:
         self.active_animations.append(animation)
         return animation['id']
     
-    def update(self):
-        """Update all active animations"""
-        current_time = time.time()
+    def update(self, current_time):
+        """Update all active animations to current_time (the app clock, seconds)"""
+        self.current_time = current_time
         
         for anim in self.active_animations[:]:
             if anim['complete']:
                 continue
+            if anim['start_time'] is None:
+                anim['start_time'] = current_time  # Created before the first update
             
             elapsed = current_time - anim['start_time']
             progress = min(elapsed / anim['duration'], 1.0)
@@ -0,0 +1,377 @@
+"""
+AirMenu Benchmark - Headless Screen Rendering
+Replays scripted cursor and pinch traces through every screen without a
+camera or window, and reports frame times, memory and allocations
+"""
+
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from collections import namedtuple
+
+import cv2
+import numpy as np
+from config import *
+from cart_manager import CartManager
+from state_manager import StateManager, ScreenState
+from billing_engine import BillingEngine
+from data.menu_data import get_categories
+from screens.home_screen import HomeScreen
+from screens.category_screen import CategoryScreen
+from screens.items_screen import ItemsScreen
+from screens.cart_screen import CartScreen
+from screens.receipt_screen import ReceiptScreen
+from profiler import profiler
+from quality_governor import governor, QUALITY_TIERS
+from ui_framework.parallel import band_compositor
+from ui_framework.render_scale import render_scaler
+
+try:
+    import resource
+except ImportError:  # Not available on Windows; peak RSS is reported as None
+    resource = None
+
+
+# One frame of input: cursor position (or None) and whether a pinch fires
+TraceStep = namedtuple('TraceStep', ['cursor', 'pinch'])
+
+# Scripted cursor paths per screen: waypoints visited in order, with a
+# pinch on arrival where marked. Pinches only hit controls that keep the
+# screen active (add to cart, quantity +/-), so each trace stays on its screen
+SCENARIOS = {
+    ScreenState.HOME: [
+        ((200, 200), False), ((640, 420), False), ((1080, 600), False),
+        ((640, 300), False), ((200, 600), False),
+    ],
+    ScreenState.CATEGORY: [
+        ((400, 240), False), ((680, 240), False), ((680, 450), False),
+        ((400, 450), False), ((900, 650), False),
+    ],
+    ScreenState.ITEMS: [
+        ((300, 180), False), ((1195, 180), True), ((600, 315), False),
+        ((1195, 315), True), ((900, 600), False),
+    ],
+    ScreenState.CART: [
+        ((300, 170), False), ((1185, 170), True), ((1100, 170), True),
+        ((640, 650), False), ((300, 400), False),
+    ],
+    ScreenState.RECEIPT: [
+        ((640, 200), False), ((640, 400), False), ((400, 660), False),
+        ((900, 660), False), ((640, 300), False),
+    ],
+}
+
+# Items placed in the cart before the cart and receipt scenarios
+SAMPLE_CART = [(1, 2), (2, 1), (6, 1), (7, 3), (12, 1)]
+
+
+def build_trace(waypoints, frames, frames_per_leg=20):
+    """Interpolate waypoints into a looping per-frame trace of TraceSteps"""
+    legs = []
+    for i, (start, _) in enumerate(waypoints):
+        end, pinch = waypoints[(i + 1) % len(waypoints)]
+        for step in range(1, frames_per_leg + 1):
+            t = step / frames_per_leg
+            cursor = (
+                int(round(start[0] + (end[0] - start[0]) * t)),
+                int(round(start[1] + (end[1] - start[1]) * t)),
+            )
+            legs.append(TraceStep(cursor, pinch and step == frames_per_leg))
+    return [legs[i % len(legs)] for i in range(frames)]
+
+
+def synthetic_frames(count=8, seed=0):
+    """Smooth noise backgrounds that drift between frames, like a camera feed"""
+    rng = np.random.default_rng(seed)
+    noise = rng.integers(0, 256, (SCREEN_HEIGHT, SCREEN_WIDTH, 3), dtype=np.uint8)
+    base = cv2.GaussianBlur(noise, (31, 31), 0)
+    return [np.roll(base, i * 7, axis=1) for i in range(count)]
+
+
+def video_frames(path, limit=300):
+    """Frames from a recorded video, resized to the screen"""
+    cap = cv2.VideoCapture(path)
+    frames = []
+    while len(frames) < limit:
+        ret, frame = cap.read()
+        if not ret:
+            break
+        frames.append(cv2.resize(frame, (SCREEN_WIDTH, SCREEN_HEIGHT)))
+    cap.release()
+    if not frames:
+        raise RuntimeError(f"Could not read frames from {path}")
+    return frames
+
+
+def percentiles(values):
+    """Summary of a list of per-frame values"""
+    values = np.asarray(values, dtype=np.float64)
+    p50, p95, p99 = np.percentile(values, (50, 95, 99))
+    return {
+        'mean': float(values.mean()),
+        'p50': float(p50),
+        'p95': float(p95),
+        'p99': float(p99),
+        'max': float(values.max()),
+    }
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process in MB, or None if unknown"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+class HeadlessRuntime:
+    """The demo_mouse loop without a window, driven by a scripted trace"""
+
+    def __init__(self, backgrounds):
+        self.backgrounds = backgrounds
+        self.canvas = np.empty_like(backgrounds[0])
+
+        self.cart_manager = CartManager()
+        self.state_manager = StateManager()
+        self.screens = {
+            ScreenState.HOME: HomeScreen(self.state_manager, self.cart_manager),
+            ScreenState.CATEGORY: CategoryScreen(self.state_manager, self.cart_manager),
+            ScreenState.ITEMS: ItemsScreen(self.state_manager, self.cart_manager),
+            ScreenState.CART: CartScreen(self.state_manager, self.cart_manager),
+            ScreenState.RECEIPT: ReceiptScreen(self.state_manager, self.cart_manager),
+        }
+        self.current_screen = None
+        self.previous_state = None
+        self.frame_index = 0
+
+    def enter(self, state):
+        """Reset the app and open a screen with the data it needs"""
+        self.state_manager.reset()
+        self.cart_manager.clear()
+        if state in (ScreenState.CART, ScreenState.RECEIPT):
+            for item_id, quantity in SAMPLE_CART:
+                self.cart_manager.add_item(item_id, quantity)
+        if state == ScreenState.ITEMS:
+            self.state_manager.selected_category = get_categories()[0]
+        if state == ScreenState.RECEIPT:
+            self.state_manager.receipt_data = BillingEngine.generate_receipt(
+                self.cart_manager.get_items()
+            )
+        self.state_manager.current_state = state
+
+        if self.current_screen:
+            self.current_screen.on_exit()
+        self.current_screen = self.screens[state]
+        self.current_screen.on_enter()
+        self.previous_state = state
+
+    def handle_screen_transition(self):
+        """Handle screen state transitions"""
+        if self.state_manager.current_state != self.previous_state:
+            self.current_screen.on_exit()
+            self.current_screen = self.screens[self.state_manager.current_state]
+            self.current_screen.on_enter()
+            self.previous_state = self.state_manager.current_state
+
+    def step(self, trace_step):
+        """Run one frame; returns the name of the screen that rendered it"""
+        background = self.backgrounds[self.frame_index % len(self.backgrounds)]
+        np.copyto(self.canvas, background)
+        # Virtual clock so dwell timing does not depend on machine speed
+        current_time = self.frame_index / FPS_TARGET
+        self.frame_index += 1
+
+        self.state_manager.update(current_time)
+        self.handle_screen_transition()
+        screen = self.current_screen
+
+        screen.update([trace_step.cursor] if trace_step.cursor else [], current_time)
+        canvas = screen.render(self.canvas)
+
+        if trace_step.pinch and trace_step.cursor:
+            screen.handle_pinch(trace_step.cursor, current_time)
+
+        if trace_step.cursor:
+            cv2.circle(canvas, trace_step.cursor, 15, COLOR_PRIMARY, -1)
+            cv2.circle(canvas, trace_step.cursor, 5, COLOR_TEXT, -1)
+        return type(screen).__name__
+
+
+def run_scenario(runtime, state, frames, warmup, alloc_frames):
+    """Time one screen's trace, then measure its allocations separately"""
+    trace = build_trace(SCENARIOS[state], warmup + frames + alloc_frames)
+    runtime.enter(state)
+    screen_name = type(runtime.current_screen).__name__
+
+    for trace_step in trace[:warmup]:
+        runtime.step(trace_step)
+
+    # Timed pass (tracemalloc off: it slows every allocation)
+    profiler.reset()
+    frame_ms = []
+    off_screen = 0
+    for trace_step in trace[warmup:warmup + frames]:
+        start = time.perf_counter()
+        rendered = runtime.step(trace_step)
+        frame_ms.append((time.perf_counter() - start) * 1000)
+        if rendered != screen_name:
+            off_screen += 1
+
+    stages = {
+        name: {key: round(value, 4) if isinstance(value, float) else value
+               for key, value in stats.items()}
+        for name, stats in profiler.get_stats().items()
+    }
+
+    # Allocation pass: tracemalloc cannot count blocks that are already
+    # freed, so report each frame's transient peak and what it retained
+    peak_kb = []
+    retained_kb = []
+    if alloc_frames:
+        tracemalloc.start()
+        for trace_step in trace[warmup + frames:]:
+            tracemalloc.reset_peak()
+            before, _ = tracemalloc.get_traced_memory()
+            runtime.step(trace_step)
+            after, peak = tracemalloc.get_traced_memory()
+            peak_kb.append((peak - before) / 1024)
+            retained_kb.append((after - before) / 1024)
+        tracemalloc.stop()
+
+    result = {
+        'frames': frames,
+        'off_screen_frames': off_screen,
+        'frame_ms': percentiles(frame_ms),
+        'stages_ms': stages,
+    }
+    if alloc_frames:
+        result['alloc_peak_kb'] = percentiles(peak_kb)
+        result['alloc_retained_kb'] = percentiles(retained_kb)
+    return screen_name, result
+
+
+def run_benchmark(frames=120, warmup=10, alloc_frames=20, video=None, seed=0, quality=0,
+                  workers=RENDER_WORKERS, scale=RENDER_SCALE):
+    """Run every screen's trace and collect the results"""
+    # Fixed quality tier so runs are comparable
+    governor.enabled = False
+    governor.set_level(quality)
+    band_compositor.set_workers(workers)
+    render_scaler.set_scale(scale)
+
+    # The camera background arrives at the internal render resolution
+    backgrounds = video_frames(video) if video else synthetic_frames(seed=seed)
+    backgrounds = [render_scaler.downscale(background) for background in backgrounds]
+    runtime = HeadlessRuntime(backgrounds)
+
+    screens = {}
+    for state in ScreenState:
+        screen_name, result = run_scenario(runtime, state, frames, warmup, alloc_frames)
+        screens[screen_name] = result
+
+    return {
+        'meta': {
+            'screen': [SCREEN_WIDTH, SCREEN_HEIGHT],
+            'frames_per_screen': frames,
+            'background': video or 'synthetic',
+            'quality': governor.tier.name,
+            'render_workers': band_compositor.workers,
+            'render_scale': render_scaler.scale,
+            'python': platform.python_version(),
+            'opencv': cv2.__version__,
+            'numpy': np.__version__,
+            'platform': platform.platform(),
+        },
+        'peak_rss_mb': peak_rss_mb(),
+        'screens': screens,
+    }
+
+
+def compare_results(results, baseline, threshold, metrics=('p50', 'p95')):
+    """
+    Compare frame times against a baseline
+    Returns a list of regressions slower than baseline * (1 + threshold)
+    """
+    regressions = []
+    for screen_name, result in results['screens'].items():
+        base = baseline.get('screens', {}).get(screen_name)
+        if base is None:
+            continue
+        for metric in metrics:
+            current = result['frame_ms'][metric]
+            reference = base['frame_ms'][metric]
+            if current > reference * (1 + threshold):
+                regressions.append(
+                    f"{screen_name} {metric}: {current:.2f} ms vs "
+                    f"{reference:.2f} ms baseline (+{(current / reference - 1) * 100:.0f}%)"
+                )
+    return regressions
+
+
+def print_report(results):
+    """Print a per-screen summary table"""
+    print(f"{'Screen':<16} {'mean':>7} {'p50':>7} {'p95':>7} {'p99':>7} {'max':>7} {'alloc KB':>9}")
+    for screen_name, result in results['screens'].items():
+        ms = result['frame_ms']
+        alloc = result.get('alloc_peak_kb', {}).get('p50')
+        alloc_text = f"{alloc:9.0f}" if alloc is not None else f"{'-':>9}"
+        print(
+            f"{screen_name:<16} {ms['mean']:7.2f} {ms['p50']:7.2f} {ms['p95']:7.2f} "
+            f"{ms['p99']:7.2f} {ms['max']:7.2f} {alloc_text}"
+        )
+    if results['peak_rss_mb'] is not None:
+        print(f"Peak RSS: {results['peak_rss_mb']:.1f} MB")
+
+
+def main():
+    """Entry point"""
+    parser = argparse.ArgumentParser(description="Headless AirMenu rendering benchmark")
+    parser.add_argument('--frames', type=int, default=120, help="timed frames per screen")
+    parser.add_argument('--warmup', type=int, default=10, help="untimed frames per screen")
+    parser.add_argument('--alloc-frames', type=int, default=20,
+                        help="frames traced for allocations per screen (0 to skip)")
+    parser.add_argument('--video', help="recorded video to use as the camera background")
+    parser.add_argument('--seed', type=int, default=0, help="seed for synthetic backgrounds")
+    parser.add_argument('--quality', type=int, default=0,
+                        choices=range(len(QUALITY_TIERS)),
+                        help="quality tier to render at (0 = best)")
+    parser.add_argument('--workers', type=int, default=RENDER_WORKERS,
+                        help="band-parallel compositing threads (0 = serial)")
+    parser.add_argument('--scale', type=float, default=RENDER_SCALE,
+                        help="internal render resolution (1.0 = screen)")
+    parser.add_argument('--output', help="write the results JSON here (e.g. for --baseline)")
+    parser.add_argument('--baseline', help="results JSON to compare against")
+    parser.add_argument('--threshold', type=float, default=0.15,
+                        help="allowed slowdown vs baseline (0.15 = 15%%)")
+    args = parser.parse_args()
+
+    results = run_benchmark(
+        args.frames, args.warmup, args.alloc_frames, args.video, args.seed, args.quality,
+        args.workers, args.scale
+    )
+    print_report(results)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"Results written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare_results(results, baseline, args.threshold)
+        if regressions:
+            print(f"Regressions beyond {args.threshold * 100:.0f}%:")
+            for regression in regressions:
+                print(f"  {regression}")
+            return 1
+        print(f"No regressions beyond {args.threshold * 100:.0f}% of baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,152 @@
+"""
+Threaded Camera Capture
+Reads frames on a dedicated thread into a latest-frame slot so the
+render loop never waits on the camera
+"""
+
+import threading
+import time
+from collections import namedtuple
+
+import cv2
+from profiler import profiler
+
+
+# A frame as delivered by the capture thread
+CapturedFrame = namedtuple('CapturedFrame', ['frame', 'seq', 'timestamp'])
+
+
+class CameraCapture:
+    # Reads in a row that may fail before the camera is considered lost
+    MAX_CONSECUTIVE_FAILURES = 30
+
+    def __init__(self, source, width=None, height=None):
+        self.cap = cv2.VideoCapture(source)
+        if width:
+            self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, width)
+        if height:
+            self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, height)
+
+        # Latest-frame slot (guarded by the condition)
+        self._cond = threading.Condition()
+        self._latest = None
+        self._consumed_seq = 0
+        self._seq = 0
+
+        # Stats
+        self.dropped_frames = 0
+        self.failed_reads = 0
+        self.consecutive_failures = 0
+        self.capture_fps = 0.0
+        self._fps_count = 0
+        self._fps_start_time = time.time()
+
+        self._running = False
+        self._thread = None
+
+    def is_opened(self):
+        """Check if the underlying camera is available"""
+        return self.cap.isOpened()
+
+    def start(self):
+        """Start the capture thread"""
+        if self._running:
+            return self
+        self._running = True
+        self._thread = threading.Thread(
+            target=self._capture_loop, name="CameraCapture", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def _capture_loop(self):
+        """Continuously read frames into the latest-frame slot"""
+        while self._running:
+            with profiler.section('capture.read'):
+                ret, frame = self.cap.read()
+            timestamp = time.time()
+
+            if not ret:
+                self.failed_reads += 1
+                self.consecutive_failures += 1
+                with self._cond:
+                    self._cond.notify_all()
+                time.sleep(0.005)
+                continue
+
+            self.consecutive_failures = 0
+            with self._cond:
+                # The previous frame was never picked up by the consumer
+                if self._latest is not None and self._latest.seq > self._consumed_seq:
+                    self.dropped_frames += 1
+
+                self._seq += 1
+                self._latest = CapturedFrame(frame, self._seq, timestamp)
+                self._cond.notify_all()
+
+            self._update_capture_fps(timestamp)
+
+    def _update_capture_fps(self, timestamp):
+        """Calculate capture FPS over one-second windows"""
+        self._fps_count += 1
+        elapsed = timestamp - self._fps_start_time
+        if elapsed >= 1.0:
+            self.capture_fps = self._fps_count / elapsed
+            self._fps_count = 0
+            self._fps_start_time = timestamp
+
+    def read_latest(self, last_seq=0, timeout=0.0):
+        """
+        Get the newest captured frame
+        If nothing newer than last_seq is available, waits up to timeout
+        seconds for one and then returns the newest frame anyway.
+        Returns a CapturedFrame, or None if no frame has arrived yet
+        """
+        with self._cond:
+            if timeout > 0 and (self._latest is None or self._latest.seq <= last_seq):
+                self._cond.wait_for(
+                    lambda: not self._running or
+                    (self._latest is not None and self._latest.seq > last_seq),
+                    timeout
+                )
+
+            latest = self._latest
+            if latest is not None:
+                self._consumed_seq = max(self._consumed_seq, latest.seq)
+            return latest
+
+    def is_healthy(self):
+        """Check that the capture thread is running and the camera delivers frames"""
+        return (self._running and
+                self.consecutive_failures < self.MAX_CONSECUTIVE_FAILURES)
+
+    def is_finished(self):
+        """A live camera never runs out of frames (see ReplayCapture)"""
+        return False
+    
+    def now(self):
+        """The app clock (seconds): wall time, the timeline frames are captured on"""
+        return time.time()
+
+    def get_stats(self):
+        """Get capture statistics"""
+        return {
+            'frames_captured': self._seq,
+            'dropped_frames': self.dropped_frames,
+            'failed_reads': self.failed_reads,
+            'capture_fps': self.capture_fps,
+        }
+
+    def stop(self):
+        """Stop the capture thread"""
+        self._running = False
+        with self._cond:
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+
+    def release(self):
+        """Stop capturing and release the camera"""
+        self.stop()
+        self.cap.release()
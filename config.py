@@ -7,25 +7,60 @@ Central configuration for all constants and parameters
 SCREEN_WIDTH = 1280
 SCREEN_HEIGHT = 720
 FPS_TARGET = 30
+RENDER_SCALE = 1.0  # Background/effect resolution vs the screen (e.g. 0.5, 0.75)
 
 # Camera Settings
 CAMERA_INDEX = 0
 FLIP_CAMERA = True  # Flip for mirror effect
+CAPTURE_WAIT_TIMEOUT = 1.0 / FPS_TARGET  # Max wait for a new frame (seconds)
 
 # Hand Tracking Settings
 HAND_DETECTION_CONFIDENCE = 0.7
 HAND_TRACKING_CONFIDENCE = 0.5
-MAX_HANDS = 1
+MAX_HANDS = 2  # Each hand gets its own cursor (people ordering side by side)
+TRACK_MATCH_DISTANCE = 0.25  # Farthest a palm may move between results and keep its track (normalized)
+TRACK_MAX_MISSES = 3  # Results a hand may be missing before its track is dropped
+NEW_HAND_SEARCH_INTERVAL = 15  # Inferences between full-frame searches for more hands
+ASYNC_INFERENCE = True  # Track the next frame while the current one renders
+TRACKING_ROI_ENABLED = False  # Crop inference input around the last hand (static image mode; measured slower than video mode)
+INFERENCE_SIZE = 256  # Longest side (px) of the hand region sent to the model
+ROI_PADDING = 0.5  # Padding around the hand box, as a fraction of its size
+ROI_MIN_SIZE = 160  # Smallest region (screen px) to crop around a hand
+SEARCH_SCALE = 0.5  # Full-frame search resolution when the hand is lost
+TRACKING_SCHEDULER = True  # Follow fingertips with optical flow between inferences
+TRACKING_MIN_INTERVAL = 1  # Frames between inferences while the hand moves fast
+TRACKING_MAX_INTERVAL = 4  # Frames between inferences while the hand is nearly still
+TRACKING_FAST_MOTION = 0.02  # Frame widths per frame that count as fast motion
+FLOW_PATCH_MARGIN = 40  # Screen pixels of context around the tracked points
+FLOW_WINDOW = 15  # Lucas-Kanade search window (screen px)
+FLOW_PYRAMID_LEVELS = 2  # Extra pyramid levels for larger motion
+FLOW_MAX_DRIFT = 1.5  # Screen pixels a point may miss its start by when flowed back
 
 # Gesture Parameters
 HOVER_THRESHOLD_PX = 50  # Distance to consider hovering
 DWELL_TIME_SECONDS = 0.8  # Time to hold for dwell select
 PINCH_THRESHOLD = 0.05  # Distance between thumb and index for pinch
 INTERACTION_COOLDOWN = 0.3  # Seconds between interactions
+GESTURE_HISTORY_SIZE = 32  # Landmark samples kept for temporal gestures
+SWIPE_DISTANCE = 0.25  # Fraction of screen width the palm must travel
+SWIPE_WINDOW = 0.4  # Seconds - the travel must happen within this time
+SWIPE_COOLDOWN = 0.8  # Seconds between swipes
+SCROLL_ARM_FRAMES = 3  # Samples in the two-finger pose before scrolling starts
+OPEN_PALM_HOLD = 0.6  # Seconds to hold a still open palm to cancel
+OPEN_PALM_MAX_SPEED = 0.3  # Screen widths per second that still count as still
+FIST_HOLD = 0.3  # Seconds to hold a fist to grab
 
 # Smoothing Parameters
 SMOOTHING_FACTOR = 0.7  # Exponential moving average factor (0-1)
 JITTER_THRESHOLD = 5  # Pixels - movement below this is ignored
+CURSOR_FILTER = 'one_euro'  # 'ema', 'one_euro' or 'kalman'
+ONE_EURO_MIN_CUTOFF = 1.0  # Hz - smoothing while the hand is still
+ONE_EURO_BETA = 0.02  # Cutoff increase per pixel/s of hand speed
+ONE_EURO_D_CUTOFF = 1.0  # Hz - smoothing of the speed estimate
+KALMAN_PROCESS_NOISE = 5.0e4  # Acceleration noise density (px^2/s^3)
+KALMAN_MEASUREMENT_NOISE = 8.0  # Landmark position noise (px)
+CURSOR_PREDICTION = True  # Extrapolate the cursor to the expected display time (not with 'ema')
+CURSOR_MAX_PREDICTION = 0.12  # Seconds - cap on how far ahead to extrapolate
 
 # Color Scheme (BGR format for OpenCV)
 COLOR_PRIMARY = (255, 140, 50)  # Vibrant orange
@@ -43,6 +78,35 @@ GLASS_BLUR_AMOUNT = 21  # Must be odd number
 GLASS_ALPHA = 0.15  # Background transparency
 GLASS_BORDER_ALPHA = 0.3  # Border transparency
 GLOW_INTENSITY = 0.6  # Glow effect strength
+BACKDROP_PYRAMID = False  # Blur large glass kernels at half resolution
+BACKDROP_PYRAMID_MIN_KERNEL = 21  # Smallest kernel that uses the pyramid
+BACKDROP_TILE_SIZE = (160, 90)  # Backdrop blur is computed lazily per tile
+
+# Quality Governor
+QUALITY_GOVERNOR_ENABLED = True  # Lower effect quality when frames run over budget
+QUALITY_START_LEVEL = 0  # 0 = full quality
+QUALITY_WINDOW = 30  # Frames averaged for each decision
+QUALITY_DOWNGRADE_AT = 0.9  # Step down above this fraction of the frame budget
+QUALITY_UPGRADE_AT = 0.6  # Step up below this fraction of the frame budget
+QUALITY_HOLD_FRAMES = 60  # Minimum frames between quality changes
+
+# Render Caches
+LAYER_CACHE_MAX_BYTES = 32 * 1024 * 1024  # Static gradient/background layers
+SPRITE_CACHE_MAX_BYTES = 48 * 1024 * 1024  # Pre-rendered card/button chrome
+
+# Parallel Rendering
+RENDER_WORKERS = 0  # Threads for band-parallel compositing (0 = serial)
+RENDER_BAND_MIN_ROWS = 90  # Smallest band worth handing to another thread
+
+# Hit Testing
+HIT_GRID_CELL_SIZE = 64  # Pixels per hit-test grid cell
+
+# Scrolling Lists
+LIST_OVERSCAN_ROWS = 1  # Rows kept bound beyond each edge of the viewport
+SCROLL_DRAG_SLOP = 12  # Pixels a pinch must move before it scrolls
+SCROLL_FRICTION = 4.0  # Momentum decay rate (1/s)
+SCROLL_MIN_VELOCITY = 40  # Momentum stops below this (pixels/s)
+SCROLL_MAX_VELOCITY = 3000  # Fling speed cap (pixels/s)
 
 # Animation Settings
 ANIMATION_DURATION_FAST = 0.2  # seconds
@@ -69,6 +133,17 @@ FONT_SCALE_SMALL = 0.7
 FONT_THICKNESS = 2
 FONT_THICKNESS_THIN = 1
 
+# Text Rendering
+TEXT_ATLAS_MAX_BYTES = 8 * 1024 * 1024  # Cached text and icon masks
+UNICODE_FONT_PATHS = [  # First font found renders non-ASCII glyphs (needs Pillow)
+    "C:/Windows/Fonts/Nirmala.ttf",
+    "C:/Windows/Fonts/arial.ttf",
+    "/System/Library/Fonts/Supplemental/Arial Unicode.ttf",
+    "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",
+    "/usr/share/fonts/truetype/DejaVuSans.ttf",
+]
+GLYPH_FALLBACKS = {"₹": "Rs."}  # Used when no font has the glyph
+
 # Billing Settings
 GST_RATE = 0.18  # 18% GST
 RESTAURANT_NAME = "AirMenu Restaurant"
@@ -78,3 +153,14 @@ CURRENCY_SYMBOL = "₹"
 SHOW_FPS = True
 SHOW_HAND_LANDMARKS = False  # Set to True for debugging
 SHOW_CURSOR = True
+
+# Profiling
+PROFILER_ENABLED = True  # Per-stage timings (cheap enough to leave on)
+PROFILER_HUD = False  # On-screen p50/p95/p99 overlay (toggle with 'p')
+PROFILER_WINDOW = 300  # Frames of history for the rolling percentiles
+PROFILER_TRACE_PATH = None  # e.g. "airmenu_trace.json" to export a Chrome trace on exit
+PROFILER_MAX_TRACE_EVENTS = 200000  # Oldest trace events are dropped past this
+
+# Session Recording
+RECORD_CHUNK_FRAMES = 300  # Frames per compressed chunk in a recording
+RECORD_FRAME_QUALITY = 85  # JPEG quality of camera frames kept in a recording
@@ -0,0 +1,181 @@
+"""
+Cursor Filters
+Smooth the fingertip position from timestamped landmark measurements and
+extrapolate it to the time the frame will actually be displayed
+"""
+
+import math
+
+import numpy as np
+from config import *
+
+
+class CursorFilter:
+    """
+    filter(x, y, timestamp) takes a measurement in pixels (timestamp in
+    seconds, when the camera captured it) and returns the smoothed
+    position; the same measurement may be passed again on later frames
+    predict(timestamp) extrapolates the smoothed position to a later time
+    """
+
+    def reset(self):
+        """Forget the previous hand (call when it is lost)"""
+        self.position = None
+
+    def filter(self, x, y, timestamp):
+        raise NotImplementedError("Subclasses must implement filter()")
+
+    def predict(self, timestamp):
+        """Smoothed position at timestamp (no extrapolation by default)"""
+        return self.position
+
+
+class EMAFilter(CursorFilter):
+    """
+    Fixed exponential moving average with a dead zone against jitter
+    It has no velocity estimate, so predict() can't extrapolate
+    """
+
+    def __init__(self, alpha=SMOOTHING_FACTOR, jitter=JITTER_THRESHOLD):
+        self.alpha = alpha
+        self.jitter = jitter
+        self.reset()
+
+    def reset(self):
+        super().reset()
+        self._timestamp = None
+
+    def filter(self, x, y, timestamp):
+        if self.position is not None:
+            if timestamp <= self._timestamp:
+                return self.position  # Already filtered this measurement
+            prev_x, prev_y = self.position
+            x = int(self.alpha * x + (1 - self.alpha) * prev_x)
+            y = int(self.alpha * y + (1 - self.alpha) * prev_y)
+
+            # Movement below the threshold is ignored
+            if abs(x - prev_x) < self.jitter and abs(y - prev_y) < self.jitter:
+                x, y = prev_x, prev_y
+
+        self.position = (x, y)
+        self._timestamp = timestamp
+        return self.position
+
+
+class OneEuroFilter(CursorFilter):
+    """
+    Low-pass filter whose cutoff rises with speed: heavy smoothing while
+    the hand is nearly still, little lag while it moves fast
+    (Casiez et al., "1 Euro Filter", CHI 2012)
+    """
+
+    def __init__(self, min_cutoff=ONE_EURO_MIN_CUTOFF, beta=ONE_EURO_BETA,
+                 d_cutoff=ONE_EURO_D_CUTOFF):
+        self.min_cutoff = min_cutoff  # Hz, at rest
+        self.beta = beta  # Cutoff increase per pixel/s of speed
+        self.d_cutoff = d_cutoff  # Hz, for the speed estimate
+        self.reset()
+
+    def reset(self):
+        super().reset()
+        self._value = None  # Filtered position as floats
+        self._velocity = np.zeros(2)  # Filtered pixels/s
+        self._timestamp = None
+
+    @staticmethod
+    def _alpha(cutoff, dt):
+        tau = 1.0 / (2 * math.pi * cutoff)
+        return 1.0 / (1.0 + tau / dt)
+
+    def filter(self, x, y, timestamp):
+        measured = np.array((x, y), dtype=np.float64)
+        if self._value is None:
+            self._value = measured
+            self._timestamp = timestamp
+        elif timestamp > self._timestamp:
+            dt = timestamp - self._timestamp
+            velocity = (measured - self._value) / dt
+            a = self._alpha(self.d_cutoff, dt)
+            self._velocity = a * velocity + (1 - a) * self._velocity
+
+            cutoff = self.min_cutoff + self.beta * np.abs(self._velocity)
+            a = self._alpha(cutoff, dt)
+            self._value = a * measured + (1 - a) * self._value
+            self._timestamp = timestamp
+
+        self.position = (int(self._value[0]), int(self._value[1]))
+        return self.position
+
+    def predict(self, timestamp):
+        if self._value is None:
+            return None
+        ahead = max(0.0, timestamp - self._timestamp)
+        x, y = self._value + self._velocity * ahead
+        return (int(x), int(y))
+
+
+class KalmanFilter(CursorFilter):
+    """
+    Constant-velocity Kalman filter per axis. Both axes share one model
+    and the same measurement times, so they share one covariance
+    """
+
+    def __init__(self, process_noise=KALMAN_PROCESS_NOISE,
+                 measurement_noise=KALMAN_MEASUREMENT_NOISE):
+        self.process_noise = process_noise  # Acceleration noise density (px^2/s^3)
+        self.measurement_noise = measurement_noise  # Landmark noise (px)
+        self.reset()
+
+    def reset(self):
+        super().reset()
+        self._state = None  # Rows: position, velocity; columns: x, y
+        self._covariance = None
+        self._timestamp = None
+
+    def filter(self, x, y, timestamp):
+        measured = np.array((x, y), dtype=np.float64)
+        if self._state is None:
+            self._state = np.array([measured, np.zeros(2)])
+            self._covariance = np.diag([self.measurement_noise ** 2, 1000.0 ** 2])
+            self._timestamp = timestamp
+        elif timestamp > self._timestamp:
+            dt = timestamp - self._timestamp
+            transition = np.array([[1.0, dt], [0.0, 1.0]])
+            q = self.process_noise
+            noise = q * np.array([[dt ** 3 / 3, dt ** 2 / 2], [dt ** 2 / 2, dt]])
+
+            # Predict to the measurement time
+            state = transition @ self._state
+            covariance = transition @ self._covariance @ transition.T + noise
+
+            # Correct with the measured position
+            gain = covariance[:, 0] / (covariance[0, 0] + self.measurement_noise ** 2)
+            self._state = state + np.outer(gain, measured - state[0])
+            self._covariance = covariance - np.outer(gain, covariance[0])
+            self._timestamp = timestamp
+
+        self.position = (int(self._state[0, 0]), int(self._state[0, 1]))
+        return self.position
+
+    def predict(self, timestamp):
+        if self._state is None:
+            return None
+        ahead = max(0.0, timestamp - self._timestamp)
+        x, y = self._state[0] + self._state[1] * ahead
+        return (int(x), int(y))
+
+
+CURSOR_FILTERS = {
+    'ema': EMAFilter,
+    'one_euro': OneEuroFilter,
+    'kalman': KalmanFilter,
+}
+
+
+def create_cursor_filter(name=CURSOR_FILTER):
+    """Build the cursor filter configured by name"""
+    if name not in CURSOR_FILTERS:
+        raise ValueError(
+            f"Unknown cursor filter '{name}' (expected one of {', '.join(CURSOR_FILTERS)})"
+        )
+    return CURSOR_FILTERS[name]()
@@ -14,20 +14,25 @@ from screens.category_screen import CategoryScreen
 from screens.items_screen import ItemsScreen
 from screens.cart_screen import CartScreen
 from screens.receipt_screen import ReceiptScreen
+from ui_framework.render_scale import render_scaler
 from utils import setup_logging
 
 
 # Global mouse position
 mouse_pos = None
 mouse_clicked = False
+mouse_down = False
 
 
 def mouse_callback(event, x, y, flags, param):
     """Mouse callback for OpenCV window"""
-    global mouse_pos, mouse_clicked
+    global mouse_pos, mouse_clicked, mouse_down
     mouse_pos = (x, y)
     if event == cv2.EVENT_LBUTTONDOWN:
         mouse_clicked = True
+        mouse_down = True
+    elif event == cv2.EVENT_LBUTTONUP:
+        mouse_down = False
 
 
 class AirMenuDemo:
@@ -56,6 +61,7 @@ class AirMenuDemo:
         self.current_screen = self.screens[ScreenState.HOME]
         self.current_screen.on_enter()
         self.previous_state = None
+        self.dragging = False  # Left button is being held
         
         # FPS tracking
         self.fps = 0
@@ -96,23 +102,24 @@ class AirMenuDemo:
         
         try:
             while True:
-                # Create a dark gradient background
-                frame = np.zeros((self.frame_height, self.frame_width, 3), dtype=np.uint8)
+                # Create a dark gradient background (at the internal render resolution)
+                internal_w, internal_h = render_scaler.internal_size
+                frame = np.zeros((internal_h, internal_w, 3), dtype=np.uint8)
                 
                 # Create canvas for rendering
                 canvas = frame.copy()
                 
+                # Get current time
+                current_time = time.time()
+                
                 # Update state manager
-                self.state_manager.update()
+                self.state_manager.update(current_time)
                 
                 # Handle screen transitions
                 self.handle_screen_transition()
                 
-                # Get current time
-                current_time = time.time()
-                
                 # Update current screen with mouse position
-                self.current_screen.update(mouse_pos, current_time)
+                self.current_screen.update([mouse_pos] if mouse_pos else [], current_time)
                 
                 # Render current screen
                 canvas = self.current_screen.render(canvas)
@@ -122,6 +129,14 @@ class AirMenuDemo:
                     self.current_screen.handle_pinch(mouse_pos, current_time)
                     mouse_clicked = False
                 
+                # Dragging with the button held (e.g. scrolls lists)
+                if mouse_down and mouse_pos:
+                    self.current_screen.handle_drag(mouse_pos, current_time)
+                    self.dragging = True
+                elif self.dragging:
+                    self.current_screen.handle_drag_end(current_time)
+                    self.dragging = False
+                
                 # Draw mouse cursor
                 if mouse_pos:
                     cv2.circle(canvas, mouse_pos, 15, COLOR_PRIMARY, -1)
@@ -182,6 +197,7 @@ def main():
     print("\nControls:")
     print("  - Move mouse to navigate")
     print("  - Click to interact with buttons")
+    print("  - Drag to scroll item lists")
     print("  - Hover over buttons to see dwell animation")
     print("  - Press ESC to exit")
     print("  - Press R to reset to home")
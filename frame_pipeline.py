@@ -0,0 +1,88 @@
+"""
+Frame Pipeline
+Turns raw camera frames into the render canvas using preallocated
+buffers, so the main loop makes no large allocations in steady state
+"""
+
+import cv2
+import numpy as np
+from ui_framework.parallel import band_compositor
+
+
+class FramePipeline:
+    def __init__(self, width, height, flip=True):
+        self.width = width
+        self.height = height
+        self.flip = flip
+
+        # Canvas the screens render onto
+        self.canvas = None
+
+        # Fused flip + resize maps, built for the last seen camera size
+        self._map_source_size = None
+        self._map1 = None
+        self._map2 = None
+
+        # Number of buffer (re)allocations, for steady-state checks
+        self.allocations = 0
+        self.frames = 0
+
+    def _ensure_canvas(self):
+        if self.canvas is None:
+            self.canvas = np.empty((self.height, self.width, 3), dtype=np.uint8)
+            self.allocations += 1
+
+    def _ensure_maps(self, src_w, src_h):
+        """Build remap tables that resize and mirror in a single pass"""
+        if self._map_source_size == (src_w, src_h):
+            return
+
+        # Same pixel-center mapping as cv2.resize with INTER_LINEAR
+        xs = (np.arange(self.width, dtype=np.float32) + 0.5) * (src_w / self.width) - 0.5
+        ys = (np.arange(self.height, dtype=np.float32) + 0.5) * (src_h / self.height) - 0.5
+        if self.flip:
+            xs = xs[::-1]
+
+        map_x = np.ascontiguousarray(np.broadcast_to(xs, (self.height, self.width)))
+        map_y = np.ascontiguousarray(np.broadcast_to(ys[:, None], (self.height, self.width)))
+        self._map1, self._map2 = cv2.convertMaps(map_x, map_y, cv2.CV_16SC2)
+        self._map_source_size = (src_w, src_h)
+        self.allocations += 1
+
+    def prepare(self, raw_frame):
+        """
+        Mirror and resize a camera frame into the canvas
+        Returns the canvas; it is overwritten by the next call
+        """
+        self._ensure_canvas()
+        self.frames += 1
+        src_h, src_w = raw_frame.shape[:2]
+
+        if (src_w, src_h) == (self.width, self.height):
+            # Camera already delivers the target size: no resize
+            if self.flip:
+                band_compositor.run(
+                    lambda a, b: cv2.flip(raw_frame[a:b], 1, dst=self.canvas[a:b]),
+                    0, self.height
+                )
+            else:
+                band_compositor.copy(self.canvas, raw_frame)
+        else:
+            # Each band of canvas rows only needs its own rows of the maps
+            self._ensure_maps(src_w, src_h)
+            band_compositor.run(
+                lambda a, b: cv2.remap(
+                    raw_frame, self._map1[a:b], self._map2[a:b], cv2.INTER_LINEAR,
+                    dst=self.canvas[a:b], borderMode=cv2.BORDER_REPLICATE
+                ),
+                0, self.height
+            )
+
+        return self.canvas
+
+    def get_stats(self):
+        """Get allocation statistics"""
+        return {
+            'frames': self.frames,
+            'allocations': self.allocations,
+        }
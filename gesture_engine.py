@@ -0,0 +1,267 @@
+"""
+Gesture Engine
+Keeps a ring buffer of timestamped landmarks and runs temporal gesture
+recognizers over it: swipes, two-finger scroll, open-palm cancel and
+fist grab
+"""
+
+from collections import namedtuple
+
+import numpy as np
+from config import *
+from gesture_features import PALM_POINTS
+
+
+# A recognized gesture. value depends on the gesture:
+#   swipe_left / swipe_right / open_palm: None
+#   scroll: palm y in screen pixels (scroll_end: None)
+#   grab: palm (x, y) in screen pixels (release: None)
+Gesture = namedtuple('Gesture', ['name', 'timestamp', 'value'])
+
+# One-shot gestures; when one fires, the other recognizers are suppressed
+# so the same movement isn't read twice (a swipe ending in a still palm)
+DISCRETE_GESTURES = ('swipe_left', 'swipe_right', 'open_palm', 'grab')
+
+
+class LandmarkHistory:
+    """
+    Fixed-size ring buffer of the tracked hand's landmarks, palm center
+    (screen pixels) and timestamps. Samples are addressed by their
+    absolute push index, so recognizers can hold on to a position in the
+    history between frames
+    """
+
+    def __init__(self, capacity=GESTURE_HISTORY_SIZE, width=SCREEN_WIDTH, height=SCREEN_HEIGHT):
+        self.capacity = capacity
+        self.width = width
+        self.height = height
+        self.landmarks = np.zeros((capacity, 21, 3), dtype=np.float32)
+        self.palms = np.zeros((capacity, 2), dtype=np.float64)
+        self.timestamps = np.zeros(capacity, dtype=np.float64)
+        self.total = 0  # Samples ever pushed
+        self.count = 0  # Samples currently held
+
+    def push(self, landmarks, timestamp):
+        """Add one hand's (21, 3) landmarks"""
+        slot = self.total % self.capacity
+        self.landmarks[slot] = landmarks
+        self.palms[slot] = landmarks[PALM_POINTS, :2].mean(axis=0) * (self.width, self.height)
+        self.timestamps[slot] = timestamp
+        self.total += 1
+        self.count = min(self.count + 1, self.capacity)
+
+    def clear(self):
+        """Drop every sample (the hand was lost)"""
+        self.count = 0
+
+    @property
+    def first(self):
+        """Absolute index of the oldest sample still held"""
+        return self.total - self.count
+
+    def palm(self, index=-1):
+        """Palm center of a sample (negative: counted back from the newest)"""
+        if index < 0:
+            index += self.total
+        return self.palms[index % self.capacity]
+
+    def time(self, index=-1):
+        """Timestamp of a sample (negative: counted back from the newest)"""
+        if index < 0:
+            index += self.total
+        return self.timestamps[index % self.capacity]
+
+
+class GestureRecognizer:
+    """
+    An incremental state machine fed one sample at a time
+    update() looks only at the newest samples (and any position it keeps
+    in the history), so it costs O(1) per frame
+    """
+
+    def reset(self):
+        """Forget any gesture in progress"""
+
+    def update(self, history, features, events):
+        """Process the newest sample; append any Gestures to events"""
+        raise NotImplementedError("Subclasses must implement update()")
+
+    def end(self, timestamp, events):
+        """The hand was lost: finish any gesture in progress"""
+        self.reset()
+
+    def suppress(self):
+        """Another recognizer fired a one-shot gesture"""
+
+
+class SwipeRecognizer(GestureRecognizer):
+    """Open hand moved quickly left or right"""
+
+    def __init__(self):
+        self.reset()
+        self._cooldown_until = 0.0
+
+    def reset(self):
+        self._start = None  # Oldest sample of the current travel
+
+    def update(self, history, features, events):
+        now = history.time()
+        if not features.extended[0, 1:].all():
+            self._start = None
+            return
+        if self._start is None or self._start < history.first:
+            self._start = history.total - 1
+
+        # Keep the start within the time window (amortized O(1))
+        while self._start < history.total - 1 and history.time(self._start) < now - SWIPE_WINDOW:
+            self._start += 1
+
+        dx, dy = history.palm() - history.palm(self._start)
+        if (now >= self._cooldown_until and abs(dx) >= SWIPE_DISTANCE * history.width
+                and abs(dy) < abs(dx) * 0.5):
+            events.append(Gesture('swipe_right' if dx > 0 else 'swipe_left', now, None))
+            self._cooldown_until = now + SWIPE_COOLDOWN
+            self._start = history.total - 1  # The next swipe needs fresh travel
+
+    def suppress(self):
+        self._start = None
+
+
+class ScrollRecognizer(GestureRecognizer):
+    """Index and middle finger extended (others folded), moved up or down"""
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self._frames = 0  # Consecutive samples in the scroll pose
+        self.active = False
+
+    def update(self, history, features, events):
+        extended = features.extended[0]
+        now = history.time()
+        if extended[1] and extended[2] and not extended[3] and not extended[4]:
+            self._frames += 1
+            # A few frames in the pose first, so passing through it does not scroll
+            if self._frames >= SCROLL_ARM_FRAMES:
+                self.active = True
+                events.append(Gesture('scroll', now, float(history.palm()[1])))
+        elif self.active or self._frames:
+            self.end(now, events)
+
+    def end(self, timestamp, events):
+        if self.active:
+            events.append(Gesture('scroll_end', timestamp, None))
+        self.reset()
+
+
+class OpenPalmRecognizer(GestureRecognizer):
+    """All five fingers extended and held still: cancel"""
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self._since = None  # When the still open palm began
+        self._fired = False
+
+    def update(self, history, features, events):
+        now = history.time()
+        if not features.extended[0].all():
+            self.reset()
+            return
+
+        still = True
+        if history.count >= 2:
+            dt = now - history.time(-2)
+            if dt > 0:
+                speed = np.linalg.norm(history.palm() - history.palm(-2)) / dt
+                still = speed < OPEN_PALM_MAX_SPEED * history.width
+
+        if not still:
+            self._since = None
+        elif self._since is None:
+            self._since = now
+        elif not self._fired and now - self._since >= OPEN_PALM_HOLD:
+            events.append(Gesture('open_palm', now, None))
+            self._fired = True  # Once per hold
+
+    def suppress(self):
+        # Not until the hand leaves the open pose
+        self._fired = True
+
+
+class FistRecognizer(GestureRecognizer):
+    """All fingers folded: grab, then release when the hand opens"""
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self._since = None  # When the fist closed
+        self.grabbed = False
+
+    def update(self, history, features, events):
+        now = history.time()
+        if not features.extended[0, 1:].any():
+            if self._since is None:
+                self._since = now
+            if not self.grabbed and now - self._since >= FIST_HOLD:
+                x, y = history.palm()
+                events.append(Gesture('grab', now, (int(x), int(y))))
+                self.grabbed = True
+        elif self._since is not None:
+            self.end(now, events)
+
+    def end(self, timestamp, events):
+        if self.grabbed:
+            events.append(Gesture('release', timestamp, None))
+        self.reset()
+
+
+class GestureEngine:
+    def __init__(self, recognizers=None, capacity=GESTURE_HISTORY_SIZE):
+        self.history = LandmarkHistory(capacity)
+        self.recognizers = []
+        for recognizer in recognizers if recognizers is not None else (
+                SwipeRecognizer(), ScrollRecognizer(), OpenPalmRecognizer(), FistRecognizer()):
+            self.register(recognizer)
+        self._last_timestamp = None
+        self.hand_id = None  # Track the history belongs to
+
+    def register(self, recognizer):
+        """Add a recognizer; it sees every sample from now on"""
+        self.recognizers.append(recognizer)
+        return recognizer
+
+    def update(self, landmarks, features, timestamp, hand_id=None):
+        """
+        Feed the tracker's current result (the first hand is tracked;
+        hand_id identifies it, so another hand taking its place starts
+        over). Returns the Gestures recognized; a result already seen is
+        ignored
+        """
+        events = []
+        if len(landmarks) == 0 or hand_id != self.hand_id:
+            if self.history.count:
+                for recognizer in self.recognizers:
+                    recognizer.end(timestamp, events)
+                self.history.clear()
+            self._last_timestamp = None
+            self.hand_id = hand_id
+            if len(landmarks) == 0:
+                return events
+
+        if timestamp is not None and timestamp == self._last_timestamp:
+            return events
+        self._last_timestamp = timestamp
+
+        self.history.push(landmarks[0], timestamp)
+        for recognizer in self.recognizers:
+            start = len(events)
+            recognizer.update(self.history, features, events)
+            if any(event.name in DISCRETE_GESTURES for event in events[start:]):
+                for other in self.recognizers:
+                    if other is not recognizer:
+                        other.suppress()
+        return events
@@ -0,0 +1,92 @@
+"""
+Gesture Features
+Vectorized measurements over (hands, 21, 3) landmark arrays: fingertip
+distances, finger extension, palm orientation and hand scale, computed
+for every hand in one pass
+"""
+
+from collections import namedtuple
+
+import numpy as np
+
+
+# MediaPipe hand landmark indices
+WRIST = 0
+THUMB_TIP = 4
+INDEX_MCP = 5
+INDEX_TIP = 8
+MIDDLE_MCP = 9
+PINKY_MCP = 17
+
+FINGERTIPS = np.array([4, 8, 12, 16, 20])  # Thumb, index, middle, ring, pinky
+FINGER_PIPS = np.array([3, 6, 10, 14, 18])  # Joint below each tip (thumb: IP)
+FINGER_BASES = np.array([2, 5, 9, 13, 17])  # Knuckle of each finger (thumb: MCP)
+
+# Knuckles (and wrist) whose mean is the palm center; unlike the fingertips
+# they hardly move when the hand changes pose
+PALM_POINTS = [WRIST, INDEX_MCP, MIDDLE_MCP, PINKY_MCP]
+
+# Bones drawn by HandTracker.draw_landmarks
+HAND_CONNECTIONS = np.array([
+    (0, 1), (1, 2), (2, 3), (3, 4),
+    (0, 5), (5, 6), (6, 7), (7, 8),
+    (5, 9), (9, 10), (10, 11), (11, 12),
+    (9, 13), (13, 14), (14, 15), (15, 16),
+    (13, 17), (0, 17), (17, 18), (18, 19), (19, 20),
+])
+
+# How much further from the wrist a tip must be than its joint to count as
+# extended (the thumb folds across the palm, so it is judged from the
+# pinky knuckle instead)
+EXTENSION_RATIO = 1.1
+
+# Per-hand features; every field has the hand as its first axis
+#   tip_distances: (hands, 5, 5) image-plane distances between fingertips
+#   extended: (hands, 5) bool, finger straightened out
+#   palm_normal: (hands, 3) unit normal of the palm plane; the sign of z
+#     tells palm from back of the hand facing the camera (mirrored between
+#     left and right hands)
+#   scale: (hands,) wrist to middle knuckle distance, for size-independent
+#     thresholds
+HandFeatures = namedtuple(
+    'HandFeatures', ['tip_distances', 'extended', 'palm_normal', 'scale']
+)
+
+
+def empty_landmarks():
+    """Landmark array with no hands"""
+    return np.zeros((0, 21, 3), dtype=np.float32)
+
+
+def palm_centers(landmarks):
+    """(hands, 2) normalized palm centers of a (hands, 21, 3) landmark array"""
+    return landmarks[:, PALM_POINTS, :2].mean(axis=1)
+
+
+def extract_features(landmarks):
+    """Compute HandFeatures for a (hands, 21, 3) landmark array"""
+    xy = landmarks[:, :, :2]
+
+    # Pairwise fingertip distances in the image plane (normalized units,
+    # same as PINCH_THRESHOLD)
+    tips = xy[:, FINGERTIPS]
+    tip_distances = np.linalg.norm(tips[:, :, None] - tips[:, None, :], axis=-1)
+
+    # A finger is extended when its tip is clearly further from the
+    # reference point than the joint below it
+    reference = np.repeat(xy[:, None, WRIST], 5, axis=1)
+    reference[:, 0] = xy[:, PINKY_MCP]
+    tip_reach = np.linalg.norm(tips - reference, axis=-1)
+    pip_reach = np.linalg.norm(xy[:, FINGER_PIPS] - reference, axis=-1)
+    extended = tip_reach > pip_reach * EXTENSION_RATIO
+
+    # Palm plane through the wrist and the index and pinky knuckles
+    across = landmarks[:, INDEX_MCP] - landmarks[:, WRIST]
+    along = landmarks[:, PINKY_MCP] - landmarks[:, WRIST]
+    normal = np.cross(across, along)
+    length = np.linalg.norm(normal, axis=-1, keepdims=True)
+    palm_normal = normal / np.maximum(length, 1e-6)
+
+    scale = np.linalg.norm(xy[:, MIDDLE_MCP] - xy[:, WRIST], axis=-1)
+
+    return HandFeatures(tip_distances, extended, palm_normal, scale)
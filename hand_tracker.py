@@ -1,132 +1,395 @@
 """
 Hand Tracking Module using Mediapipe
-Provides fingertip tracking with smoothing and gesture detection
+Provides fingertip tracking with smoothing and gesture detection for every
+hand in view
 """
 
+import threading
+import time
+from collections import namedtuple
+
 import cv2
 import mediapipe as mp
 import numpy as np
 from config import *
+from profiler import profiler
+from hand_tracks import TrackAssigner, HANDEDNESS_LABELS
+from gesture_features import (
+    empty_landmarks, extract_features, palm_centers, INDEX_TIP, HAND_CONNECTIONS
+)
+
+
+# One model result: (hands, 21, 3) landmarks, (hands,) handedness codes
+# (index into HANDEDNESS_LABELS, -1 if unknown) and (hands,) confidences
+Detections = namedtuple('Detections', ['landmarks', 'handedness', 'scores'])
+
+# Detections tagged with the frame they were computed from
+InferenceResult = namedtuple('InferenceResult', ['detections', 'seq', 'timestamp'])
+
+
+def empty_detections():
+    """Detections with no hands"""
+    return Detections(
+        empty_landmarks(), np.zeros(0, dtype=np.int8), np.zeros(0, dtype=np.float32)
+    )
 
 
 class HandTracker:
-    def __init__(self):
-        self.mp_hands = mp.solutions.hands
-        self.hands = self.mp_hands.Hands(
-            static_image_mode=False,
+    # Upper bound on reusable model input buffers kept around
+    MAX_POOLED_BUFFERS = 8
+    
+    def __init__(self, async_inference=False):
+        self.hands = self._create_model()
+        
+        # Per-hand cursor smoothing, pinch state and cooldown
+        self.track_assigner = TrackAssigner()
+        
+        # Extrapolation over the measured display latency
+        self.display_latency = 0.0  # Smoothed capture-to-display time (seconds)
+        self.latency_samples = 0
+        
+        # Most recent completed inference: (hands, 21, 3) normalized
+        # landmarks, one row per track (oldest first), and the features
+        # derived from them
+        self.landmarks = empty_landmarks()
+        self.features = extract_features(self.landmarks)
+        self.result_seq = 0
+        self.result_timestamp = None
+        self.inference_time = 0.0
+        self.inference_results = 0  # Model results adopted (not flow-tracked ones)
+        self.results = 0  # Results adopted, model or flow-tracked
+        
+        # Region of interest from the previous result (x1, y1, x2, y2)
+        self.roi = None
+        self.roi_misses = 0
+        self.full_searches = 0
+        self._since_search = 0  # Inferences since the last full-frame search
+        
+        # Asynchronous inference stage
+        self.async_inference = async_inference
+        self._cond = threading.Condition()
+        self._pending = None  # (buffer index, seq, timestamp) waiting for the worker
+        self._input_buffers = [None, None]  # Copies of submitted frames
+        self._processing_index = None  # Buffer the worker is reading
+        
+        # Reusable model input buffers, keyed by shape
+        self._rgb_buffers = {}
+        self.allocations = 0
+        self._completed = None  # InferenceResult not yet picked up by poll()
+        self.skipped_frames = 0
+        self._running = False
+        self._worker = None
+        if async_inference:
+            self._running = True
+            self._worker = threading.Thread(
+                target=self._inference_loop, name="HandInference", daemon=True
+            )
+            self._worker.start()
+    
+    def _create_model(self):
+        """
+        Build the MediaPipe hand landmark model
+        With the region of interest every input is a different crop (or
+        the whole frame), so MediaPipe's own tracking between calls would
+        follow the previous input's coordinates; the ROI tracks instead
+        """
+        return mp.solutions.hands.Hands(
+            static_image_mode=TRACKING_ROI_ENABLED,
             max_num_hands=MAX_HANDS,
             min_detection_confidence=HAND_DETECTION_CONFIDENCE,
             min_tracking_confidence=HAND_TRACKING_CONFIDENCE
         )
-        self.mp_draw = mp.solutions.drawing_utils
-        
-        # Smoothing
-        self.prev_x = None
-        self.prev_y = None
+    
+    def _process(self, frame):
+        """Run the landmark model on a BGR frame; returns Detections"""
+        start = time.perf_counter()
         
-        # Gesture state
-        self.is_pinching = False
-        self.prev_pinch_state = False
-        self.hover_start_time = None
-        self.last_interaction_time = 0
+        if not TRACKING_ROI_ENABLED:
+            rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=self._get_buffer(frame.shape))
+            detections = self._to_detections(self.hands.process(rgb_frame))
+        else:
+            detections = None
+            self._since_search += 1
+            # With room for more hands, look outside the region now and then
+            search_due = (len(self.landmarks) < MAX_HANDS
+                          and self._since_search >= NEW_HAND_SEARCH_INTERVAL)
+            if self.roi is not None and not search_due:
+                detections = self._process_region(frame, self.roi, INFERENCE_SIZE)
+                if len(detections.landmarks) == 0:
+                    self.roi_misses += 1
+            
+            # Hand lost: search the whole frame at reduced resolution
+            if detections is None or len(detections.landmarks) == 0:
+                h, w = frame.shape[:2]
+                search_size = int(max(w, h) * SEARCH_SCALE)
+                detections = self._process_region(frame, (0, 0, w, h), search_size)
+                self.full_searches += 1
+                self._since_search = 0
+            
+            self.roi = self._compute_roi(detections.landmarks, frame.shape)
         
-    def find_hands(self, frame):
-        """Process frame and detect hands"""
-        rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        self.results = self.hands.process(rgb_frame)
-        return self.results.multi_hand_landmarks is not None
+        self.inference_time = time.perf_counter() - start
+        return detections
     
-    def get_fingertip_position(self, frame_shape):
+    def _to_detections(self, results):
+        """Copy MediaPipe results into Detections arrays"""
+        if not results.multi_hand_landmarks:
+            return empty_detections()
+        landmarks = np.array(
+            [[(lm.x, lm.y, lm.z) for lm in hand.landmark]
+             for hand in results.multi_hand_landmarks],
+            dtype=np.float32
+        )
+        classes = [
+            hand.classification[0] if hand.classification else None
+            for hand in results.multi_handedness or []
+        ]
+        classes += [None] * (len(landmarks) - len(classes))
+        handedness = np.array(
+            [HANDEDNESS_LABELS.index(c.label) if c and c.label in HANDEDNESS_LABELS else -1
+             for c in classes],
+            dtype=np.int8
+        )
+        scores = np.array([c.score if c else 0.0 for c in classes], dtype=np.float32)
+        return Detections(landmarks, handedness, scores)
+    
+    def _process_region(self, frame, region, max_size):
         """
-        Get smoothed index fingertip position
-        Returns (x, y) or None if no hand detected
+        Run the model on a region of the frame, downscaled so its longest
+        side is at most max_size. Returns Detections, with landmarks
+        remapped to normalized full-frame coordinates
         """
-        if not self.results.multi_hand_landmarks:
-            self.prev_x = None
-            self.prev_y = None
-            return None
+        x1, y1, x2, y2 = region
+        crop = frame[y1:y2, x1:x2]
+        crop_h, crop_w = crop.shape[:2]
         
-        # Get first hand
-        hand_landmarks = self.results.multi_hand_landmarks[0]
+        scale = min(1.0, max_size / max(crop_w, crop_h))
+        if scale < 1.0:
+            size = (max(1, int(crop_w * scale)), max(1, int(crop_h * scale)))
+            crop = cv2.resize(
+                crop, size, dst=self._get_buffer((size[1], size[0], 3), 'resized'),
+                interpolation=cv2.INTER_AREA
+            )
         
-        # Index finger tip is landmark 8
-        index_tip = hand_landmarks.landmark[8]
+        # Color conversion only over the (downscaled) region
+        with profiler.section('tracking.color_convert'):
+            rgb_crop = cv2.cvtColor(crop, cv2.COLOR_BGR2RGB, dst=self._get_buffer(crop.shape))
+        with profiler.section('tracking.inference'):
+            detections = self._to_detections(self.hands.process(rgb_crop))
+        
+        landmarks = detections.landmarks
+        frame_h, frame_w = frame.shape[:2]
+        if len(landmarks) and (x1, y1, x2, y2) != (0, 0, frame_w, frame_h):
+            landmarks *= (crop_w / frame_w, crop_h / frame_h, crop_w / frame_w)
+            landmarks[:, :, 0] += x1 / frame_w
+            landmarks[:, :, 1] += y1 / frame_h
+        
+        return detections
+    
+    def _compute_roi(self, landmarks, frame_shape):
+        """Padded square region around the detected hands, or None if lost"""
+        if len(landmarks) == 0:
+            return None
         
-        # Convert normalized coordinates to pixel coordinates
         h, w = frame_shape[:2]
-        x = int(index_tip.x * w)
-        y = int(index_tip.y * h)
-        
-        # Apply smoothing
-        if self.prev_x is not None:
-            # Exponential moving average
-            x = int(SMOOTHING_FACTOR * x + (1 - SMOOTHING_FACTOR) * self.prev_x)
-            y = int(SMOOTHING_FACTOR * y + (1 - SMOOTHING_FACTOR) * self.prev_y)
-            
-            # Jitter reduction
-            dx = abs(x - self.prev_x)
-            dy = abs(y - self.prev_y)
-            if dx < JITTER_THRESHOLD and dy < JITTER_THRESHOLD:
-                x = self.prev_x
-                y = self.prev_y
+        (min_x, min_y), (max_x, max_y) = (
+            landmarks[:, :, :2].min(axis=(0, 1)), landmarks[:, :, :2].max(axis=(0, 1))
+        )
         
-        self.prev_x = x
-        self.prev_y = y
+        cx = float(min_x + max_x) / 2 * w
+        cy = float(min_y + max_y) / 2 * h
+        box = max(float(max_x - min_x) * w, float(max_y - min_y) * h)
+        # ROI_MIN_SIZE is in screen pixels; frames may be at a lower resolution
+        side = max(box * (1 + 2 * ROI_PADDING), ROI_MIN_SIZE * w / SCREEN_WIDTH)
         
-        return (x, y)
+        x1 = int(max(0, cx - side / 2))
+        y1 = int(max(0, cy - side / 2))
+        x2 = int(min(w, cx + side / 2))
+        y2 = int(min(h, cy + side / 2))
+        if x2 <= x1 or y2 <= y1:
+            return None
+        return (x1, y1, x2, y2)
     
-    def detect_pinch(self):
+    def _get_buffer(self, shape, role='rgb'):
+        """Get a reusable uint8 buffer of the given shape"""
+        key = (role, tuple(shape))
+        buffer = self._rgb_buffers.get(key)
+        if buffer is None:
+            # ROI sizes vary from frame to frame; keep the pool bounded
+            if len(self._rgb_buffers) >= self.MAX_POOLED_BUFFERS:
+                self._rgb_buffers.pop(next(iter(self._rgb_buffers)))
+            buffer = np.empty(shape, dtype=np.uint8)
+            self._rgb_buffers[key] = buffer
+            self.allocations += 1
+        return buffer
+    
+    def find_hands(self, frame, seq=0, timestamp=None):
+        """Process frame and detect hands (synchronous)"""
+        self._adopt(self._process(frame), seq, timestamp)
+        return self.has_hands()
+    
+    def _adopt(self, detections, seq, timestamp):
+        """Make a model result the current result"""
+        self.adopt_tracked(
+            detections.landmarks, seq, timestamp, detections.handedness, detections.scores
+        )
+        self.inference_results += 1
+    
+    def adopt_tracked(self, landmarks, seq, timestamp, handedness=None, scores=None):
         """
-        Detect pinch gesture (thumb and index finger close together)
-        Returns True if pinching
+        Make a landmark array the current result (e.g. propagated by optical flow)
+        Tracks keep their handedness and confidence unless new ones are given
         """
-        if not self.results.multi_hand_landmarks:
-            self.is_pinching = False
-            return False
-        
-        hand_landmarks = self.results.multi_hand_landmarks[0]
-        
-        # Thumb tip is landmark 4, index tip is landmark 8
-        thumb = hand_landmarks.landmark[4]
-        index = hand_landmarks.landmark[8]
+        # Put the hands in track order
+        order = self.track_assigner.assign(palm_centers(landmarks))
+        if handedness is not None:
+            for track, row in zip(self.tracks, order):
+                track.handedness = int(handedness[row])
+                track.score = float(scores[row])
+        landmarks = landmarks[order]
+        self.landmarks = landmarks
+        self.features = extract_features(landmarks)
+        self.result_seq = seq
+        self.result_timestamp = timestamp
+        self.results += 1
+    
+    def submit(self, frame, seq, timestamp):
+        """
+        Queue a frame for asynchronous inference
+        The frame is copied, so the caller may draw on it right away. If the
+        worker is still busy, a frame that is waiting is replaced by the newer one
+        """
+        with self._cond:
+            if self._pending is not None:
+                self.skipped_frames += 1
+            
+            # Copy into whichever buffer the worker is not reading
+            index = 1 if self._processing_index == 0 else 0
+            buffer = self._input_buffers[index]
+            if buffer is None or buffer.shape != frame.shape:
+                buffer = np.empty_like(frame)
+                self._input_buffers[index] = buffer
+                self.allocations += 1
+            np.copyto(buffer, frame)
+            
+            self._pending = (index, seq, timestamp)
+            self._cond.notify_all()
+    
+    def _inference_loop(self):
+        """Worker thread: run inference on the newest submitted frame"""
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._pending is not None or not self._running)
+                if not self._running:
+                    return
+                index, seq, timestamp = self._pending
+                self._pending = None
+                self._processing_index = index
+            
+            detections = self._process(self._input_buffers[index])
+            
+            with self._cond:
+                self._processing_index = None
+                self._completed = InferenceResult(detections, seq, timestamp)
+                self._cond.notify_all()
+    
+    def poll(self):
+        """
+        Adopt the most recent completed asynchronous result (non-blocking)
+        Returns True if that result contains a hand
+        """
+        with self._cond:
+            completed = self._completed
+            self._completed = None
         
-        # Calculate distance
-        distance = np.sqrt((thumb.x - index.x)**2 + (thumb.y - index.y)**2)
+        if completed is not None:
+            self._adopt(completed.detections, completed.seq, completed.timestamp)
         
-        self.is_pinching = distance < PINCH_THRESHOLD
-        return self.is_pinching
+        return self.has_hands()
+    
+    def has_hands(self):
+        """Check if the current result contains any hand"""
+        return len(self.landmarks) > 0
+    
+    @property
+    def tracks(self):
+        """HandTrack per hand in the current result, in landmark row order"""
+        return self.track_assigner.tracks
     
-    def get_pinch_event(self):
+    @property
+    def track_ids(self):
+        return tuple(track.id for track in self.track_assigner.tracks)
+    
+    def close(self):
+        """Stop the inference worker and release the model"""
+        if self._worker is not None:
+            with self._cond:
+                self._running = False
+                self._cond.notify_all()
+            self._worker.join(timeout=1.0)
+            self._worker = None
+        if self.hands is not None:
+            self.hands.close()
+    
+    def get_cursor_positions(self, frame_shape):
         """
-        Returns True on pinch transition (not pinching -> pinching)
-        This gives a single click event rather than continuous
+        Get the smoothed index fingertip position of every tracked hand
+        Returns a list of (x, y) in track order (empty if no hand detected);
+        each track's position is also kept as track.position
         """
-        current_pinch = self.detect_pinch()
-        pinch_event = current_pinch and not self.prev_pinch_state
-        self.prev_pinch_state = current_pinch
-        return pinch_event
+        h, w = frame_shape[:2]
+        tips = self.landmarks[:, INDEX_TIP, :2] * (w, h)
+        
+        # Smooth, timed by when the camera captured the frame
+        timestamp = self.result_timestamp if self.result_timestamp is not None else time.time()
+        ahead = min(self.display_latency, CURSOR_MAX_PREDICTION)
+        
+        for track, (tip_x, tip_y) in zip(self.tracks, tips):
+            x, y = track.cursor_filter.filter(int(tip_x), int(tip_y), timestamp)
+            
+            # Predict where the fingertip is by the time this frame is shown
+            if CURSOR_PREDICTION:
+                x, y = track.cursor_filter.predict(timestamp + ahead)
+                x = min(max(x, 0), w - 1)
+                y = min(max(y, 0), h - 1)
+            
+            track.position = (x, y)
+        
+        return [track.position for track in self.tracks]
     
-    def check_interaction_cooldown(self, current_time):
-        """Check if enough time has passed since last interaction"""
-        if current_time - self.last_interaction_time >= INTERACTION_COOLDOWN:
-            return True
-        return False
+    def mark_displayed(self, display_time):
+        """Record that a frame using the current result reached the screen"""
+        if self.result_timestamp is None:
+            return
+        latency = display_time - self.result_timestamp
+        if self.latency_samples == 0:
+            self.display_latency = latency
+        else:
+            self.display_latency = 0.9 * self.display_latency + 0.1 * latency
+        self.latency_samples += 1
     
-    def mark_interaction(self, current_time):
-        """Mark that an interaction occurred"""
-        self.last_interaction_time = current_time
+    def get_pinch_events(self):
+        """
+        Detect pinches (thumb and index finger close together) on every hand
+        Returns the tracks whose pinch started with this result
+        """
+        # Thumb tip to index tip, all hands at once
+        pinching = self.features.tip_distances[:, 0, 1] < PINCH_THRESHOLD
+        return [
+            track for track, pinch in zip(self.tracks, pinching)
+            if track.update_pinch(bool(pinch))
+        ]
     
     def draw_landmarks(self, frame):
         """Draw hand landmarks on frame (for debugging)"""
-        if self.results.multi_hand_landmarks:
-            for hand_landmarks in self.results.multi_hand_landmarks:
-                self.mp_draw.draw_landmarks(
-                    frame,
-                    hand_landmarks,
-                    self.mp_hands.HAND_CONNECTIONS
-                )
-    
-    def draw_cursor(self, frame, position, radius=15):
+        h, w = frame.shape[:2]
+        points = (self.landmarks[:, :, :2] * (w, h)).astype(np.int32)
+        for hand in points:
+            cv2.polylines(frame, list(hand[HAND_CONNECTIONS]), False, (224, 224, 224), 2)
+            for point in hand:
+                cv2.circle(frame, tuple(int(v) for v in point), 3, (0, 0, 255), -1)
+    
+    def draw_cursor(self, frame, position, pinching=False, radius=15):
         """Draw cursor at fingertip position"""
         if position:
             # Outer glow
@@ -138,5 +401,5 @@ class HandTracker:
             cv2.circle(frame, position, 5, COLOR_TEXT, -1)
             
             # Pinch indicator
-            if self.is_pinching:
+            if pinching:
                 cv2.circle(frame, position, radius + 15, COLOR_SUCCESS, 3)
@@ -0,0 +1,109 @@
+"""
+Hand Tracks
+Stable identities for the hands in consecutive landmark arrays, so several
+people can each keep their own cursor smoothing, pinch state and
+interaction cooldown
+"""
+
+import numpy as np
+from config import *
+from cursor_filters import create_cursor_filter
+
+
+# Handedness codes are indices into this (-1 = unknown)
+HANDEDNESS_LABELS = ('Left', 'Right')
+
+
+class HandTrack:
+    """One hand followed across tracking results"""
+
+    def __init__(self, track_id):
+        self.id = track_id
+        self.cursor_filter = create_cursor_filter()
+        self.position = None  # Smoothed cursor in screen pixels
+        self.palm = None  # Normalized palm center at the last match
+        self.misses = 0  # Consecutive results this hand was missing from
+        self.handedness = -1  # Index into HANDEDNESS_LABELS, as the model classified it
+        self.score = 0.0  # Model confidence in the hand
+
+        # Gesture state
+        self.is_pinching = False
+        self.prev_pinch_state = False
+        self.last_interaction_time = 0
+
+    def update_pinch(self, pinching):
+        """
+        Record the pinch state for this result
+        Returns True on the transition (not pinching -> pinching), so a
+        pinch clicks once rather than continuously
+        """
+        self.is_pinching = pinching
+        pinch_event = pinching and not self.prev_pinch_state
+        self.prev_pinch_state = pinching
+        return pinch_event
+
+    def check_interaction_cooldown(self, current_time):
+        """Check if enough time has passed since this hand's last interaction"""
+        return current_time - self.last_interaction_time >= INTERACTION_COOLDOWN
+
+    def mark_interaction(self, current_time):
+        """Mark that this hand interacted"""
+        self.last_interaction_time = current_time
+
+
+class TrackAssigner:
+    """
+    Matches each result's hands to the previous tracks by palm distance
+    Closest pairs are matched first (greedy nearest neighbor: with the
+    handful of hands in view it gives the same pairs as optimal matching
+    unless hands cross). A hand missing for a few results keeps its track,
+    so a dropped detection doesn't reset its cursor
+    """
+
+    def __init__(self, max_distance=TRACK_MATCH_DISTANCE, max_misses=TRACK_MAX_MISSES):
+        self.max_distance = max_distance  # Normalized palm travel between results
+        self.max_misses = max_misses
+        self.tracks = []  # One per hand in the current result, oldest first
+        self._missing = []  # Recently lost tracks that may still come back
+        self._next_id = 1
+
+    def assign(self, palms):
+        """
+        Match a result's (hands, 2) palm centers to tracks
+        Returns the hand index for each track in self.tracks, so the
+        result's hands can be put in track order
+        """
+        candidates = self.tracks + self._missing
+        matched = {}  # Hand index -> track
+        if candidates and len(palms):
+            previous = np.array([track.palm for track in candidates])
+            distances = np.linalg.norm(palms[:, None] - previous[None], axis=-1)
+            used = set()
+            for flat in np.argsort(distances, axis=None):
+                hand, index = divmod(int(flat), len(candidates))
+                if distances[hand, index] > self.max_distance:
+                    break
+                if hand in matched or index in used:
+                    continue
+                matched[hand] = candidates[index]
+                used.add(index)
+
+        for hand in range(len(palms)):
+            if hand not in matched:
+                matched[hand] = HandTrack(self._next_id)
+                self._next_id += 1
+            matched[hand].palm = palms[hand]
+            matched[hand].misses = 0
+
+        current = set(map(id, matched.values()))
+        self._missing = []
+        for track in candidates:
+            if id(track) not in current:
+                track.misses += 1
+                track.is_pinching = track.prev_pinch_state = False
+                if track.misses <= self.max_misses:
+                    self._missing.append(track)
+
+        order = sorted(matched, key=lambda hand: matched[hand].id)
+        self.tracks = [matched[hand] for hand in order]
+        return order
@@ -3,11 +3,20 @@ AirMenu - Touchless AR Restaurant Menu System
 Main Application Entry Point
 """
 
+import argparse
+import sys
 import cv2
 import time
 import numpy as np
 from config import *
+from camera_capture import CameraCapture
+from frame_pipeline import FramePipeline
 from hand_tracker import HandTracker
+from tracking_scheduler import TrackingScheduler
+from gesture_engine import GestureEngine
+from session_recorder import (
+    SessionRecorder, SessionRecording, ReplayCapture, ReplayHandTracker
+)
 from cart_manager import CartManager
 from state_manager import StateManager, ScreenState
 from screens.home_screen import HomeScreen
@@ -15,25 +24,48 @@ from screens.category_screen import CategoryScreen
 from screens.items_screen import ItemsScreen
 from screens.cart_screen import CartScreen
 from screens.receipt_screen import ReceiptScreen
+from ui_framework.layer_cache import layer_cache
+from ui_framework.parallel import band_compositor
+from ui_framework.render_scale import render_scaler
+from profiler import profiler
+from quality_governor import governor
 from utils import setup_logging
 
 
 class AirMenu:
-    def __init__(self):
+    def __init__(self, capture=None, hand_tracker=None, recorder=None, show_window=True):
+        """
+        capture and hand_tracker replace the camera and the model (e.g. a
+        ReplayCapture and ReplayHandTracker); recorder, if given, records
+        every tracking result. Without a window the app runs headless
+        """
         self.logger = setup_logging()
         self.logger.info("Initializing AirMenu...")
+        self.recorder = recorder
+        self.show_window = show_window
         
-        # Initialize camera
-        self.cap = cv2.VideoCapture(CAMERA_INDEX)
-        if not self.cap.isOpened():
+        # Initialize camera (frames are read on a dedicated thread)
+        self.capture = capture or CameraCapture(CAMERA_INDEX, SCREEN_WIDTH, SCREEN_HEIGHT)
+        if not self.capture.is_opened():
             self.logger.error("Failed to open camera")
             raise RuntimeError("Could not access camera")
+        self.last_frame_seq = 0
         
-        self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, SCREEN_WIDTH)
-        self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, SCREEN_HEIGHT)
+        # Reusable buffers for mirroring/resizing camera frames to the
+        # internal render resolution
+        self.frame_pipeline = FramePipeline(*render_scaler.internal_size, FLIP_CAMERA)
         
-        # Initialize hand tracker
-        self.hand_tracker = HandTracker()
+        # Initialize hand tracker. A given tracker delivers finished results,
+        # so it isn't scheduled
+        self.hand_tracker = hand_tracker or HandTracker(async_inference=ASYNC_INFERENCE)
+        self.tracking_scheduler = (
+            TrackingScheduler(self.hand_tracker)
+            if TRACKING_SCHEDULER and hand_tracker is None else None
+        )
+        
+        # Temporal gestures (swipes, scroll, open palm, fist) over the
+        # tracker's landmark history
+        self.gesture_engine = GestureEngine()
         
         # Initialize managers
         self.cart_manager = CartManager()
@@ -52,6 +84,7 @@ class AirMenu:
         self.current_screen = self.screens[ScreenState.HOME]
         self.current_screen.on_enter()
         self.previous_state = None
+        self.drag_track = None  # Id of the hand whose held pinch is dragging
         
         # FPS tracking
         self.fps = 0
@@ -85,65 +118,133 @@ class AirMenu:
         """Main application loop"""
         self.logger.info("Starting main loop...")
         
+        self.capture.start()
+        
         try:
             while True:
-                ret, frame = self.cap.read()
-                if not ret:
+                # Pick up the newest camera frame, waiting at most one frame budget
+                with profiler.section('capture.wait'):
+                    captured = self.capture.read_latest(
+                        self.last_frame_seq, CAPTURE_WAIT_TIMEOUT
+                    )
+                if self.capture.is_finished():
+                    self.logger.info("Replay finished")
+                    break
+                if not self.capture.is_healthy():
                     self.logger.error("Failed to read frame")
                     break
+                if captured is None:
+                    continue
+                new_frame = captured.seq != self.last_frame_seq
+                self.last_frame_seq = captured.seq
+                work_start = time.perf_counter()
                 
-                # Flip for mirror effect
-                if FLIP_CAMERA:
-                    frame = cv2.flip(frame, 1)
+                # The one clock for dwell, cooldowns, scrolling and
+                # animation (a replay's recorded timeline)
+                current_time = self.capture.now()
                 
-                # Resize to target resolution
-                frame = cv2.resize(frame, (SCREEN_WIDTH, SCREEN_HEIGHT))
+                # Mirror and resize into the preallocated canvas (one pass).
+                # Tracking reads it before anything is drawn on it
+                with profiler.section('frame_pipeline'):
+                    frame = self.frame_pipeline.prepare(captured.frame)
+                canvas = frame
                 
-                # Create canvas for double buffering
-                canvas = frame.copy()
-                
-                # Hand tracking
-                hand_detected = self.hand_tracker.find_hands(frame)
-                cursor_pos = None
+                # Hand tracking: in async mode this frame is tracked while it
+                # is rendered, using the last completed result. The scheduler
+                # runs the model every few frames and optical flow in between
+                with profiler.section('tracking'):
+                    if self.tracking_scheduler and new_frame:
+                        hand_detected = self.tracking_scheduler.step(
+                            frame, captured.seq, captured.timestamp
+                        )
+                    elif self.tracking_scheduler:
+                        hand_detected = self.hand_tracker.has_hands()
+                    elif self.hand_tracker.async_inference:
+                        if new_frame:
+                            self.hand_tracker.submit(frame, captured.seq, captured.timestamp)
+                        hand_detected = self.hand_tracker.poll()
+                    elif new_frame:
+                        hand_detected = self.hand_tracker.find_hands(
+                            frame, captured.seq, captured.timestamp
+                        )
+                    else:
+                        hand_detected = self.hand_tracker.has_hands()
+                if self.recorder and new_frame:
+                    self.recorder.record(captured, self.hand_tracker)
+                cursors = []
                 
                 if hand_detected:
-                    cursor_pos = self.hand_tracker.get_fingertip_position(frame.shape)
+                    # One per hand, in screen pixels, whatever the internal
+                    # render resolution
+                    cursors = self.hand_tracker.get_cursor_positions(
+                        (SCREEN_HEIGHT, SCREEN_WIDTH)
+                    )
                     
                     # Show landmarks if debug enabled
                     if SHOW_HAND_LANDMARKS:
                         self.hand_tracker.draw_landmarks(canvas)
                 
-                # Update state manager
-                self.state_manager.update()
-                
-                # Handle screen transitions
-                self.handle_screen_transition()
+                # Update state manager and handle screen transitions
+                with profiler.section('state_update'):
+                    self.state_manager.update(current_time)
+                    self.handle_screen_transition()
                 
-                # Get current time
-                current_time = time.time()
+                screen_name = type(self.current_screen).__name__
                 
                 # Update current screen
-                self.current_screen.update(cursor_pos, current_time)
+                with profiler.section(f"{screen_name}.update"):
+                    self.current_screen.update(cursors, current_time)
                 
                 # Render current screen
-                canvas = self.current_screen.render(canvas)
+                with profiler.section(f"{screen_name}.render"):
+                    canvas = self.current_screen.render(canvas)
                 
-                # Handle pinch gesture
+                # Handle pinch gestures, each hand with its own cooldown
+                tracks = self.hand_tracker.tracks
                 if hand_detected:
-                    pinch_event = self.hand_tracker.get_pinch_event()
-                    if pinch_event and cursor_pos:
-                        if self.hand_tracker.check_interaction_cooldown(current_time):
-                            self.current_screen.handle_pinch(cursor_pos, current_time)
-                            self.hand_tracker.mark_interaction(current_time)
+                    for track in self.hand_tracker.get_pinch_events():
+                        if track.check_interaction_cooldown(current_time):
+                            self.current_screen.handle_pinch(track.position, current_time)
+                            track.mark_interaction(current_time)
                 
-                # Draw cursor
-                if SHOW_CURSOR and cursor_pos:
-                    self.hand_tracker.draw_cursor(canvas, cursor_pos)
+                # A held pinch drags (e.g. scrolls lists); the first hand to
+                # pinch owns the drag until it lets go
+                if self.drag_track is None:
+                    self.drag_track = next(
+                        (track.id for track in tracks if track.is_pinching), None
+                    )
+                dragging = next(
+                    (track for track in tracks
+                     if track.id == self.drag_track and track.is_pinching), None
+                )
+                if dragging is not None:
+                    self.current_screen.handle_drag(dragging.position, current_time)
+                elif self.drag_track is not None:
+                    self.current_screen.handle_drag_end(current_time)
+                    self.drag_track = None
+                
+                # Temporal gestures of the first hand, once per tracking result
+                timestamp = self.hand_tracker.result_timestamp
+                for gesture in self.gesture_engine.update(
+                    self.hand_tracker.landmarks, self.hand_tracker.features,
+                    timestamp if timestamp is not None else current_time,
+                    tracks[0].id if tracks else None
+                ):
+                    self.current_screen.handle_gesture(gesture, current_time)
+                
+                # Draw cursors
+                if SHOW_CURSOR:
+                    for track in tracks:
+                        self.hand_tracker.draw_cursor(canvas, track.position, track.is_pinching)
                 
                 # Show FPS
                 if SHOW_FPS:
                     self.update_fps()
-                    fps_text = f"FPS: {self.fps:.1f}"
+                    fps_text = (
+                        f"FPS: {self.fps:.1f}  Cam: {self.capture.capture_fps:.1f}  "
+                        f"Dropped: {self.capture.dropped_frames}  Quality: {governor.tier.name}  "
+                        f"Latency: {self.hand_tracker.display_latency * 1000:.0f}ms"
+                    )
                     cv2.putText(
                         canvas, fps_text,
                         (10, SCREEN_HEIGHT - 20),
@@ -153,7 +254,10 @@ class AirMenu:
                     )
                 
                 # Hand tracking status
-                status_text = "Hand Detected" if hand_detected else "No Hand"
+                status_text = (
+                    f"{len(tracks)} Hands Detected" if len(tracks) > 1
+                    else "Hand Detected" if hand_detected else "No Hand"
+                )
                 status_color = COLOR_SUCCESS if hand_detected else COLOR_ERROR
                 cv2.putText(
                     canvas, status_text,
@@ -163,11 +267,28 @@ class AirMenu:
                     FONT_THICKNESS_THIN, cv2.LINE_AA
                 )
                 
+                # Per-stage timings overlay
+                if profiler.show_hud:
+                    profiler.draw_hud(canvas)
+                
                 # Display frame
-                cv2.imshow('AirMenu - Touchless AR Menu', canvas)
+                if self.show_window:
+                    with profiler.section('imshow'):
+                        cv2.imshow('AirMenu - Touchless AR Menu', canvas)
+                if hand_detected:
+                    # Measures the latency the cursor is extrapolated over
+                    self.hand_tracker.mark_displayed(time.time())
+                
+                # Adapt effect quality to the time this frame took
+                # (camera wait excluded)
+                if governor.record_frame((time.perf_counter() - work_start) * 1000):
+                    self.logger.info(f"Render quality: {governor.tier.name}")
                 
                 # Check for exit (ESC key)
-                key = cv2.waitKey(1) & 0xFF
+                key = 0xFF
+                if self.show_window:
+                    with profiler.section('waitKey'):
+                        key = cv2.waitKey(1) & 0xFF
                 if key == 27:  # ESC
                     self.logger.info("Exit requested by user")
                     break
@@ -175,6 +296,8 @@ class AirMenu:
                     self.logger.info("Reset to home screen")
                     self.state_manager.reset()
                     self.cart_manager.clear()
+                elif key == ord('p'):  # P key to toggle the profiler overlay
+                    profiler.show_hud = not profiler.show_hud
         
         except Exception as e:
             self.logger.error(f"Error in main loop: {e}", exc_info=True)
@@ -182,23 +305,137 @@ class AirMenu:
         finally:
             self.cleanup()
     
+    def log_profile(self):
+        """Log per-stage timings and write the trace file if configured"""
+        for name, stage in profiler.get_stats().items():
+            self.logger.info(
+                f"Stage {name}: p50 {stage['p50']:.2f} ms, p95 {stage['p95']:.2f} ms, "
+                f"p99 {stage['p99']:.2f} ms"
+            )
+        if PROFILER_TRACE_PATH:
+            count = profiler.export_trace(PROFILER_TRACE_PATH)
+            self.logger.info(f"Wrote {count} trace events to {PROFILER_TRACE_PATH}")
+    
     def cleanup(self):
         """Clean up resources"""
         self.logger.info("Cleaning up...")
-        self.cap.release()
-        cv2.destroyAllWindows()
+        stats = self.capture.get_stats()
+        self.logger.info(
+            f"Capture stats: {stats['frames_captured']} frames, "
+            f"{stats['dropped_frames']} dropped, {stats['capture_fps']:.1f} FPS"
+        )
+        pipeline_stats = self.frame_pipeline.get_stats()
+        self.logger.info(
+            f"Frame pipeline: {pipeline_stats['allocations']} buffer allocations "
+            f"over {pipeline_stats['frames']} frames"
+        )
+        cache_stats = layer_cache.get_stats()
+        self.logger.info(
+            f"Layer cache: {cache_stats['hits']} hits, {cache_stats['misses']} misses, "
+            f"{cache_stats['bytes'] / (1024 * 1024):.1f} MB in {cache_stats['entries']} layers"
+        )
+        self.log_profile()
+        self.logger.info(
+            f"Cursor: {CURSOR_FILTER} filter, "
+            f"{self.hand_tracker.display_latency * 1000:.0f} ms capture-to-display latency"
+        )
+        if TRACKING_ROI_ENABLED:
+            self.logger.info(
+                f"Hand tracker: {self.hand_tracker.inference_results} results, "
+                f"{self.hand_tracker.full_searches} full-frame searches, "
+                f"{self.hand_tracker.roi_misses} region misses"
+            )
+        if self.tracking_scheduler:
+            tracking_stats = self.tracking_scheduler.get_stats()
+            self.logger.info(
+                f"Tracking: {tracking_stats['inferences']} inferences over "
+                f"{tracking_stats['frames']} frames "
+                f"({tracking_stats['inference_ratio'] * 100:.0f}%), "
+                f"{tracking_stats['fallbacks']} flow fallbacks"
+            )
+        quality_stats = governor.get_stats()
+        self.logger.info(
+            f"Quality governor: ended at {quality_stats['tier']}, "
+            f"{quality_stats['downgrades']} downgrades, {quality_stats['upgrades']} upgrades"
+        )
+        if self.recorder:
+            self.recorder.close()
+            self.logger.info(
+                f"Recorded {self.recorder.frames} frames to {self.recorder.path}"
+            )
+        self.capture.release()
+        self.hand_tracker.close()
+        band_compositor.set_workers(0)  # Stop the render band threads
+        if self.show_window:
+            cv2.destroyAllWindows()
         self.logger.info("AirMenu shutdown complete")
 
 
+def replay_outcome(path, speed):
+    """Replay a recording headless; returns the screen it ends on and the cart"""
+    recording = SessionRecording(path)
+    try:
+        app = AirMenu(
+            ReplayCapture(recording, speed), ReplayHandTracker(recording), show_window=False
+        )
+        app.run()
+    finally:
+        recording.close()
+    return app.state_manager.current_state, app.cart_manager.get_items()
+
+
+def verify_replay(path, speed):
+    """Check that replaying unpaced and at speed ends in the same state and cart"""
+    unpaced = replay_outcome(path, 0)
+    paced = replay_outcome(path, speed)
+    for (state, cart), label in ((unpaced, "unpaced"), (paced, f"speed {speed}")):
+        print(f"Replay {label}: ended on {state.value} with {len(cart)} cart lines")
+    if unpaced != paced:
+        print("Replay is not deterministic: the outcomes differ")
+        return False
+    return True
+
+
 def main():
     """Entry point"""
+    parser = argparse.ArgumentParser(description="AirMenu - Touchless AR Restaurant Menu")
+    parser.add_argument('--record', metavar='PATH',
+                        help="record hand tracking results to a session file")
+    parser.add_argument('--record-frames', action='store_true',
+                        help="also record the camera frames (JPEG)")
+    parser.add_argument('--replay', metavar='PATH',
+                        help="replay a recorded session instead of the camera")
+    parser.add_argument('--speed', type=float, default=1.0,
+                        help="replay speed (2.0 = twice as fast, 0 = unpaced)")
+    parser.add_argument('--headless', action='store_true', help="run without a window")
+    parser.add_argument('--verify', action='store_true',
+                        help="with --replay: replay unpaced and at --speed, and fail "
+                             "unless both end on the same screen with the same cart")
+    args = parser.parse_args()
+    
+    if args.verify:
+        if not args.replay:
+            parser.error("--verify needs --replay")
+        sys.exit(0 if verify_replay(args.replay, args.speed) else 1)
+    
+    recording = None
     try:
-        app = AirMenu()
+        options = {'show_window': not args.headless}
+        if args.replay:
+            recording = SessionRecording(args.replay)
+            options['capture'] = ReplayCapture(recording, args.speed)
+            options['hand_tracker'] = ReplayHandTracker(recording)
+        if args.record:
+            options['recorder'] = SessionRecorder(args.record, args.record_frames)
+        app = AirMenu(**options)
         app.run()
     except Exception as e:
         print(f"Fatal error: {e}")
         import traceback
         traceback.print_exc()
+    finally:
+        if recording:
+            recording.close()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,175 @@
+"""
+Frame Profiler
+Measures wall time per pipeline stage with rolling percentiles, an
+optional on-screen overlay and Chrome trace-event export
+"""
+
+import functools
+import json
+import threading
+import time
+from collections import deque
+
+import cv2
+import numpy as np
+from config import *
+
+
+class _Section:
+    """Context manager that times one pass through a stage"""
+    __slots__ = ('profiler', 'name', 'start')
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.profiler.record(self.name, self.start, time.perf_counter_ns())
+        return False
+
+
+class _NullSection:
+    """Does nothing; used while profiling is disabled"""
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NULL_SECTION = _NullSection()
+
+
+class FrameProfiler:
+    def __init__(self, enabled=PROFILER_ENABLED, window=PROFILER_WINDOW,
+                 trace=PROFILER_TRACE_PATH is not None,
+                 max_trace_events=PROFILER_MAX_TRACE_EVENTS):
+        self.enabled = enabled
+        self.window = window
+        self.show_hud = PROFILER_HUD
+
+        # Stage name -> recent durations in nanoseconds
+        self.samples = {}
+        self.order = []  # Stage names in first-seen order
+
+        # Chrome trace events (bounded; oldest are dropped)
+        self.trace = trace
+        self.trace_events = deque(maxlen=max_trace_events)
+        self._epoch_ns = time.perf_counter_ns()
+
+        # HUD lines are refreshed periodically, not every frame
+        self._hud_lines = []
+        self._hud_frame = 0
+
+    def section(self, name):
+        """Time a stage: with profiler.section('name'): ..."""
+        if not self.enabled:
+            return _NULL_SECTION
+        return _Section(self, name)
+
+    def profile(self, name):
+        """Decorator that times every call of a function as a stage"""
+        def decorator(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return func(*args, **kwargs)
+                start = time.perf_counter_ns()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    self.record(name, start, time.perf_counter_ns())
+            return wrapper
+        return decorator
+
+    def record(self, name, start_ns, end_ns):
+        """Record one timed pass through a stage"""
+        samples = self.samples.get(name)
+        if samples is None:
+            samples = deque(maxlen=self.window)
+            self.samples[name] = samples
+            self.order.append(name)
+        samples.append(end_ns - start_ns)
+
+        if self.trace:
+            self.trace_events.append(
+                (name, start_ns, end_ns, threading.get_ident())
+            )
+
+    def reset(self):
+        """Drop all recorded samples and trace events"""
+        self.samples = {}
+        self.order = []
+        self.trace_events.clear()
+        self._hud_lines = []
+
+    def get_stats(self):
+        """Rolling p50/p95/p99 (milliseconds) and sample count per stage"""
+        stats = {}
+        for name in list(self.order):
+            # Snapshot first: the capture and inference threads append concurrently
+            samples = np.array(list(self.samples[name]), dtype=np.float64)
+            if len(samples) == 0:
+                continue
+            p50, p95, p99 = np.percentile(samples, (50, 95, 99)) / 1e6
+            stats[name] = {
+                'p50': float(p50), 'p95': float(p95), 'p99': float(p99),
+                'count': len(samples),
+            }
+        return stats
+
+    def draw_hud(self, frame, refresh_frames=15, max_lines=14):
+        """Draw the slowest stages (by p95) in the top-right corner"""
+        self._hud_frame += 1
+        if not self._hud_lines or self._hud_frame >= refresh_frames:
+            self._hud_frame = 0
+            stats = self.get_stats()
+            slowest = sorted(stats.items(), key=lambda item: -item[1]['p95'])
+            self._hud_lines = [
+                f"{name[:28]:<28} {s['p50']:6.2f} {s['p95']:6.2f} {s['p99']:6.2f}"
+                for name, s in slowest[:max_lines]
+            ]
+
+        x = frame.shape[1] - 430
+        y = 60
+        cv2.rectangle(
+            frame, (x - 10, y - 20), (frame.shape[1] - 10, y + 18 * len(self._hud_lines) + 8),
+            COLOR_BACKGROUND, -1
+        )
+        cv2.putText(
+            frame, f"{'stage (ms)':<28} {'p50':>6} {'p95':>6} {'p99':>6}",
+            (x, y), cv2.FONT_HERSHEY_PLAIN, 0.9, COLOR_TEXT_DIM, 1, cv2.LINE_AA
+        )
+        for i, line in enumerate(self._hud_lines):
+            cv2.putText(
+                frame, line, (x, y + 18 * (i + 1)),
+                cv2.FONT_HERSHEY_PLAIN, 0.9, COLOR_TEXT, 1, cv2.LINE_AA
+            )
+        return frame
+
+    def export_trace(self, path):
+        """Write recorded sections as a Chrome trace-event JSON file"""
+        events = [
+            {
+                'name': name,
+                'ph': 'X',
+                'ts': (start_ns - self._epoch_ns) / 1000,
+                'dur': (end_ns - start_ns) / 1000,
+                'pid': 1,
+                'tid': tid,
+            }
+            for name, start_ns, end_ns, tid in list(self.trace_events)
+        ]
+        with open(path, 'w') as f:
+            json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, f)
+        return len(events)
+
+
+# Shared profiler used across the pipeline
+profiler = FrameProfiler()
@@ -0,0 +1,114 @@
+"""
+Adaptive Quality Governor
+Watches rolling frame time against the frame budget and steps effect
+quality down when it is exceeded, and back up when headroom returns
+"""
+
+from collections import deque, namedtuple
+
+from config import *
+
+
+# Effect settings for one quality level
+#   glass_blur / button_blur: blur kernel sizes (0 = no blur, tint only)
+#   box_blur: box filter instead of Gaussian
+#   glow: hover glow around cards and buttons
+#   title_glow: blurred glow behind the home screen title
+QualityTier = namedtuple(
+    'QualityTier',
+    ['name', 'glass_blur', 'button_blur', 'box_blur', 'glow', 'title_glow']
+)
+
+# Ordered from best to cheapest
+QUALITY_TIERS = (
+    QualityTier('high', GLASS_BLUR_AMOUNT, 15, False, True, True),
+    QualityTier('medium', 15, 11, False, True, True),
+    QualityTier('low', 11, 9, True, False, True),
+    QualityTier('minimal', 0, 0, True, False, False),
+)
+
+
+class QualityGovernor:
+    def __init__(self, target_fps=FPS_TARGET, tiers=QUALITY_TIERS,
+                 enabled=QUALITY_GOVERNOR_ENABLED, level=QUALITY_START_LEVEL):
+        self.tiers = tiers
+        self.enabled = enabled
+        self.level = min(level, len(tiers) - 1)
+        self.budget_ms = 1000.0 / target_fps
+
+        self.frame_ms = deque(maxlen=QUALITY_WINDOW)
+        self.frames_since_change = 0
+
+        # Holding off after an upgrade that had to be undone keeps quality
+        # from oscillating between two tiers
+        self.upgrade_hold = QUALITY_HOLD_FRAMES
+        self._upgraded = False
+
+        self.downgrades = 0
+        self.upgrades = 0
+
+    @property
+    def tier(self):
+        """Effect settings components should render with"""
+        return self.tiers[self.level]
+
+    def set_level(self, level):
+        """Jump to a quality level (0 is the best)"""
+        level = max(0, min(level, len(self.tiers) - 1))
+        if level != self.level:
+            self.level = level
+            self.frame_ms.clear()
+            self.frames_since_change = 0
+
+    def record_frame(self, frame_ms):
+        """
+        Report the time spent producing one frame
+        Returns True if the quality level changed
+        """
+        if not self.enabled:
+            return False
+
+        self.frame_ms.append(frame_ms)
+        self.frames_since_change += 1
+        if len(self.frame_ms) < self.frame_ms.maxlen:
+            return False
+
+        average = sum(self.frame_ms) / len(self.frame_ms)
+
+        if (average > self.budget_ms * QUALITY_DOWNGRADE_AT
+                and self.level < len(self.tiers) - 1
+                and self.frames_since_change >= QUALITY_HOLD_FRAMES):
+            if self._upgraded and self.frames_since_change < 2 * self.upgrade_hold:
+                # The last step up did not fit the budget
+                self.upgrade_hold = min(self.upgrade_hold * 2, 8 * QUALITY_HOLD_FRAMES)
+            self._upgraded = False
+            self.downgrades += 1
+            self.set_level(self.level + 1)
+            return True
+
+        if (average < self.budget_ms * QUALITY_UPGRADE_AT
+                and self.level > 0
+                and self.frames_since_change >= self.upgrade_hold):
+            self._upgraded = True
+            self.upgrades += 1
+            self.set_level(self.level - 1)
+            return True
+
+        if self.frames_since_change >= 4 * self.upgrade_hold:
+            # Stable for a while: forget earlier oscillation
+            self.upgrade_hold = QUALITY_HOLD_FRAMES
+            self._upgraded = False
+        return False
+
+    def get_stats(self):
+        """Current tier and how often it changed"""
+        return {
+            'level': self.level,
+            'tier': self.tier.name,
+            'downgrades': self.downgrades,
+            'upgrades': self.upgrades,
+        }
+
+
+# Shared governor read by screens and components
+governor = QualityGovernor()
@@ -3,6 +3,9 @@ Base Screen Class
 All screens inherit from this
 """
 
+from ui_framework.base_component import BaseComponent
+from ui_framework.hit_index import HitIndex
+
 
 class BaseScreen:
     def __init__(self, state_manager, cart_manager):
@@ -10,6 +13,8 @@ class BaseScreen:
         self.cart_manager = cart_manager
         self.components = []
         self.active = False
+        self.hit_index = HitIndex()  # Hover and pinch targets
+        self.hovered = set()
     
     def on_enter(self):
         """Called when screen becomes active"""
@@ -19,14 +24,49 @@ class BaseScreen:
         """Called when leaving this screen"""
         self.active = False
     
-    def update(self, cursor_pos, current_time):
-        """Update screen logic and interactions"""
+    def update(self, cursors, current_time):
+        """
+        Update screen logic and interactions
+        cursors is a list of (x, y) positions, one per tracked hand
+        """
         pass
     
+    def update_hover(self, cursors):
+        """Hover the topmost component under each cursor and return them (a set)"""
+        targets = set()
+        for cursor_pos in cursors:
+            target = self.hit_index.query(
+                *cursor_pos, accept=lambda key: isinstance(key, BaseComponent)
+            )
+            if target is not None:
+                targets.add(target)
+        for component in self.hovered - targets:
+            if component.state == "hover":
+                component.state = "normal"
+        for component in targets - self.hovered:
+            component.state = "hover"
+        self.hovered = targets
+        return targets
+    
     def render(self, frame):
         """Render screen to frame"""
         pass
     
     def handle_pinch(self, cursor_pos, current_time):
-        """Handle pinch gesture"""
+        """Handle pinch gesture (called per hand, with that hand's cursor)"""
+        pass
+    
+    def handle_drag(self, cursor_pos, current_time):
+        """
+        Called every frame while a pinch is held, with the cursor position
+        Only one hand drags at a time
+        """
+        pass
+    
+    def handle_drag_end(self, current_time):
+        """Called when a held pinch is released"""
+        pass
+    
+    def handle_gesture(self, gesture, current_time):
+        """Handle a temporal gesture (swipe, scroll, open palm, grab)"""
         pass
@@ -7,6 +7,10 @@ from screens.base_screen import BaseScreen
 from ui_framework.glass_card import GlassCard
 from ui_framework.glass_button import GlassButton
 from ui_framework.rendering_utils import *
+from ui_framework.backdrop import backdrop
+from ui_framework.render_scale import render_scaler
+from ui_framework.compositor import Compositor
+from ui_framework.scene_graph import SceneGraph
 from ui_framework.icons import draw_back_arrow, draw_plus_icon, draw_minus_icon
 from billing_engine import BillingEngine
 from state_manager import ScreenState
@@ -28,6 +32,23 @@ class CartScreen(BaseScreen):
             callback=self.on_checkout,
             color=COLOR_SUCCESS
         )
+        
+        # Billing summary card
+        self.summary_x = SCREEN_WIDTH - 350
+        self.summary_y = SCREEN_HEIGHT - 220
+        self.summary_card = GlassCard(
+            self.summary_x - 20, self.summary_y - 20, 320, 100, border_color=COLOR_ACCENT
+        )
+        
+        # Item cards below the summary, checkout button on top
+        self.scene = SceneGraph()
+        self.card_nodes = []
+        self.summary_node = self.scene.add(self.summary_card, z=1, content=self._draw_summary)
+        self.scene.add(self.checkout_button, z=2)
+        
+        # Hit targets: item cards and their controls go in the 'items' layer
+        self.hit_index.insert(self.checkout_button, self.checkout_button.get_rect(), z=2)
+        self.hit_index.insert('back', self.back_button_rect, z=3)
     
     def on_enter(self):
         """Refresh cart items"""
@@ -36,6 +57,10 @@ class CartScreen(BaseScreen):
     
     def _create_item_cards(self):
         """Create cards for cart items"""
+        for node in self.card_nodes:
+            self.scene.remove(node)
+        self.hit_index.clear('items')
+        self.card_nodes = []
         self.item_cards = []
         cart_items = self.cart_manager.get_items()
         
@@ -58,6 +83,12 @@ class CartScreen(BaseScreen):
             card.plus_btn_rect = (controls_x + 85, controls_y, 40, 40)
             
             self.item_cards.append(card)
+            self.card_nodes.append(
+                self.scene.add(card, content=self._draw_item, data=dict(item))
+            )
+            self.hit_index.insert(card, card.get_rect(), layer='items')
+            self.hit_index.insert(('minus', card), card.minus_btn_rect, z=1, layer='items')
+            self.hit_index.insert(('plus', card), card.plus_btn_rect, z=1, layer='items')
     
     def on_checkout(self):
         """Proceed to checkout"""
@@ -65,160 +96,157 @@ class CartScreen(BaseScreen):
             receipt = BillingEngine.generate_receipt(self.cart_manager.get_items())
             self.state_manager.transition_to(ScreenState.RECEIPT, {'receipt': receipt})
     
-    def update(self, cursor_pos, current_time):
+    def update(self, cursors, current_time):
         """Update cart screen"""
-        # Update button states
-        self.checkout_button.update_hover_state(cursor_pos)
+        # Checkout is only a target while there is something to check out
+        self.hit_index.set_active(self.checkout_button, not self.cart_manager.is_empty())
+        
+        # Update button and card hover states
+        self.update_hover(cursors)
         
         # Check for dwell on checkout
         is_hovering = self.checkout_button.state == "hover"
         if self.checkout_button.update_dwell(is_hovering, current_time):
             self.on_checkout()
-        
-        # Update card hover states
-        for card in self.item_cards:
-            card.update_hover_state(cursor_pos)
     
     def render(self, frame):
         """Render cart screen"""
-        # Background
-        gradient = create_gradient(
-            SCREEN_WIDTH, SCREEN_HEIGHT,
-            (30, 25, 20), (15, 10, 20), vertical=True
-        )
-        frame = alpha_blend(gradient, frame, 0.6)
+        # Background (at the internal render resolution)
+        h, w = frame.shape[:2]
+        gradient = get_cached_gradient(w, h, (30, 25, 20), (15, 10, 20), vertical=True)
+        background = alpha_blend(gradient, frame, 0.6)
+        frame = render_scaler.upscale(background)
         
         # Header
-        cv2.putText(
+        draw_text(
             frame, "Your Cart",
             (SCREEN_WIDTH // 2 - 100, 80),
             FONT_FACE, FONT_SCALE_LARGE, COLOR_TEXT,
-            FONT_THICKNESS, cv2.LINE_AA
+            FONT_THICKNESS
         )
         
         # Check if cart is empty
-        if self.cart_manager.is_empty():
-            cv2.putText(
+        is_empty = self.cart_manager.is_empty()
+        if is_empty:
+            draw_text(
                 frame, "Cart is empty",
                 (SCREEN_WIDTH // 2 - 120, SCREEN_HEIGHT // 2),
                 FONT_FACE, FONT_SCALE_MEDIUM, COLOR_TEXT_DIM,
-                FONT_THICKNESS_THIN, cv2.LINE_AA
+                FONT_THICKNESS_THIN
             )
         else:
-            # Render cart items
-            for card in self.item_cards:
-                frame = card.render(frame)
-                
-                content_x, content_y, content_w, content_h = card.get_content_area()
-                
-                # Item name
-                cv2.putText(
-                    frame, card.item_data['name'],
-                    (content_x, content_y + 20),
-                    FONT_FACE, FONT_SCALE_SMALL, COLOR_TEXT,
-                    FONT_THICKNESS_THIN, cv2.LINE_AA
-                )
-                
-                # Price
-                price_text = f"{CURRENCY_SYMBOL}{card.item_data['price']} each"
-                cv2.putText(
-                    frame, price_text,
-                    (content_x, content_y + 45),
-                    FONT_FACE, FONT_SCALE_SMALL - 0.1, COLOR_TEXT_DIM,
-                    FONT_THICKNESS_THIN, cv2.LINE_AA
-                )
-                
-                # Quantity controls
-                minus_x, minus_y, minus_w, minus_h = card.minus_btn_rect
-                plus_x, plus_y, plus_w, plus_h = card.plus_btn_rect
-                
-                # Minus button
-                minus_overlay = frame.copy()
-                draw_rounded_rectangle(minus_overlay, minus_x, minus_y, minus_w, minus_h, 8, COLOR_WARNING, -1)
-                frame = alpha_blend(minus_overlay, frame, 0.6)
-                draw_minus_icon(frame, minus_x + 5, minus_y + 5, 30, COLOR_TEXT)
-                
-                # Quantity display
-                qty_text = str(card.item_data['quantity'])
-                qty_x = minus_x + minus_w + 15
-                qty_y = minus_y + 28
-                cv2.putText(
-                    frame, qty_text,
-                    (qty_x, qty_y),
-                    FONT_FACE, FONT_SCALE_MEDIUM, COLOR_TEXT,
-                    FONT_THICKNESS, cv2.LINE_AA
-                )
-                
-                # Plus button
-                plus_overlay = frame.copy()
-                draw_rounded_rectangle(plus_overlay, plus_x, plus_y, plus_w, plus_h, 8, COLOR_SUCCESS, -1)
-                frame = alpha_blend(plus_overlay, frame, 0.6)
-                draw_plus_icon(frame, plus_x + 5, plus_y + 5, 30, COLOR_TEXT)
-            
             # Billing summary
             subtotal = self.cart_manager.get_subtotal()
             gst = BillingEngine.calculate_gst(subtotal)
             total = BillingEngine.calculate_total(subtotal, gst)
-            
-            summary_y = SCREEN_HEIGHT - 220
-            summary_x = SCREEN_WIDTH - 350
-            
-            # Summary card
-            summary_card = GlassCard(summary_x - 20, summary_y - 20, 320, 100, border_color=COLOR_ACCENT)
-            frame = summary_card.render(frame)
-            
-            cv2.putText(frame, f"Subtotal: {CURRENCY_SYMBOL}{subtotal:.2f}",
-                       (summary_x, summary_y + 10), FONT_FACE, FONT_SCALE_SMALL,
-                       COLOR_TEXT_DIM, FONT_THICKNESS_THIN, cv2.LINE_AA)
-            
-            cv2.putText(frame, f"GST (18%): {CURRENCY_SYMBOL}{gst:.2f}",
-                       (summary_x, summary_y + 35), FONT_FACE, FONT_SCALE_SMALL,
-                       COLOR_TEXT_DIM, FONT_THICKNESS_THIN, cv2.LINE_AA)
-            
-            cv2.putText(frame, f"Total: {CURRENCY_SYMBOL}{total:.2f}",
-                       (summary_x, summary_y + 65), FONT_FACE, FONT_SCALE_MEDIUM,
-                       COLOR_ACCENT, FONT_THICKNESS, cv2.LINE_AA)
-            
-            # Checkout button
-            frame = self.checkout_button.render(frame)
+            self.summary_node.set_data((subtotal, gst, total))
+        backdrop.update(frame, background)
+        
+        # Cart items, summary card and checkout button
+        self.summary_card.visible = not is_empty
+        self.checkout_button.visible = not is_empty
+        frame = self.scene.render(frame)
         
         # Back button
         bx, by, bw, bh = self.back_button_rect
-        back_overlay = frame.copy()
-        draw_rounded_rectangle(back_overlay, bx, by, bw, bh, 10, COLOR_SECONDARY, 2)
-        frame = alpha_blend(back_overlay, frame, 0.6)
+        compositor = Compositor()
+        compositor.rounded_rectangle(bx, by, bw, bh, 10, COLOR_SECONDARY, 2, alpha=0.6)
+        compositor.flush(frame)
         draw_back_arrow(frame, bx + 35, by + 10, 30, COLOR_SECONDARY)
         
         return frame
     
+    def _draw_item(self, frame, node):
+        """Draw a cart item's details and quantity controls inside its card"""
+        card = node.component
+        item = node.data
+        content_x, content_y, content_w, content_h = card.get_content_area()
+        
+        # Item name
+        draw_text(
+            frame, item['name'],
+            (content_x, content_y + 20),
+            FONT_FACE, FONT_SCALE_SMALL, COLOR_TEXT,
+            FONT_THICKNESS_THIN
+        )
+        
+        # Price
+        price_text = f"{CURRENCY_SYMBOL}{item['price']} each"
+        draw_text(
+            frame, price_text,
+            (content_x, content_y + 45),
+            FONT_FACE, FONT_SCALE_SMALL - 0.1, COLOR_TEXT_DIM,
+            FONT_THICKNESS_THIN
+        )
+        
+        # Quantity controls
+        minus_x, minus_y, minus_w, minus_h = card.minus_btn_rect
+        plus_x, plus_y, plus_w, plus_h = card.plus_btn_rect
+        
+        # Minus and plus buttons (one batched layer)
+        compositor = Compositor()
+        compositor.layer(0.6) \
+            .rounded_rectangle(minus_x, minus_y, minus_w, minus_h, 8, COLOR_WARNING, -1) \
+            .rounded_rectangle(plus_x, plus_y, plus_w, plus_h, 8, COLOR_SUCCESS, -1)
+        compositor.flush(frame)
+        draw_minus_icon(frame, minus_x + 5, minus_y + 5, 30, COLOR_TEXT)
+        
+        # Quantity display
+        qty_text = str(item['quantity'])
+        qty_x = minus_x + minus_w + 15
+        qty_y = minus_y + 28
+        draw_text(
+            frame, qty_text,
+            (qty_x, qty_y),
+            FONT_FACE, FONT_SCALE_MEDIUM, COLOR_TEXT,
+            FONT_THICKNESS
+        )
+        
+        # Plus icon
+        draw_plus_icon(frame, plus_x + 5, plus_y + 5, 30, COLOR_TEXT)
+    
+    def _draw_summary(self, frame, node):
+        """Draw the billing totals inside the summary card"""
+        subtotal, gst, total = node.data
+        summary_x, summary_y = self.summary_x, self.summary_y
+        
+        draw_text(frame, f"Subtotal: {CURRENCY_SYMBOL}{subtotal:.2f}",
+                   (summary_x, summary_y + 10), FONT_FACE, FONT_SCALE_SMALL,
+                   COLOR_TEXT_DIM, FONT_THICKNESS_THIN)
+        
+        draw_text(frame, f"GST (18%): {CURRENCY_SYMBOL}{gst:.2f}",
+                   (summary_x, summary_y + 35), FONT_FACE, FONT_SCALE_SMALL,
+                   COLOR_TEXT_DIM, FONT_THICKNESS_THIN)
+        
+        draw_text(frame, f"Total: {CURRENCY_SYMBOL}{total:.2f}",
+                   (summary_x, summary_y + 65), FONT_FACE, FONT_SCALE_MEDIUM,
+                   COLOR_ACCENT, FONT_THICKNESS)
+    
     def handle_pinch(self, cursor_pos, current_time):
         """Handle pinch gesture"""
-        # Check back button
-        bx, by, bw, bh = self.back_button_rect
-        if bx <= cursor_pos[0] <= bx + bw and by <= cursor_pos[1] <= by + bh:
+        self.hit_index.set_active(self.checkout_button, not self.cart_manager.is_empty())
+        target = self.hit_index.query(*cursor_pos)
+        
+        # Back button
+        if target == 'back':
             self.state_manager.go_back()
-            return
         
-        # Check checkout button
-        if not self.cart_manager.is_empty():
-            if self.checkout_button.is_point_inside(*cursor_pos):
-                self.on_checkout()
-                return
-        
-        # Check quantity controls
-        for card in self.item_cards:
-            # Minus button
-            mx, my, mw, mh = card.minus_btn_rect
-            if mx <= cursor_pos[0] <= mx + mw and my <= cursor_pos[1] <= my + mh:
-                new_qty = card.item_data['quantity'] - 1
-                self.cart_manager.update_quantity(card.item_data['id'], new_qty)
-                self._create_item_cards()  # Refresh
-                break
-            
-            # Plus button
-            px, py, pw, ph = card.plus_btn_rect
-            if px <= cursor_pos[0] <= px + pw and py <= cursor_pos[1] <= py + ph:
-                new_qty = card.item_data['quantity'] + 1
-                self.cart_manager.update_quantity(card.item_data['id'], new_qty)
-                self._create_item_cards()  # Refresh
-                break
+        # Checkout button
+        elif target is self.checkout_button:
+            self.on_checkout()
+        
+        # Quantity controls
+        elif isinstance(target, tuple):
+            control, card = target
+            step = -1 if control == 'minus' else 1
+            new_qty = card.item_data['quantity'] + step
+            self.cart_manager.update_quantity(card.item_data['id'], new_qty)
+            self._create_item_cards()  # Refresh
+    
+    def handle_gesture(self, gesture, current_time):
+        """
+        Swipe right or open palm to go back. Checkout stays on its button
+        (pinch or dwell), so a wave can't place the order
+        """
+        if gesture.name in ('swipe_right', 'open_palm'):
+            self.state_manager.go_back()
@@ -6,6 +6,10 @@ import cv2
 from screens.base_screen import BaseScreen
 from ui_framework.glass_card import GlassCard
 from ui_framework.rendering_utils import *
+from ui_framework.backdrop import backdrop
+from ui_framework.render_scale import render_scaler
+from ui_framework.compositor import Compositor
+from ui_framework.scene_graph import SceneGraph
 from ui_framework.icons import draw_category_icon, draw_back_arrow
 from data.menu_data import get_categories
 from state_manager import ScreenState
@@ -26,6 +30,7 @@ class CategoryScreen(BaseScreen):
         start_x = (SCREEN_WIDTH - (2 * card_width + spacing)) // 2
         start_y = 150
         
+        self.scene = SceneGraph()
         for i, category in enumerate(self.categories):
             row = i // 2
             col = i % 2
@@ -35,79 +40,87 @@ class CategoryScreen(BaseScreen):
             card = GlassCard(x, y, card_width, card_height, border_color=COLOR_PRIMARY)
             card.category_data = category
             self.category_cards.append(card)
+            self.scene.add(card, content=self._draw_category, data=category)
+            self.hit_index.insert(card, card.get_rect())
+        
+        self.hit_index.insert('back', self.back_button_rect, z=1)
     
     def on_enter(self):
         super().on_enter()
     
-    def update(self, cursor_pos, current_time):
+    def update(self, cursors, current_time):
         """Update category screen"""
         # Update card hover states
-        for card in self.category_cards:
-            card.update_hover_state(cursor_pos)
+        self.update_hover(cursors)
     
     def render(self, frame):
         """Render category screen"""
-        # Background
-        gradient = create_gradient(
-            SCREEN_WIDTH, SCREEN_HEIGHT,
-            (30, 20, 20), (10, 10, 20), vertical=True
-        )
-        frame = alpha_blend(gradient, frame, 0.6)
+        # Background (at the internal render resolution)
+        h, w = frame.shape[:2]
+        gradient = get_cached_gradient(w, h, (30, 20, 20), (10, 10, 20), vertical=True)
+        background = alpha_blend(gradient, frame, 0.6)
+        frame = render_scaler.upscale(background)
         
         # Header
-        cv2.putText(
+        draw_text(
             frame, "Select Category",
             (SCREEN_WIDTH // 2 - 150, 80),
             FONT_FACE, FONT_SCALE_LARGE, COLOR_TEXT,
-            FONT_THICKNESS, cv2.LINE_AA
+            FONT_THICKNESS
         )
         
-        # Render category cards
-        for card in self.category_cards:
-            frame = card.render(frame)
-            
-            # Render category icon and text
-            content_x, content_y, content_w, content_h = card.get_content_area()
-            
-            # Icon
-            icon_size = 60
-            icon_x = card.x + (card.width - icon_size) // 2
-            icon_y = content_y + 10
-            draw_category_icon(
-                frame, icon_x, icon_y, icon_size,
-                COLOR_PRIMARY, card.category_data['icon']
-            )
-            
-            # Category name
-            name_y = icon_y + icon_size + 30
-            draw_text_centered(
-                frame, card.category_data['name'],
-                card.x, name_y - 20, card.width, 40,
-                COLOR_TEXT, FONT_FACE, FONT_SCALE_MEDIUM, FONT_THICKNESS_THIN
-            )
+        backdrop.update(frame, background)
+        
+        # Category cards
+        frame = self.scene.render(frame)
         
         # Back button
         bx, by, bw, bh = self.back_button_rect
-        back_overlay = frame.copy()
-        draw_rounded_rectangle(back_overlay, bx, by, bw, bh, 10, COLOR_SECONDARY, 2)
-        frame = alpha_blend(back_overlay, frame, 0.6)
+        compositor = Compositor()
+        compositor.rounded_rectangle(bx, by, bw, bh, 10, COLOR_SECONDARY, 2, alpha=0.6)
+        compositor.flush(frame)
         draw_back_arrow(frame, bx + 35, by + 10, 30, COLOR_SECONDARY)
         
         return frame
     
+    def _draw_category(self, frame, node):
+        """Draw a category's icon and name inside its card"""
+        card = node.component
+        content_x, content_y, content_w, content_h = card.get_content_area()
+        
+        # Icon
+        icon_size = 60
+        icon_x = card.x + (card.width - icon_size) // 2
+        icon_y = content_y + 10
+        draw_category_icon(
+            frame, icon_x, icon_y, icon_size,
+            COLOR_PRIMARY, node.data['icon']
+        )
+        
+        # Category name
+        name_y = icon_y + icon_size + 30
+        draw_text_centered(
+            frame, node.data['name'],
+            card.x, name_y - 20, card.width, 40,
+            COLOR_TEXT, FONT_FACE, FONT_SCALE_MEDIUM, FONT_THICKNESS_THIN
+        )
+    
     def handle_pinch(self, cursor_pos, current_time):
         """Handle pinch gesture"""
-        # Check back button
-        bx, by, bw, bh = self.back_button_rect
-        if bx <= cursor_pos[0] <= bx + bw and by <= cursor_pos[1] <= by + bh:
+        target = self.hit_index.query(*cursor_pos)
+        
+        # Back button
+        if target == 'back':
             self.state_manager.go_back()
-            return
         
-        # Check category cards
-        for card in self.category_cards:
-            if card.is_point_inside(*cursor_pos):
-                self.state_manager.transition_to(
-                    ScreenState.ITEMS,
-                    {'category': card.category_data}
-                )
-                break
+        # Category card
+        elif target is not None:
+            self.state_manager.transition_to(
+                ScreenState.ITEMS,
+                {'category': target.category_data}
+            )
+    
+    def handle_gesture(self, gesture, current_time):
+        """Swipe right or open palm to go back"""
+        if gesture.name in ('swipe_right', 'open_palm'):
+            self.state_manager.go_back()
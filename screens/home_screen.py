@@ -6,7 +6,11 @@ import cv2
 from screens.base_screen import BaseScreen
 from ui_framework.glass_button import GlassButton
 from ui_framework.rendering_utils import *
+from ui_framework.backdrop import backdrop
+from ui_framework.render_scale import render_scaler
 from ui_framework.icons import draw_home_icon
+from ui_framework.scene_graph import SceneGraph
+from quality_governor import governor
 from state_manager import ScreenState
 from config import *
 
@@ -29,6 +33,8 @@ class HomeScreen(BaseScreen):
         )
         
         self.components = [self.start_button]
+        self.scene = SceneGraph()
+        self.scene.add(self.start_button)
     
     def on_start_click(self):
         """Navigate to category screen"""
@@ -37,10 +43,10 @@ class HomeScreen(BaseScreen):
     def on_enter(self):
         super().on_enter()
     
-    def update(self, cursor_pos, current_time):
+    def update(self, cursors, current_time):
         """Update home screen"""
         # Update button hover state
-        self.start_button.update_hover_state(cursor_pos)
+        self.start_button.update_hover_state(cursors)
         
         # Check for dwell click
         is_hovering = self.start_button.state == "hover"
@@ -49,56 +55,57 @@ class HomeScreen(BaseScreen):
     
     def render(self, frame):
         """Render home screen"""
-        # Background gradient
-        gradient = create_gradient(
-            SCREEN_WIDTH, SCREEN_HEIGHT,
-            (40, 25, 15), (15, 10, 25), vertical=True
-        )
-        frame = alpha_blend(gradient, frame, 0.7)
+        # Background gradient (at the internal render resolution)
+        h, w = frame.shape[:2]
+        gradient = get_cached_gradient(w, h, (40, 25, 15), (15, 10, 25), vertical=True)
+        background = alpha_blend(gradient, frame, 0.7)
+        frame = render_scaler.upscale(background)
         
         # Title with glow
         title = "AirMenu"
         title_y = SCREEN_HEIGHT // 2 - 100
         
-        # Glow effect for title
-        glow_layer = np.zeros_like(frame)
-        cv2.putText(
-            glow_layer, title,
-            (SCREEN_WIDTH // 2 - 200, title_y),
-            FONT_FACE, 2.5, COLOR_PRIMARY,
-            8, cv2.LINE_AA
-        )
-        glow_layer = cv2.GaussianBlur(glow_layer, (25, 25), 0)
-        frame = alpha_blend(glow_layer, frame, 0.8)
+        # Glow effect for title (cheaper tiers keep only its dimming)
+        if governor.tier.title_glow:
+            add_text_glow(
+                frame, title,
+                (SCREEN_WIDTH // 2 - 200, title_y),
+                FONT_FACE, 2.5, COLOR_PRIMARY,
+                8, blur=25, intensity=0.8
+            )
+        else:
+            scale_brightness(frame, 1 - 0.8)
         
         # Main title
-        cv2.putText(
+        draw_text(
             frame, title,
             (SCREEN_WIDTH // 2 - 200, title_y),
             FONT_FACE, 2.5, COLOR_TEXT,
-            3, cv2.LINE_AA
+            3
         )
         
         # Subtitle
         subtitle = "Touchless AR Restaurant Menu"
-        cv2.putText(
+        draw_text(
             frame, subtitle,
             (SCREEN_WIDTH // 2 - 280, title_y + 60),
             FONT_FACE, FONT_SCALE_MEDIUM, COLOR_TEXT_DIM,
-            FONT_THICKNESS_THIN, cv2.LINE_AA
+            FONT_THICKNESS_THIN
         )
         
         # Instructions
         instruction = "Hover and hold to select"
-        cv2.putText(
+        draw_text(
             frame, instruction,
             (SCREEN_WIDTH // 2 - 180, SCREEN_HEIGHT // 2 + 150),
             FONT_FACE, FONT_SCALE_SMALL, COLOR_TEXT_DIM,
-            FONT_THICKNESS_THIN, cv2.LINE_AA
+            FONT_THICKNESS_THIN
         )
         
+        backdrop.update(frame, background)
+        
         # Render button
-        frame = self.start_button.render(frame)
+        frame = self.scene.render(frame)
         
         return frame
     
@@ -106,3 +113,8 @@ class HomeScreen(BaseScreen):
         """Handle pinch gesture on home screen"""
         if self.start_button.is_point_inside(*cursor_pos):
             self.on_start_click()
+    
+    def handle_gesture(self, gesture, current_time):
+        """Swipe left or grab to start"""
+        if gesture.name in ('swipe_left', 'grab'):
+            self.on_start_click()
@@ -6,6 +6,10 @@ import cv2
 from screens.base_screen import BaseScreen
 from ui_framework.glass_card import GlassCard
 from ui_framework.rendering_utils import *
+from ui_framework.backdrop import backdrop
+from ui_framework.render_scale import render_scaler
+from ui_framework.compositor import Compositor
+from ui_framework.virtual_list import VirtualList
 from ui_framework.icons import draw_back_arrow, draw_plus_icon, draw_cart_icon
 from data.menu_data import get_items_by_category
 from state_manager import ScreenState
@@ -16,10 +20,27 @@ class ItemsScreen(BaseScreen):
     def __init__(self, state_manager, cart_manager):
         super().__init__(state_manager, cart_manager)
         self.items = []
-        self.item_cards = []
-        self.scroll_offset = 0
         self.back_button_rect = (20, 20, 100, 50)
         self.cart_button_rect = (SCREEN_WIDTH - 200, 20, 180, 50)
+        self.drag_in_list = None  # Whether the current drag began on the list
+        self.pending_add = None  # Item index of an add button pinched, added on release
+        
+        # Only the rows in view get a (recycled) card
+        self.item_list = VirtualList(
+            50, 100, SCREEN_WIDTH - 100, SCREEN_HEIGHT - 100, ITEM_HEIGHT,
+            create_row=lambda: GlassCard(0, 0, SCREEN_WIDTH - 100, ITEM_HEIGHT,
+                                         border_color=COLOR_PRIMARY),
+            content=self._draw_item, padding=20,
+            bind=self._bind_card, release=self._release_card
+        )
+        
+        # Hit targets: cards and add buttons scroll together in the 'items' layer
+        self.hit_index.insert('back', self.back_button_rect, z=2)
+        self.hit_index.insert('cart', self.cart_button_rect, z=2)
+        list_view = self.item_list
+        self.hit_index.set_layer(
+            'items', clip=(list_view.x, list_view.y, list_view.width, list_view.height)
+        )
     
     def on_enter(self):
         """Load items for selected category"""
@@ -27,158 +48,176 @@ class ItemsScreen(BaseScreen):
         category = self.state_manager.selected_category
         if category:
             self.items = get_items_by_category(category['id'])
-            self._create_item_cards()
+            self.item_list.set_items(self.items)
+        self.drag_in_list = None
+        self.pending_add = None
     
-    def _create_item_cards(self):
-        """Create cards for each item"""
-        self.item_cards = []
-        card_width = SCREEN_WIDTH - 100
-        card_height = ITEM_HEIGHT
-        start_x = 50
-        start_y = 120
-        spacing = 15
-        
-        for i, item in enumerate(self.items):
-            y = start_y + i * (card_height + spacing)
-            card = GlassCard(start_x, y, card_width, card_height, border_color=COLOR_PRIMARY)
-            card.item_data = item
-            
-            # Add button position (on the right side of card)
-            card.add_btn_rect = (
-                start_x + card_width - 60,
-                y + (card_height - 40) // 2,
-                50, 40
-            )
-            
-            self.item_cards.append(card)
+    def _add_button_rect(self, card_x, card_y):
+        """Add button position (on the right side of a card)"""
+        return (
+            card_x + self.item_list.width - 60,
+            card_y + (ITEM_HEIGHT - 40) // 2,
+            50, 40
+        )
+    
+    def _bind_card(self, card, index):
+        """Move a pooled card's hit targets to the row it now shows"""
+        rect = self.item_list.row_rect(index)
+        add_rect = self._add_button_rect(rect[0], rect[1])
+        if card in self.hit_index:
+            self.hit_index.update(card, rect)
+            self.hit_index.update(('add', card), add_rect)
+        else:
+            self.hit_index.insert(card, rect, layer='items')
+            self.hit_index.insert(('add', card), add_rect, z=1, layer='items')
+        self.hit_index.set_active(card, True)
+        self.hit_index.set_active(('add', card), True)
+    
+    def _release_card(self, card):
+        """A card went back to the pool"""
+        self.hit_index.set_active(card, False)
+        self.hit_index.set_active(('add', card), False)
     
-    def update(self, cursor_pos, current_time):
+    def update(self, cursors, current_time):
         """Update items screen"""
-        # Update card hover states
-        for card in self.item_cards:
-            # Adjust for scroll
-            adjusted_y = cursor_pos[1] + self.scroll_offset if cursor_pos else None
-            if adjusted_y:
-                card.update_hover_state((cursor_pos[0], adjusted_y))
+        self.item_list.update(current_time)
+        
+        # Update card hover states (the index applies the scroll offset)
+        self.hit_index.set_layer('items', offset=(0, self.item_list.scroll_offset))
+        self.update_hover(cursors)
     
     def render(self, frame):
         """Render items screen"""
-        # Background
-        gradient = create_gradient(
-            SCREEN_WIDTH, SCREEN_HEIGHT,
-            (25, 20, 30), (10, 10, 20), vertical=True
-        )
-        frame = alpha_blend(gradient, frame, 0.6)
+        # Background (at the internal render resolution)
+        h, w = frame.shape[:2]
+        gradient = get_cached_gradient(w, h, (25, 20, 30), (10, 10, 20), vertical=True)
+        background = alpha_blend(gradient, frame, 0.6)
+        frame = render_scaler.upscale(background)
         
         # Header with category name
         category = self.state_manager.selected_category
         if category:
-            cv2.putText(
+            draw_text(
                 frame, category['name'],
                 (SCREEN_WIDTH // 2 - 100, 80),
                 FONT_FACE, FONT_SCALE_LARGE, COLOR_TEXT,
-                FONT_THICKNESS, cv2.LINE_AA
+                FONT_THICKNESS
             )
+        backdrop.update(frame, background)
         
-        # Render items (with scroll offset)
-        for card in self.item_cards:
-            # Check if card is visible
-            if card.y - self.scroll_offset < -ITEM_HEIGHT or card.y - self.scroll_offset > SCREEN_HEIGHT:
-                continue
-            
-            # Temporarily adjust y position for rendering
-            original_y = card.y
-            card.y = card.y - self.scroll_offset
-            
-            frame = card.render(frame)
-            
-            # Render item details
-            content_x, content_y, content_w, content_h = card.get_content_area()
-            
-            # Item name
-            cv2.putText(
-                frame, card.item_data['name'],
-                (content_x, content_y + 25),
-                FONT_FACE, FONT_SCALE_MEDIUM, COLOR_TEXT,
-                FONT_THICKNESS_THIN, cv2.LINE_AA
-            )
-            
-            # Description
-            cv2.putText(
-                frame, card.item_data['description'],
-                (content_x, content_y + 50),
-                FONT_FACE, FONT_SCALE_SMALL - 0.1, COLOR_TEXT_DIM,
-                FONT_THICKNESS_THIN, cv2.LINE_AA
-            )
-            
-            # Price
-            price_text = f"{CURRENCY_SYMBOL}{card.item_data['price']}"
-            cv2.putText(
-                frame, price_text,
-                (content_x, content_y + 80),
-                FONT_FACE, FONT_SCALE_MEDIUM, COLOR_ACCENT,
-                FONT_THICKNESS, cv2.LINE_AA
-            )
-            
-            # Add button
-            btn_x, btn_y, btn_w, btn_h = card.add_btn_rect
-            btn_y = btn_y - self.scroll_offset
-            
-            btn_overlay = frame.copy()
-            draw_rounded_rectangle(btn_overlay, btn_x, btn_y, btn_w, btn_h, 8, COLOR_SUCCESS, -1)
-            frame = alpha_blend(btn_overlay, frame, 0.7)
-            
-            draw_plus_icon(frame, btn_x + 10, btn_y + 5, 30, COLOR_TEXT)
-            
-            # Restore original y
-            card.y = original_y
+        # Items in view
+        frame = self.item_list.render(frame)
         
-        # Back button
+        # Back and cart button outlines (one batched layer)
         bx, by, bw, bh = self.back_button_rect
-        back_overlay = frame.copy()
-        draw_rounded_rectangle(back_overlay, bx, by, bw, bh, 10, COLOR_SECONDARY, 2)
-        frame = alpha_blend(back_overlay, frame, 0.6)
+        cx, cy, cw, ch = self.cart_button_rect
+        compositor = Compositor()
+        compositor.layer(0.6) \
+            .rounded_rectangle(bx, by, bw, bh, 10, COLOR_SECONDARY, 2) \
+            .rounded_rectangle(cx, cy, cw, ch, 10, COLOR_PRIMARY, 2)
+        compositor.flush(frame)
+        
+        # Back button
         draw_back_arrow(frame, bx + 35, by + 10, 30, COLOR_SECONDARY)
         
         # Cart button
-        cx, cy, cw, ch = self.cart_button_rect
-        cart_overlay = frame.copy()
-        draw_rounded_rectangle(cart_overlay, cx, cy, cw, ch, 10, COLOR_PRIMARY, 2)
-        frame = alpha_blend(cart_overlay, frame, 0.6)
-        
         draw_cart_icon(frame, cx + 10, cy + 10, 30, COLOR_PRIMARY)
         
         # Cart count
         cart_count = self.cart_manager.get_item_count()
         count_text = f"Cart ({cart_count})"
-        cv2.putText(
+        draw_text(
             frame, count_text,
             (cx + 50, cy + 35),
             FONT_FACE, FONT_SCALE_SMALL, COLOR_TEXT,
-            FONT_THICKNESS_THIN, cv2.LINE_AA
+            FONT_THICKNESS_THIN
         )
         
         return frame
     
+    def _draw_item(self, frame, node):
+        """Draw an item's details and add button inside its card"""
+        card = node.component
+        item = node.data
+        content_x, content_y, content_w, content_h = card.get_content_area()
+        
+        # Item name
+        draw_text(
+            frame, item['name'],
+            (content_x, content_y + 25),
+            FONT_FACE, FONT_SCALE_MEDIUM, COLOR_TEXT,
+            FONT_THICKNESS_THIN
+        )
+        
+        # Description
+        draw_text(
+            frame, item['description'],
+            (content_x, content_y + 50),
+            FONT_FACE, FONT_SCALE_SMALL - 0.1, COLOR_TEXT_DIM,
+            FONT_THICKNESS_THIN
+        )
+        
+        # Price
+        price_text = f"{CURRENCY_SYMBOL}{item['price']}"
+        draw_text(
+            frame, price_text,
+            (content_x, content_y + 80),
+            FONT_FACE, FONT_SCALE_MEDIUM, COLOR_ACCENT,
+            FONT_THICKNESS
+        )
+        
+        # Add button
+        btn_x, btn_y, btn_w, btn_h = self._add_button_rect(card.x, card.y)
+        compositor = Compositor()
+        compositor.rounded_rectangle(btn_x, btn_y, btn_w, btn_h, 8, COLOR_SUCCESS, -1, alpha=0.7)
+        compositor.flush(frame)
+        
+        draw_plus_icon(frame, btn_x + 10, btn_y + 5, 30, COLOR_TEXT)
+    
+    def handle_drag(self, cursor_pos, current_time):
+        """Scroll the list while a pinch (or mouse button) is held"""
+        if self.drag_in_list is None:
+            # Only drags that start on the list scroll it
+            self.drag_in_list = self.item_list.contains(*cursor_pos)
+        if self.drag_in_list:
+            self.item_list.drag(cursor_pos[1], current_time)
+            if self.item_list.dragging:
+                self.pending_add = None  # The pinch became a scroll
+    
+    def handle_drag_end(self, current_time):
+        """Let the list coast after a drag; a pinch that didn't scroll adds its item"""
+        if self.drag_in_list:
+            self.item_list.release_drag(current_time)
+        self.drag_in_list = None
+        if self.pending_add is not None:
+            self.cart_manager.add_item(self.items[self.pending_add]['id'], 1)
+            self.pending_add = None
+    
     def handle_pinch(self, cursor_pos, current_time):
         """Handle pinch gesture"""
-        # Check back button
-        bx, by, bw, bh = self.back_button_rect
-        if bx <= cursor_pos[0] <= bx + bw and by <= cursor_pos[1] <= by + bh:
+        target = self.hit_index.query(*cursor_pos)
+        
+        # Back button
+        if target == 'back':
             self.state_manager.go_back()
-            return
         
-        # Check cart button
-        cx, cy, cw, ch = self.cart_button_rect
-        if cx <= cursor_pos[0] <= cx + cw and cy <= cursor_pos[1] <= cy + ch:
+        # Cart button
+        elif target == 'cart':
+            self.state_manager.transition_to(ScreenState.CART)
+        
+        # Add buttons sit on the scrolling list, so they click on release,
+        # once it's clear the pinch didn't start a scroll
+        elif isinstance(target, tuple):
+            _, card = target
+            self.pending_add = card.index
+    
+    def handle_gesture(self, gesture, current_time):
+        """Two-finger scroll moves the list; swipes and open palm navigate"""
+        if gesture.name == 'scroll':
+            self.item_list.drag(gesture.value, current_time)
+        elif gesture.name == 'scroll_end':
+            self.item_list.release_drag(current_time)
+        elif gesture.name in ('swipe_right', 'open_palm'):
+            self.state_manager.go_back()
+        elif gesture.name == 'swipe_left':
             self.state_manager.transition_to(ScreenState.CART)
-            return
-        
-        # Check add buttons
-        for card in self.item_cards:
-            btn_x, btn_y, btn_w, btn_h = card.add_btn_rect
-            btn_y = btn_y - self.scroll_offset
-            
-            if btn_x <= cursor_pos[0] <= btn_x + btn_w and btn_y <= cursor_pos[1] <= btn_y + btn_h:
-                self.cart_manager.add_item(card.item_data['id'], 1)
-                break
@@ -7,6 +7,9 @@ from screens.base_screen import BaseScreen
 from ui_framework.glass_card import GlassCard
 from ui_framework.glass_button import GlassButton
 from ui_framework.rendering_utils import *
+from ui_framework.backdrop import backdrop
+from ui_framework.render_scale import render_scaler
+from ui_framework.scene_graph import SceneGraph
 from ui_framework.icons import draw_checkmark
 from state_manager import ScreenState
 from config import *
@@ -25,6 +28,17 @@ class ReceiptScreen(BaseScreen):
             callback=self.on_new_order,
             color=COLOR_PRIMARY
         )
+        
+        # Receipt card
+        self.receipt_card = GlassCard(
+            (SCREEN_WIDTH - 500) // 2, 200,
+            500, 350,
+            border_color=COLOR_SUCCESS
+        )
+        
+        self.scene = SceneGraph()
+        self.receipt_node = self.scene.add(self.receipt_card, content=self._draw_receipt)
+        self.scene.add(self.new_order_button)
     
     def on_new_order(self):
         """Start a new order"""
@@ -33,10 +47,11 @@ class ReceiptScreen(BaseScreen):
     
     def on_enter(self):
         super().on_enter()
+        self.receipt_node.set_data(self.state_manager.receipt_data)
     
-    def update(self, cursor_pos, current_time):
+    def update(self, cursors, current_time):
         """Update receipt screen"""
-        self.new_order_button.update_hover_state(cursor_pos)
+        self.new_order_button.update_hover_state(cursors)
         
         # Check for dwell on new order button
         is_hovering = self.new_order_button.state == "hover"
@@ -45,158 +60,153 @@ class ReceiptScreen(BaseScreen):
     
     def render(self, frame):
         """Render receipt screen"""
-        # Background
-        gradient = create_gradient(
-            SCREEN_WIDTH, SCREEN_HEIGHT,
-            (30, 40, 30), (10, 20, 10), vertical=True
-        )
-        frame = alpha_blend(gradient, frame, 0.6)
+        # Background (at the internal render resolution)
+        h, w = frame.shape[:2]
+        gradient = get_cached_gradient(w, h, (30, 40, 30), (10, 20, 10), vertical=True)
+        background = alpha_blend(gradient, frame, 0.6)
+        frame = render_scaler.upscale(background)
         
         # Success checkmark
         check_y = 60
         draw_checkmark(frame, SCREEN_WIDTH // 2 - 30, check_y, 60, COLOR_SUCCESS)
         
         # Success message
-        cv2.putText(
+        draw_text(
             frame, "Order Complete!",
             (SCREEN_WIDTH // 2 - 150, check_y + 100),
             FONT_FACE, FONT_SCALE_LARGE, COLOR_SUCCESS,
-            FONT_THICKNESS, cv2.LINE_AA
+            FONT_THICKNESS
         )
         
-        # Receipt card
-        receipt_card = GlassCard(
-            (SCREEN_WIDTH - 500) // 2, 200,
-            500, 350,
-            border_color=COLOR_SUCCESS
+        # Thank you message
+        draw_text(
+            frame, "Thank you for your order!",
+            (SCREEN_WIDTH // 2 - 180, SCREEN_HEIGHT - 130),
+            FONT_FACE, FONT_SCALE_SMALL, COLOR_TEXT_DIM,
+            FONT_THICKNESS_THIN
         )
-        frame = receipt_card.render(frame)
+        backdrop.update(frame, background)
         
-        # Get receipt data
-        receipt = self.state_manager.receipt_data
-        if receipt:
-            content_x, content_y, _, _ = receipt_card.get_content_area()
-            
-            y_offset = content_y
-            
-            # Restaurant name
-            cv2.putText(
-                frame, receipt['restaurant'],
-                (content_x + 100, y_offset),
-                FONT_FACE, FONT_SCALE_MEDIUM, COLOR_TEXT,
-                FONT_THICKNESS, cv2.LINE_AA
-            )
-            y_offset += 30
-            
-            # Date and time
-            date_time = f"{receipt['date']} {receipt['time']}"
-            cv2.putText(
-                frame, date_time,
-                (content_x + 120, y_offset),
-                FONT_FACE, FONT_SCALE_SMALL - 0.1, COLOR_TEXT_DIM,
-                FONT_THICKNESS_THIN, cv2.LINE_AA
-            )
-            y_offset += 40
-            
-            # Divider
-            cv2.line(frame, (content_x, y_offset), (content_x + 450, y_offset), COLOR_TEXT_DIM, 1)
-            y_offset += 25
-            
-            # Items (show max 5 items to fit)
-            for i, item in enumerate(receipt['items'][:5]):
-                if i >= 5:
-                    break
-                
-                # Item name and quantity
-                item_text = f"{item['quantity']}x {item['name']}"
-                cv2.putText(
-                    frame, item_text,
-                    (content_x, y_offset),
-                    FONT_FACE, FONT_SCALE_SMALL - 0.1, COLOR_TEXT,
-                    FONT_THICKNESS_THIN, cv2.LINE_AA
-                )
-                
-                # Price
-                price_text = f"{receipt['currency']}{item['price'] * item['quantity']:.2f}"
-                cv2.putText(
-                    frame, price_text,
-                    (content_x + 350, y_offset),
-                    FONT_FACE, FONT_SCALE_SMALL - 0.1, COLOR_TEXT,
-                    FONT_THICKNESS_THIN, cv2.LINE_AA
-                )
-                y_offset += 25
-            
-            if len(receipt['items']) > 5:
-                cv2.putText(
-                    frame, f"... and {len(receipt['items']) - 5} more items",
-                    (content_x, y_offset),
-                    FONT_FACE, FONT_SCALE_SMALL - 0.2, COLOR_TEXT_DIM,
-                    FONT_THICKNESS_THIN, cv2.LINE_AA
-                )
-                y_offset += 25
-            
-            y_offset += 10
-            # Divider
-            cv2.line(frame, (content_x, y_offset), (content_x + 450, y_offset), COLOR_TEXT_DIM, 1)
-            y_offset += 25
+        # Receipt card and new order button
+        frame = self.scene.render(frame)
+        
+        return frame
+    
+    def _draw_receipt(self, frame, node):
+        """Draw the receipt details inside the receipt card"""
+        receipt = node.data
+        if not receipt:
+            return
+        
+        content_x, content_y, _, _ = self.receipt_card.get_content_area()
+        
+        y_offset = content_y
+        
+        # Restaurant name
+        draw_text(
+            frame, receipt['restaurant'],
+            (content_x + 100, y_offset),
+            FONT_FACE, FONT_SCALE_MEDIUM, COLOR_TEXT,
+            FONT_THICKNESS
+        )
+        y_offset += 30
+        
+        # Date and time
+        date_time = f"{receipt['date']} {receipt['time']}"
+        draw_text(
+            frame, date_time,
+            (content_x + 120, y_offset),
+            FONT_FACE, FONT_SCALE_SMALL - 0.1, COLOR_TEXT_DIM,
+            FONT_THICKNESS_THIN
+        )
+        y_offset += 40
+        
+        # Divider
+        cv2.line(frame, (content_x, y_offset), (content_x + 450, y_offset), COLOR_TEXT_DIM, 1)
+        y_offset += 25
+        
+        # Items (show max 5 items to fit)
+        for i, item in enumerate(receipt['items'][:5]):
+            if i >= 5:
+                break
             
-            # Subtotal
-            cv2.putText(
-                frame, "Subtotal:",
+            # Item name and quantity
+            item_text = f"{item['quantity']}x {item['name']}"
+            draw_text(
+                frame, item_text,
                 (content_x, y_offset),
-                FONT_FACE, FONT_SCALE_SMALL, COLOR_TEXT_DIM,
-                FONT_THICKNESS_THIN, cv2.LINE_AA
-            )
-            cv2.putText(
-                frame, f"{receipt['currency']}{receipt['subtotal']:.2f}",
-                (content_x + 350, y_offset),
-                FONT_FACE, FONT_SCALE_SMALL, COLOR_TEXT_DIM,
-                FONT_THICKNESS_THIN, cv2.LINE_AA
+                FONT_FACE, FONT_SCALE_SMALL - 0.1, COLOR_TEXT,
+                FONT_THICKNESS_THIN
             )
-            y_offset += 25
             
-            # GST
-            gst_text = f"GST ({receipt['gst_rate']:.0f}%):"
-            cv2.putText(
-                frame, gst_text,
-                (content_x, y_offset),
-                FONT_FACE, FONT_SCALE_SMALL, COLOR_TEXT_DIM,
-                FONT_THICKNESS_THIN, cv2.LINE_AA
-            )
-            cv2.putText(
-                frame, f"{receipt['currency']}{receipt['gst_amount']:.2f}",
+            # Price
+            price_text = f"{receipt['currency']}{item['price'] * item['quantity']:.2f}"
+            draw_text(
+                frame, price_text,
                 (content_x + 350, y_offset),
-                FONT_FACE, FONT_SCALE_SMALL, COLOR_TEXT_DIM,
-                FONT_THICKNESS_THIN, cv2.LINE_AA
+                FONT_FACE, FONT_SCALE_SMALL - 0.1, COLOR_TEXT,
+                FONT_THICKNESS_THIN
             )
-            y_offset += 35
-            
-            # Total
-            cv2.putText(
-                frame, "TOTAL:",
+            y_offset += 25
+        
+        if len(receipt['items']) > 5:
+            draw_text(
+                frame, f"... and {len(receipt['items']) - 5} more items",
                 (content_x, y_offset),
-                FONT_FACE, FONT_SCALE_MEDIUM, COLOR_SUCCESS,
-                FONT_THICKNESS, cv2.LINE_AA
-            )
-            cv2.putText(
-                frame, f"{receipt['currency']}{receipt['total']:.2f}",
-                (content_x + 350, y_offset),
-                FONT_FACE, FONT_SCALE_MEDIUM, COLOR_SUCCESS,
-                FONT_THICKNESS, cv2.LINE_AA
+                FONT_FACE, FONT_SCALE_SMALL - 0.2, COLOR_TEXT_DIM,
+                FONT_THICKNESS_THIN
             )
+            y_offset += 25
         
-        # Thank you message
-        cv2.putText(
-            frame, "Thank you for your order!",
-            (SCREEN_WIDTH // 2 - 180, SCREEN_HEIGHT - 130),
+        y_offset += 10
+        # Divider
+        cv2.line(frame, (content_x, y_offset), (content_x + 450, y_offset), COLOR_TEXT_DIM, 1)
+        y_offset += 25
+        
+        # Subtotal
+        draw_text(
+            frame, "Subtotal:",
+            (content_x, y_offset),
+            FONT_FACE, FONT_SCALE_SMALL, COLOR_TEXT_DIM,
+            FONT_THICKNESS_THIN
+        )
+        draw_text(
+            frame, f"{receipt['currency']}{receipt['subtotal']:.2f}",
+            (content_x + 350, y_offset),
             FONT_FACE, FONT_SCALE_SMALL, COLOR_TEXT_DIM,
-            FONT_THICKNESS_THIN, cv2.LINE_AA
+            FONT_THICKNESS_THIN
         )
+        y_offset += 25
         
-        # New order button
-        frame = self.new_order_button.render(frame)
+        # GST
+        gst_text = f"GST ({receipt['gst_rate']:.0f}%):"
+        draw_text(
+            frame, gst_text,
+            (content_x, y_offset),
+            FONT_FACE, FONT_SCALE_SMALL, COLOR_TEXT_DIM,
+            FONT_THICKNESS_THIN
+        )
+        draw_text(
+            frame, f"{receipt['currency']}{receipt['gst_amount']:.2f}",
+            (content_x + 350, y_offset),
+            FONT_FACE, FONT_SCALE_SMALL, COLOR_TEXT_DIM,
+            FONT_THICKNESS_THIN
+        )
+        y_offset += 35
         
-        return frame
+        # Total
+        draw_text(
+            frame, "TOTAL:",
+            (content_x, y_offset),
+            FONT_FACE, FONT_SCALE_MEDIUM, COLOR_SUCCESS,
+            FONT_THICKNESS
+        )
+        draw_text(
+            frame, f"{receipt['currency']}{receipt['total']:.2f}",
+            (content_x + 350, y_offset),
+            FONT_FACE, FONT_SCALE_MEDIUM, COLOR_SUCCESS,
+            FONT_THICKNESS
+        )
     
     def handle_pinch(self, cursor_pos, current_time):
         """Handle pinch gesture"""
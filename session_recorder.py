@@ -0,0 +1,348 @@
+"""
+Session Recording and Replay
+Records the tracker's per-frame results (landmarks, handedness, confidence,
+timing and optionally the camera frames) to a chunked file, and replays
+them through AirMenu in place of the camera and hand tracker
+"""
+
+import io
+import json
+import threading
+import time
+import zipfile
+from collections import namedtuple
+
+import cv2
+import numpy as np
+from config import *
+from camera_capture import CapturedFrame
+from hand_tracker import HandTracker, Detections
+
+
+FORMAT_VERSION = 2
+
+# One recorded frame
+#   seq, timestamp: as captured (seconds)
+#   result_timestamp: capture time of the frame the tracking result came from
+#   latency: the tracker's capture-to-display estimate (cursor prediction)
+#   new_results: results the tracker adopted during this frame (0 = it kept
+#     the previous one), of which the first was a model result if model_result
+#   landmarks, handedness, scores: per hand, in track order, of the result
+#     adopted last (empty when there was no new result)
+#   image: the raw camera frame, or None if frames were not recorded
+RecordedFrame = namedtuple('RecordedFrame', [
+    'seq', 'timestamp', 'result_timestamp', 'latency', 'new_results', 'model_result',
+    'landmarks', 'handedness', 'scores', 'image'
+])
+
+
+class SessionRecorder:
+    """
+    Writes a recording: a zip of compressed .npz chunks of
+    RECORD_CHUNK_FRAMES frames each plus a meta.json. Hands vary per
+    frame, so per-hand arrays are concatenated with a hand count per
+    frame, and only stored on frames where the tracker adopted a new
+    result; camera frames are kept as JPEG bytes with offsets
+    """
+
+    def __init__(self, path, include_frames=False, chunk_frames=RECORD_CHUNK_FRAMES,
+                 quality=RECORD_FRAME_QUALITY):
+        self.path = path
+        self.include_frames = include_frames
+        self.chunk_frames = chunk_frames
+        self.quality = quality
+        self._zip = zipfile.ZipFile(path, 'w', zipfile.ZIP_STORED)  # Chunks are compressed already
+        self._chunk_sizes = []
+        self._frame_size = None
+        self._results = 0  # Tracker result counters at the previous frame
+        self._inference_results = 0
+        self.frames = 0
+        self._reset_chunk()
+
+    def _reset_chunk(self):
+        self._seqs = []
+        self._timestamps = []
+        self._result_timestamps = []
+        self._latencies = []
+        self._new_results = []
+        self._model_results = []
+        self._hand_counts = []
+        self._landmarks = []
+        self._handedness = []
+        self._scores = []
+        self._images = []
+
+    def record(self, captured, tracker):
+        """Add the tracker's current result for a captured frame"""
+        new_results = tracker.results - self._results
+        model_result = tracker.inference_results != self._inference_results
+        self._results = tracker.results
+        self._inference_results = tracker.inference_results
+
+        self._seqs.append(captured.seq)
+        self._timestamps.append(captured.timestamp)
+        self._result_timestamps.append(
+            tracker.result_timestamp if tracker.result_timestamp is not None else np.nan
+        )
+        self._latencies.append(tracker.display_latency)
+        self._new_results.append(new_results)
+        self._model_results.append(model_result)
+        if new_results:
+            self._hand_counts.append(len(tracker.landmarks))
+            self._landmarks.append(tracker.landmarks)
+            self._handedness.extend(track.handedness for track in tracker.tracks)
+            self._scores.extend(track.score for track in tracker.tracks)
+        else:
+            self._hand_counts.append(0)
+
+        if self._frame_size is None:
+            self._frame_size = (captured.frame.shape[1], captured.frame.shape[0])
+        if self.include_frames:
+            ok, encoded = cv2.imencode(
+                '.jpg', captured.frame, [cv2.IMWRITE_JPEG_QUALITY, self.quality]
+            )
+            self._images.append(encoded.ravel() if ok else np.zeros(0, dtype=np.uint8))
+
+        self.frames += 1
+        if len(self._seqs) >= self.chunk_frames:
+            self._flush()
+
+    def _flush(self):
+        """Write the buffered frames as the next chunk"""
+        if not self._seqs:
+            return
+        arrays = {
+            'seqs': np.array(self._seqs, dtype=np.int64),
+            'timestamps': np.array(self._timestamps, dtype=np.float64),
+            'result_timestamps': np.array(self._result_timestamps, dtype=np.float64),
+            'latencies': np.array(self._latencies, dtype=np.float32),
+            'new_results': np.array(self._new_results, dtype=np.uint8),
+            'model_results': np.array(self._model_results, dtype=bool),
+            'hand_counts': np.array(self._hand_counts, dtype=np.int16),
+            'landmarks': np.concatenate(
+                self._landmarks or [np.zeros((0, 21, 3))]
+            ).astype(np.float32, copy=False),
+            'handedness': np.array(self._handedness, dtype=np.int8),
+            'scores': np.array(self._scores, dtype=np.float32),
+        }
+        if self.include_frames:
+            arrays['image_offsets'] = np.cumsum(
+                [0] + [len(image) for image in self._images], dtype=np.int64
+            )
+            arrays['image_bytes'] = np.concatenate(self._images)
+
+        buffer = io.BytesIO()
+        np.savez_compressed(buffer, **arrays)
+        self._zip.writestr(f"chunk_{len(self._chunk_sizes):05d}.npz", buffer.getvalue())
+        self._chunk_sizes.append(len(self._seqs))
+        self._reset_chunk()
+
+    def close(self):
+        """Write the remaining frames and the index; the file is readable after this"""
+        if self._zip is None:
+            return
+        self._flush()
+        meta = {
+            'version': FORMAT_VERSION,
+            'frames': self.frames,
+            'chunk_sizes': self._chunk_sizes,
+            'frame_size': self._frame_size,
+            'has_images': self.include_frames,
+        }
+        self._zip.writestr('meta.json', json.dumps(meta))
+        self._zip.close()
+        self._zip = None
+
+
+class SessionRecording:
+    """
+    Reads a recording frame by frame
+    One chunk is decompressed at a time, so sequential reads cost O(1)
+    per frame and memory stays at one chunk
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._zip = zipfile.ZipFile(path, 'r')
+        meta = json.loads(self._zip.read('meta.json'))
+        if meta['version'] > FORMAT_VERSION:
+            raise ValueError(f"Recording format {meta['version']} is newer than supported")
+        self.frame_count = meta['frames']
+        self.frame_size = tuple(meta['frame_size']) if meta['frame_size'] else None
+        self.has_images = meta['has_images']
+        self._chunk_starts = np.cumsum([0] + meta['chunk_sizes'])
+        self._chunk_index = None
+        self._chunk = None
+        self._hand_starts = None
+
+    def _load_chunk(self, chunk_index):
+        with np.load(io.BytesIO(self._zip.read(f"chunk_{chunk_index:05d}.npz"))) as data:
+            self._chunk = {name: data[name] for name in data.files}
+        if 'new_results' not in self._chunk:
+            # Version 1 held a model result on every frame
+            frames = len(self._chunk['seqs'])
+            self._chunk['new_results'] = np.ones(frames, dtype=np.uint8)
+            self._chunk['model_results'] = np.ones(frames, dtype=bool)
+        self._hand_starts = np.concatenate(([0], np.cumsum(self._chunk['hand_counts'])))
+        self._chunk_index = chunk_index
+
+    def frame(self, index):
+        """The RecordedFrame at index (0-based)"""
+        if not 0 <= index < self.frame_count:
+            raise IndexError(f"Frame {index} not in recording of {self.frame_count} frames")
+        chunk_index = int(np.searchsorted(self._chunk_starts, index, side='right')) - 1
+        if chunk_index != self._chunk_index:
+            self._load_chunk(chunk_index)
+        chunk = self._chunk
+        i = index - self._chunk_starts[chunk_index]
+        a, b = self._hand_starts[i], self._hand_starts[i + 1]
+
+        image = None
+        if self.has_images:
+            start, end = chunk['image_offsets'][i], chunk['image_offsets'][i + 1]
+            image = cv2.imdecode(chunk['image_bytes'][start:end], cv2.IMREAD_COLOR)
+
+        result_timestamp = float(chunk['result_timestamps'][i])
+        return RecordedFrame(
+            int(chunk['seqs'][i]), float(chunk['timestamps'][i]),
+            None if np.isnan(result_timestamp) else result_timestamp,
+            float(chunk['latencies'][i]),
+            int(chunk['new_results'][i]), bool(chunk['model_results'][i]),
+            chunk['landmarks'][a:b], chunk['handedness'][a:b], chunk['scores'][a:b], image
+        )
+
+    def close(self):
+        self._zip.close()
+
+
+class ReplayCapture:
+    """
+    Stands in for CameraCapture: delivers every recorded frame exactly
+    once, paced at the recorded rate times speed (speed <= 0: as fast as
+    they are read). It never hands out the same frame twice, so the app
+    steps once per recorded frame, and its clock (now()) is the recorded
+    timeline: dwell, cooldowns, scrolling and animation replay the same
+    at any speed
+    """
+
+    def __init__(self, recording, speed=1.0):
+        self.recording = recording
+        self.speed = speed
+        self._latest = None
+        self._start_time = None
+        self._first_timestamp = None
+        self._blank = None  # Camera frame for recordings without images
+        self._finished = False
+
+        # Stats, as CameraCapture
+        self.dropped_frames = 0
+        self.failed_reads = 0
+        self.capture_fps = 0.0
+        self._stop = threading.Event()
+
+    def is_opened(self):
+        return self.recording.frame_count > 0
+
+    def start(self):
+        self._start_time = time.time()
+        return self
+
+    def read_latest(self, last_seq=0, timeout=0.0):
+        """
+        The frame after last_seq, waiting until it is due however long
+        that is (timeout is ignored: returning the previous frame again
+        would add app steps that depend on the replay speed)
+        """
+        index = last_seq  # Replay seqs are 1-based frame indices
+        if index >= self.recording.frame_count:
+            self._finished = True
+            return self._latest
+        recorded = self.recording.frame(index)
+        if self._first_timestamp is None:
+            self._first_timestamp = recorded.timestamp
+
+        if self.speed > 0:
+            offset = recorded.timestamp - self._first_timestamp
+            wait = self._start_time + offset / self.speed - time.time()
+            if wait > 0:
+                self._stop.wait(wait)
+
+        image = recorded.image
+        if image is None:
+            if self._blank is None:
+                width, height = self.recording.frame_size or (SCREEN_WIDTH, SCREEN_HEIGHT)
+                self._blank = np.zeros((height, width, 3), dtype=np.uint8)
+            image = self._blank
+        self._latest = CapturedFrame(image, index + 1, recorded.timestamp)
+        elapsed = time.time() - self._start_time
+        if elapsed > 0:
+            self.capture_fps = (index + 1) / elapsed
+        return self._latest
+
+    def is_healthy(self):
+        return not self._stop.is_set()
+
+    def is_finished(self):
+        """Every recorded frame has been delivered"""
+        return self._finished
+
+    def now(self):
+        """The app clock: the latest delivered frame's time on the recorded timeline"""
+        return self._latest.timestamp if self._latest else self._first_timestamp
+
+    def get_stats(self):
+        return {
+            'frames_captured': self._latest.seq if self._latest else 0,
+            'dropped_frames': self.dropped_frames,
+            'failed_reads': self.failed_reads,
+            'capture_fps': self.capture_fps,
+        }
+
+    def stop(self):
+        self._stop.set()
+
+    def release(self):
+        self.stop()
+
+
+class ReplayHandTracker(HandTracker):
+    """
+    HandTracker whose results come from a recording instead of the model
+    Tracks, cursors, pinches and gestures are recomputed from the
+    recorded landmarks exactly as in the live session. Use it with a
+    ReplayCapture over the same recording
+    """
+
+    def __init__(self, recording):
+        self.recording = recording
+        super().__init__(async_inference=False)
+
+    def _create_model(self):
+        return None
+
+    def find_hands(self, frame, seq=0, timestamp=None):
+        """
+        Adopt the results recorded for replay frame seq, as many times and
+        of the same kind as live, so tracks age (and expire) per result
+        """
+        recorded = self.recording.frame(seq - 1)
+        self.display_latency = recorded.latency
+        if not recorded.new_results:
+            return self.has_hands()
+        if timestamp is not None and recorded.result_timestamp is not None:
+            # Keep the result's age relative to its frame
+            timestamp += recorded.result_timestamp - recorded.timestamp
+
+        tracked = recorded.new_results
+        if recorded.model_result:
+            self._adopt(
+                Detections(recorded.landmarks, recorded.handedness, recorded.scores),
+                seq, timestamp
+            )
+            tracked -= 1
+        for _ in range(tracked):
+            self.adopt_tracked(recorded.landmarks, seq, timestamp)
+        return self.has_hands()
+
+    def mark_displayed(self, display_time):
+        """The recorded latency is used, so cursor prediction replays identically"""
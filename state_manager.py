@@ -72,9 +72,9 @@ class StateManager:
         self.transitioning = False
         self.transition_progress = 0.0
     
-    def update(self):
+    def update(self, current_time):
         """Update animations"""
-        self.animator.update()
+        self.animator.update(current_time)
         if self.transitioning:
             self.transition_progress = self.animator.get_value(self.transition_anim) or 0.0
     
@@ -0,0 +1,246 @@
+"""
+Tracking Scheduler
+Runs the full hand landmark model only every few frames and follows the
+index and thumb tips with pyramidal Lucas-Kanade optical flow in between,
+so the cursors still update on every camera frame
+"""
+
+from collections import deque
+
+import cv2
+import numpy as np
+from config import *
+from gesture_features import INDEX_TIP, THUMB_TIP
+
+
+# Landmarks followed by optical flow between inferences
+FLOW_POINTS = [INDEX_TIP, THUMB_TIP]
+
+
+class TrackingScheduler:
+    """
+    Decides per camera frame between full inference and flow tracking
+    The interval between inferences shrinks as the hands move faster
+    (flow is least reliable then). Inference runs immediately when a
+    hand is lost or flow loses a point. The points of every hand are
+    followed in one flow call over one patch. The flow's pixel settings
+    are given at screen resolution and scaled to the frames tracked
+    (which are at the internal render resolution)
+    """
+
+    def __init__(self, tracker, min_interval=TRACKING_MIN_INTERVAL,
+                 max_interval=TRACKING_MAX_INTERVAL):
+        self.tracker = tracker
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.interval = max_interval
+        self.speed = 0.0  # Smoothed fastest fingertip motion, frame widths per frame
+
+        self._points = None  # (hands * 2, 2) pixel positions of FLOW_POINTS, None = not tracking
+        self._track_ids = ()  # Hand tracks the points belong to, in order
+        self._patch = None  # Grayscale patch of the previous frame around the points
+        self._region = None  # (x1, y1, x2, y2) of the patch in the frame
+        self._since_inference = 0  # Frames since inference last ran (or was submitted)
+        self._recent = deque(maxlen=16)  # (seq, points) since the last seed, for late results
+        self._submitted = deque(maxlen=2)  # (seq, frame copy) of recent async submissions
+        self._model_seq = 0  # Frame of the latest async model result
+        self._seen_results = tracker.inference_results
+        self._frame_width = None  # Width the flow settings below are scaled for
+        self._margin = FLOW_PATCH_MARGIN
+        self._window = FLOW_WINDOW
+        self._max_drift = FLOW_MAX_DRIFT
+
+        # Stats
+        self.frames = 0
+        self.inferences = 0  # Model results (not submissions a newer frame replaced)
+        self.tracked_frames = 0
+        self.fallbacks = 0  # Inferences forced by flow losing the points
+
+    def step(self, frame, seq, timestamp):
+        """
+        Track a new camera frame (before anything is drawn on it)
+        Returns True if a hand is known for this frame
+        """
+        self.frames += 1
+        self._since_inference += 1
+        if frame.shape[1] != self._frame_width:
+            self._scale_settings(frame.shape[1])
+        if self.tracker.async_inference:
+            return self._step_async(frame, seq, timestamp)
+
+        if self._points is not None and self._since_inference < self.interval:
+            if self._track(frame, seq, timestamp):
+                return True
+            self.fallbacks += 1
+
+        self.tracker.find_hands(frame, seq, timestamp)
+        self._since_inference = 0
+        self.inferences += 1
+        self._seen_results = self.tracker.inference_results
+        self._seed(frame, seq)
+        return self.tracker.has_hands()
+
+    def _step_async(self, frame, seq, timestamp):
+        """Flow-track while the worker runs inference on submitted frames"""
+        self.tracker.poll()
+        if self.tracker.inference_results != self._seen_results:
+            # A model result arrived for an earlier frame; correct flow with it
+            self.inferences += self.tracker.inference_results - self._seen_results
+            self._seen_results = self.tracker.inference_results
+            self._model_seq = self.tracker.result_seq
+            self._correct(frame, seq, timestamp)
+            tracked = self._points is not None
+        elif self._points is not None:
+            tracked = self._track(frame, seq, timestamp)
+            if not tracked:
+                self.fallbacks += 1
+        else:
+            tracked = False
+
+        # Untracked, a frame already in flight is enough: resubmitting would
+        # only replace it and drop the copy its result will be seeded on
+        waiting = bool(self._submitted) and self._submitted[-1][0] > self._model_seq
+        if (not tracked and not waiting) or self._since_inference >= self.interval:
+            self.tracker.submit(frame, seq, timestamp)
+            self._keep_submitted(frame, seq)
+            self._since_inference = 0
+        return self.tracker.has_hands()
+
+    def _keep_submitted(self, frame, seq):
+        """Copy a submitted frame, so its result can be seeded where it was computed"""
+        buffer = None
+        if len(self._submitted) == self._submitted.maxlen:
+            buffer = self._submitted.popleft()[1]
+        if buffer is None or buffer.shape != frame.shape:
+            buffer = np.empty_like(frame)
+        np.copyto(buffer, frame)
+        self._submitted.append((seq, buffer))
+
+    def _scale_settings(self, width):
+        """Scale the flow's screen-pixel settings to frames of this width"""
+        scale = width / SCREEN_WIDTH
+        self._frame_width = width
+        self._margin = FLOW_PATCH_MARGIN * scale
+        self._window = max(5, round(FLOW_WINDOW * scale)) | 1
+        self._max_drift = FLOW_MAX_DRIFT * scale
+        self._points = None  # Points were in the old frame size
+
+    def _seed(self, frame, seq=None):
+        """Start following the current result's points from this frame"""
+        self._recent.clear()
+        if not self.tracker.has_hands():
+            self._points = None
+            return
+        h, w = frame.shape[:2]
+        points = self.tracker.landmarks[:, FLOW_POINTS, :2].reshape(-1, 2) * (w, h)
+        self._track_ids = self.tracker.track_ids
+        self._set_points(frame, points.astype(np.float32), seq)
+    
+    def _correct(self, frame, seq, timestamp):
+        """
+        Combine a late model result with flow: the model's error-free
+        offset from where flow had the points in the result's frame is
+        applied to where flow has them now
+        """
+        if self._points is None or self.tracker.track_ids != self._track_ids:
+            # Hands came or went: start over from the result, in the frame
+            # it was computed from, and flow it to this one
+            result_seq = self.tracker.result_seq
+            source = next((f for s, f in self._submitted if s == result_seq), None)
+            if result_seq == seq:
+                self._seed(frame, seq)
+            elif source is not None:
+                self._seed(source, result_seq)
+                if self._points is not None and not self._track(frame, seq, timestamp):
+                    self.fallbacks += 1
+            else:
+                self._points = None  # Wait for a result whose frame is kept
+            return
+        # A result from before the track's history restarts the track at the
+        # result as it is (keeping the history, shifted, for later results)
+        result_seq = self.tracker.result_seq
+        flowed = next((points for s, points in self._recent if s == result_seq), self._points)
+
+        h, w = frame.shape[:2]
+        measured = self.tracker.landmarks[:, FLOW_POINTS, :2].reshape(-1, 2) * (w, h)
+        offset = (measured - flowed).astype(np.float32)
+        points = self._points + offset
+        # Later results are compared against the corrected track
+        for i, (s, earlier) in enumerate(self._recent):
+            self._recent[i] = (s, earlier + offset)
+        self._move_hands(self.tracker.landmarks, measured, points, (w, h), seq, timestamp)
+        self._set_points(frame, points, seq)
+    
+    def _move_hands(self, landmarks, old_points, points, size, seq, timestamp):
+        """Adopt landmarks with each hand moved along with its flow points"""
+        hands = len(landmarks)
+        shift = (points - old_points).reshape(hands, len(FLOW_POINTS), 2).mean(axis=1)
+        landmarks = landmarks.copy()
+        landmarks[:, :, :2] += shift[:, None] / size
+        landmarks[:, FLOW_POINTS, :2] = points.reshape(hands, len(FLOW_POINTS), 2) / size
+        self.tracker.adopt_tracked(landmarks, seq, timestamp)
+
+    def _set_points(self, frame, points, seq=None):
+        """Keep the points and a grayscale patch around them"""
+        h, w = frame.shape[:2]
+        (min_x, min_y), (max_x, max_y) = points.min(axis=0), points.max(axis=0)
+        x1 = int(max(0, min_x - self._margin))
+        y1 = int(max(0, min_y - self._margin))
+        x2 = int(min(w, max_x + self._margin))
+        y2 = int(min(h, max_y + self._margin))
+        if x2 - x1 < self._window or y2 - y1 < self._window:
+            self._points = None  # Points at (or past) the frame edge
+            return
+        self._points = points
+        self._recent.append((seq, points))
+        self._region = (x1, y1, x2, y2)
+        self._patch = cv2.cvtColor(frame[y1:y2, x1:x2], cv2.COLOR_BGR2GRAY)
+
+    def _track(self, frame, seq, timestamp):
+        """
+        Move the points to this frame with optical flow and adopt the result
+        Returns False (and stops tracking) if flow lost a point
+        """
+        x1, y1, x2, y2 = self._region
+        gray = cv2.cvtColor(frame[y1:y2, x1:x2], cv2.COLOR_BGR2GRAY)
+        origin = np.array((x1, y1), dtype=np.float32)
+
+        start = (self._points - origin).reshape(-1, 1, 2)
+        flow_args = dict(winSize=(self._window, self._window), maxLevel=FLOW_PYRAMID_LEVELS)
+        moved, status, _ = cv2.calcOpticalFlowPyrLK(self._patch, gray, start, None, **flow_args)
+        # Flow back again: a point that doesn't return where it started was
+        # matched to the wrong place
+        back, back_status, _ = cv2.calcOpticalFlowPyrLK(gray, self._patch, moved, None, **flow_args)
+        drift = np.linalg.norm(back - start, axis=-1)
+        moved = moved.reshape(-1, 2)
+        inside = ((moved >= 0) & (moved < (x2 - x1, y2 - y1))).all()
+        if not (status.all() and back_status.all() and inside) or drift.max() > self._max_drift:
+            self._points = None
+            self._recent.clear()
+            return False
+        points = moved + origin
+
+        # The rest of each hand moves with its tracked points
+        h, w = frame.shape[:2]
+        self._move_hands(self.tracker.landmarks, self._points, points, (w, h), seq, timestamp)
+        self.tracked_frames += 1
+
+        # Faster motion: infer more often
+        motion = float(np.abs(points - self._points).max()) / w
+        self.speed = 0.7 * self.speed + 0.3 * motion
+        fast = min(1.0, self.speed / TRACKING_FAST_MOTION)
+        self.interval = round(self.max_interval - (self.max_interval - self.min_interval) * fast)
+
+        self._set_points(frame, points, seq)
+        return True
+
+    def get_stats(self):
+        """How often inference ran, and why"""
+        return {
+            'frames': self.frames,
+            'inferences': self.inferences,
+            'tracked_frames': self.tracked_frames,
+            'fallbacks': self.fallbacks,
+            'inference_ratio': self.inferences / self.frames if self.frames else 0.0,
+            'interval': self.interval,
+        }
@@ -0,0 +1,179 @@
+"""
+Shared Glass Backdrop
+Blurs the composited screen background once per frame and hands out
+crops to glass components
+"""
+
+import cv2
+import numpy as np
+from ui_framework.parallel import band_compositor
+from ui_framework.render_scale import render_scaler
+from config import (
+    BACKDROP_PYRAMID, BACKDROP_PYRAMID_MIN_KERNEL, BACKDROP_TILE_SIZE
+)
+
+
+class Backdrop:
+    """
+    The backdrop is a snapshot of the frame taken at update(), so glass
+    blurs the screen background only, never components (or the hover
+    dimming) drawn after it. The blur is computed lazily in tiles of the
+    snapshot, each with a halo of real neighbouring pixels, so the cost
+    follows the screen area covered by glass, not the number of
+    components
+    """
+
+    def __init__(self, pyramid=BACKDROP_PYRAMID,
+                 pyramid_min_kernel=BACKDROP_PYRAMID_MIN_KERNEL,
+                 tile_size=BACKDROP_TILE_SIZE):
+        self.pyramid = pyramid
+        self.pyramid_min_kernel = pyramid_min_kernel
+        self.tile_w, self.tile_h = tile_size
+
+        self._target = None  # Frame being drawn on
+        self._source = None  # Its background at the internal render resolution
+        self._frame = None  # Snapshot of it at update()
+        self._blurred = {}  # (kernel size, box) -> (buffer, computed tile grid)
+        self.tiles_computed = 0
+
+    def update(self, frame, source=None):
+        """
+        Use frame as the backdrop for this render pass
+        Call after the screen background is composited, before components
+        source: the background at the internal render resolution, before
+        it was upscaled into frame; blurs then read it directly
+        """
+        self._target = frame
+        self._source = source if render_scaler.enabled else None
+
+        if self._frame is None or self._frame.shape != frame.shape:
+            self._frame = np.empty_like(frame)
+        band_compositor.copy(self._frame, frame)
+
+        for _, computed in self._blurred.values():
+            computed[:] = False
+
+    def is_current(self, frame):
+        """Check that frame is the one the backdrop was updated with"""
+        return self._target is frame
+
+    def _get_layer(self, kernel_size, box):
+        """Reusable blur buffer and its computed-tile grid for a blur"""
+        h, w = self._frame.shape[:2]
+        grid_shape = (-(-h // self.tile_h), -(-w // self.tile_w))
+        layer = self._blurred.get((kernel_size, box))
+        if layer is None or layer[0].shape != self._frame.shape:
+            layer = (np.empty_like(self._frame), np.zeros(grid_shape, dtype=bool))
+            self._blurred[(kernel_size, box)] = layer
+        return layer
+
+    def blurred(self, kernel_size, x1, y1, x2, y2, box=False):
+        """
+        Crop of the blurred backdrop (computed at most once per frame)
+        box: use a box blur instead of a Gaussian
+        """
+        if kernel_size % 2 == 0:
+            kernel_size += 1  # Must be odd
+        buffer, computed = self._get_layer(kernel_size, box)
+
+        if self.pyramid and not box and kernel_size >= self.pyramid_min_kernel:
+            if not computed.all():
+                self._blur_pyramid(kernel_size, buffer)
+                computed[:] = True
+            return buffer[y1:y2, x1:x2]
+
+        # Tiles covering the crop
+        tx1, ty1 = x1 // self.tile_w, y1 // self.tile_h
+        tx2, ty2 = -(-x2 // self.tile_w), -(-y2 // self.tile_h)
+        missing = ~computed[ty1:ty2, tx1:tx2]
+        if missing.any():
+            # Blur the bounding box of the missing tiles in one pass
+            rows = np.nonzero(missing.any(axis=1))[0]
+            cols = np.nonzero(missing.any(axis=0))[0]
+            my1, my2 = ty1 + rows[0], ty1 + rows[-1] + 1
+            mx1, mx2 = tx1 + cols[0], tx1 + cols[-1] + 1
+            self._blur_region(
+                kernel_size, box, buffer,
+                mx1 * self.tile_w, my1 * self.tile_h,
+                mx2 * self.tile_w, my2 * self.tile_h
+            )
+            computed[my1:my2, mx1:mx2] = True
+            self.tiles_computed += (my2 - my1) * (mx2 - mx1)
+
+        return buffer[y1:y2, x1:x2]
+
+    def brightened(self, kernel_size, x1, y1, x2, y2, brightness=30, box=False):
+        """Crop of the blurred backdrop with brightness added"""
+        blurred = self.blurred(kernel_size, x1, y1, x2, y2, box)
+        return cv2.add(blurred, (brightness, brightness, brightness, 0))
+
+    def _blur_region(self, kernel_size, box, buffer, x1, y1, x2, y2):
+        """Blur one region of the frame, reading a halo of real pixels around it"""
+        h, w = self._frame.shape[:2]
+        blur_rows = self._blur_rows_scaled if render_scaler.enabled else self._blur_rows
+        band_compositor.run(
+            lambda a, b: blur_rows(kernel_size, box, buffer, x1, a, min(w, x2), b),
+            y1, min(h, y2)
+        )
+
+    def _blur_rows(self, kernel_size, box, buffer, x1, y1, x2, y2):
+        """Blur one band of a region (run in parallel by _blur_region)"""
+        h, w = self._frame.shape[:2]
+        radius = kernel_size // 2
+        wx1, wy1 = max(0, x1 - radius), max(0, y1 - radius)
+        wx2, wy2 = min(w, x2 + radius), min(h, y2 + radius)
+
+        source = self._frame[wy1:wy2, wx1:wx2]
+        if box:
+            window = cv2.blur(source, (kernel_size, kernel_size))
+        else:
+            window = cv2.GaussianBlur(source, (kernel_size, kernel_size), 0)
+        buffer[y1:y2, x1:x2] = window[y1 - wy1:y2 - wy1, x1 - wx1:x2 - wx1]
+
+    def _blur_pyramid(self, kernel_size, buffer):
+        """Approximate a large blur at half resolution"""
+        h, w = self._frame.shape[:2]
+        small = cv2.pyrDown(self._frame)
+        small_kernel = (kernel_size // 2) | 1
+        small = band_compositor.blur(small, np.empty_like(small), small_kernel)
+        cv2.resize(small, (w, h), dst=buffer, interpolation=cv2.INTER_LINEAR)
+
+    def _blur_rows_scaled(self, kernel_size, box, buffer, x1, y1, x2, y2):
+        """
+        Like _blur_rows, but blurs at the internal render resolution (the
+        screen's own background before upscaling, if it was given)
+        The window is aligned to the scale's denominator, so every window
+        samples the same internal pixel grid and tiles meet without seams
+        """
+        h, w = self._frame.shape[:2]
+        num, den = render_scaler.ratio
+        radius = kernel_size // 2 + 2 * den  # Plus the resize filters' reach
+        wx1 = max(0, (x1 - radius) // den * den)
+        wy1 = max(0, (y1 - radius) // den * den)
+        wx2 = min(w, -(-(x2 + radius) // den) * den)
+        wy2 = min(h, -(-(y2 + radius) // den) * den)
+
+        if self._source is not None:
+            # The window's own pixels at the internal resolution
+            sh, sw = self._source.shape[:2]
+            small = self._source[
+                wy1 * num // den:min(sh, -(-wy2 * num // den)),
+                wx1 * num // den:min(sw, -(-wx2 * num // den))
+            ]
+        else:
+            small = cv2.resize(
+                self._frame[wy1:wy2, wx1:wx2],
+                (max(1, (wx2 - wx1) * num // den), max(1, (wy2 - wy1) * num // den)),
+                interpolation=cv2.INTER_LINEAR
+            )
+        small_kernel = max(1, kernel_size * num // den) | 1
+        if box:
+            small = cv2.blur(small, (small_kernel, small_kernel))
+        else:
+            small = cv2.GaussianBlur(small, (small_kernel, small_kernel), 0)
+        window = cv2.resize(small, (wx2 - wx1, wy2 - wy1), interpolation=cv2.INTER_LINEAR)
+        buffer[y1:y2, x1:x2] = window[y1 - wy1:y2 - wy1, x1 - wx1:x2 - wx1]
+
+
+# Shared backdrop used by screens and glass components
+backdrop = Backdrop()
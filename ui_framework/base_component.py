@@ -16,6 +16,18 @@ class BaseComponent:
         self.enabled = True
         self.state = "normal"  # normal, hover, active, disabled
     
+    def frame_brightness(self):
+        """Factor render() currently scales the whole frame's brightness by"""
+        return 1.0
+    
+    def affects_whole_frame(self):
+        """True if render() currently changes pixels outside the component"""
+        return self.frame_brightness() != 1.0
+    
+    def get_rect(self):
+        """Bounds as an (x, y, width, height) tuple"""
+        return (self.x, self.y, self.width, self.height)
+    
     def is_point_inside(self, px, py):
         """Check if a point is inside this component"""
         if not self.visible or not self.enabled:
@@ -23,9 +35,9 @@ class BaseComponent:
         return (self.x <= px <= self.x + self.width and 
                 self.y <= py <= self.y + self.height)
     
-    def update_hover_state(self, cursor_pos):
-        """Update hover state based on cursor position"""
-        if cursor_pos and self.is_point_inside(*cursor_pos):
+    def update_hover_state(self, cursors):
+        """Update hover state from the cursor positions (hovered by any of them)"""
+        if any(self.is_point_inside(*cursor_pos) for cursor_pos in cursors):
             self.state = "hover"
             return True
         else:
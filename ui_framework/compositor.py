@@ -0,0 +1,118 @@
+"""
+Masked Compositor
+Records translucent shapes in layers and blends them onto the frame only
+inside their bounding boxes, instead of copying and blending the full frame
+"""
+
+import cv2
+from ui_framework.rendering_utils import draw_rounded_rectangle
+
+
+class CompositorLayer:
+    def __init__(self, alpha):
+        self.alpha = alpha
+        self.shapes = []  # (bounds, draw) with bounds as (x1, y1, x2, y2)
+
+    def shape(self, bounds, draw):
+        """
+        Add a custom shape
+        bounds: (x1, y1, x2, y2) covering every pixel draw may touch
+        draw(overlay, dx, dy): draws the shape shifted by (dx, dy)
+        """
+        self.shapes.append((bounds, draw))
+        return self
+
+    def rounded_rectangle(self, x, y, w, h, radius, color, thickness=-1):
+        """Add a rounded rectangle (see draw_rounded_rectangle)"""
+        pad = max(thickness, 0) + 2
+
+        def draw(overlay, dx, dy):
+            draw_rounded_rectangle(overlay, x + dx, y + dy, w, h, radius, color, thickness)
+
+        return self.shape((x - pad, y - pad, x + w + pad, y + h + pad), draw)
+
+    def rectangle(self, pt1, pt2, color, thickness=-1):
+        """Add a rectangle (see cv2.rectangle)"""
+        pad = max(thickness, 0) + 2
+        x1, x2 = sorted((pt1[0], pt2[0]))
+        y1, y2 = sorted((pt1[1], pt2[1]))
+
+        def draw(overlay, dx, dy):
+            cv2.rectangle(
+                overlay, (pt1[0] + dx, pt1[1] + dy), (pt2[0] + dx, pt2[1] + dy),
+                color, thickness
+            )
+
+        return self.shape((x1 - pad, y1 - pad, x2 + pad, y2 + pad), draw)
+
+
+class Compositor:
+    def __init__(self):
+        self.layers = []
+
+    def layer(self, alpha):
+        """Start a layer; all its shapes are blended together with one opacity"""
+        layer = CompositorLayer(alpha)
+        self.layers.append(layer)
+        return layer
+
+    def rounded_rectangle(self, x, y, w, h, radius, color, thickness=-1, alpha=1.0):
+        """Add a single rounded rectangle on its own layer"""
+        return self.layer(alpha).rounded_rectangle(x, y, w, h, radius, color, thickness)
+
+    def rectangle(self, pt1, pt2, color, thickness=-1, alpha=1.0):
+        """Add a single rectangle on its own layer"""
+        return self.layer(alpha).rectangle(pt1, pt2, color, thickness)
+
+    def flush(self, frame):
+        """
+        Blend all recorded layers onto frame in place, in order
+        Each layer gives the same result as drawing its shapes on a full
+        copy of the frame and alpha_blend-ing that copy back
+        """
+        for layer in self.layers:
+            for region, shapes in _group_shapes(layer.shapes, frame.shape):
+                x1, y1, x2, y2 = region
+                roi = frame[y1:y2, x1:x2]
+                overlay = roi.copy()
+                for draw in shapes:
+                    draw(overlay, -x1, -y1)
+                cv2.addWeighted(overlay, layer.alpha, roi, 1 - layer.alpha, 0, dst=roi)
+
+        self.layers = []
+        return frame
+
+
+def _group_shapes(shapes, frame_shape):
+    """
+    Clip shape bounds to the frame and merge overlapping ones, so each
+    pixel is blended at most once per layer
+    Returns a list of (region, [draw, ...])
+    """
+    h, w = frame_shape[:2]
+    groups = []
+    for index, ((x1, y1, x2, y2), draw) in enumerate(shapes):
+        region = [max(0, x1), max(0, y1), min(w, x2), min(h, y2)]
+        if region[2] <= region[0] or region[3] <= region[1]:
+            continue
+        draws = [(index, draw)]
+
+        # Absorb every existing group this region touches
+        merged = True
+        while merged:
+            merged = False
+            for group in groups:
+                gx1, gy1, gx2, gy2 = group[0]
+                if gx1 < region[2] and region[0] < gx2 and gy1 < region[3] and region[1] < gy2:
+                    region = [min(gx1, region[0]), min(gy1, region[1]),
+                              max(gx2, region[2]), max(gy2, region[3])]
+                    draws = group[1] + draws
+                    groups.remove(group)
+                    merged = True
+                    break
+
+        groups.append((region, draws))
+
+    # Keep the recording order within each group
+    return [(region, [draw for _, draw in sorted(draws, key=lambda d: d[0])])
+            for region, draws in groups]
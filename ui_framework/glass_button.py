@@ -6,7 +6,14 @@ import cv2
 import time
 from ui_framework.base_component import BaseComponent
 from ui_framework.rendering_utils import *
+from ui_framework.compositor import Compositor
+from ui_framework.backdrop import backdrop
+from ui_framework.sprite_cache import (
+    sprite_cache, SpriteBuilder, composite_sprite, CHROME_MARGIN
+)
 from config import *
+from profiler import profiler
+from quality_governor import governor
 
 
 class GlassButton(BaseComponent):
@@ -38,6 +45,7 @@ class GlassButton(BaseComponent):
         
         return False
     
+    @profiler.profile('GlassButton.render')
     def render(self, frame):
         if not self.visible:
             return frame
@@ -64,42 +72,40 @@ class GlassButton(BaseComponent):
         if y2 <= y1 or x2 <= x1:
             return frame
         
-        bg_roi = frame[y1:y2, x1:x2].copy()
-        glass = apply_gaussian_blur(bg_roi, 15)
-        frame[y1:y2, x1:x2] = glass
+        # At the cheapest tier the fill is drawn over the unblurred background
+        tier = governor.tier
+        blur = tier.button_blur
+        if blur and backdrop.is_current(frame):
+            frame[y1:y2, x1:x2] = backdrop.blurred(blur, x1, y1, x2, y2, box=tier.box_blur)
+        elif blur and tier.box_blur:
+            frame[y1:y2, x1:x2] = apply_box_blur(frame[y1:y2, x1:x2], blur)
+        elif blur:
+            frame[y1:y2, x1:x2] = apply_gaussian_blur(frame[y1:y2, x1:x2].copy(), blur)
         
-        # Background fill
-        bg_overlay = frame.copy()
-        draw_rounded_rectangle(
-            bg_overlay, self.x, self.y, self.width, self.height,
-            12, self.color, -1
+        # Pre-rendered chrome: fill, glow when hovered, border
+        hover = self.state == "hover"
+        glow = hover and tier.glow
+        if hover:
+            # The glow dims the frame around the button as well; this stays
+            # when lower tiers drop the glow itself
+            scale_brightness(frame, self.frame_brightness())
+        margin = GLOW_MARGIN if glow else CHROME_MARGIN
+        sprite = sprite_cache.get(
+            ('button', self.width, self.height, tuple(self.color), glow,
+             bg_alpha, border_thickness, glow_amount),
+            lambda: self._build_chrome(glow, margin, bg_alpha, border_thickness, glow_amount)
         )
-        frame = alpha_blend(bg_overlay, frame, bg_alpha)
-        
-        # Add glow on hover
-        if self.state == "hover":
-            frame = add_glow_effect(
-                frame, self.x, self.y, self.width, self.height,
-                self.color, glow_amount
-            )
-        
-        # Border
-        border_overlay = frame.copy()
-        draw_rounded_rectangle(
-            border_overlay, self.x, self.y, self.width, self.height,
-            12, self.color, border_thickness
-        )
-        frame = alpha_blend(border_overlay, frame, 0.8)
+        composite_sprite(frame, sprite, self.x - margin, self.y - margin)
         
         # Dwell progress indicator
         if self.dwell_progress > 0:
             progress_width = int(self.width * self.dwell_progress)
-            progress_overlay = frame.copy()
-            draw_rounded_rectangle(
-                progress_overlay, self.x, self.y, progress_width, self.height,
-                12, COLOR_SUCCESS, -1
+            compositor = Compositor()
+            compositor.rounded_rectangle(
+                self.x, self.y, progress_width, self.height,
+                12, COLOR_SUCCESS, -1, alpha=0.3
             )
-            frame = alpha_blend(progress_overlay, frame, 0.3)
+            compositor.flush(frame)
         
         # Text
         draw_text_centered(
@@ -110,6 +116,38 @@ class GlassButton(BaseComponent):
         
         return frame
     
+    def _build_chrome(self, glow, margin, bg_alpha, border_thickness, glow_amount):
+        """Rasterize the static parts of the button into a sprite"""
+        w, h = self.width, self.height
+        builder = SpriteBuilder(w, h, margin)
+        
+        # Background fill
+        builder.shape_layer(
+            lambda mask, dx, dy, value: draw_rounded_rectangle(
+                mask, dx, dy, w, h, 12, value, -1
+            ),
+            self.color, bg_alpha
+        )
+        
+        # Glow on hover
+        if glow:
+            glow = create_glow_layer(w, h, self.color, margin)
+            builder.glow_layer(glow, glow_amount)
+        
+        # Border
+        builder.shape_layer(
+            lambda mask, dx, dy, value: draw_rounded_rectangle(
+                mask, dx, dy, w, h, 12, value, border_thickness
+            ),
+            self.color, 0.8
+        )
+        
+        return builder.build()
+    
+    def frame_brightness(self):
+        """The hover glow dims the entire frame"""
+        return 1 - 0.6 if self.state == "hover" else 1.0
+    
     def handle_click(self):
         """Execute callback when clicked"""
         if self.enabled and self.callback:
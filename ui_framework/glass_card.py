@@ -6,7 +6,13 @@ import cv2
 import numpy as np
 from ui_framework.base_component import BaseComponent
 from ui_framework.rendering_utils import *
+from ui_framework.backdrop import backdrop
+from ui_framework.sprite_cache import (
+    sprite_cache, SpriteBuilder, composite_sprite, CHROME_MARGIN
+)
 from config import *
+from profiler import profiler
+from quality_governor import governor
 
 
 class GlassCard(BaseComponent):
@@ -16,6 +22,7 @@ class GlassCard(BaseComponent):
         self.border_color = border_color or COLOR_PRIMARY
         self.content_y_offset = 40 if title else 0
     
+    @profiler.profile('GlassCard.render')
     def render(self, frame):
         if not self.visible:
             return frame
@@ -29,13 +36,22 @@ class GlassCard(BaseComponent):
         if y2 <= y1 or x2 <= x1:
             return frame
         
-        bg_roi = frame[y1:y2, x1:x2].copy()
+        bg_roi = frame[y1:y2, x1:x2]
+        tier = governor.tier
         
-        # Create glass effect
-        glass = create_glass_effect(bg_roi, GLASS_ALPHA, GLASS_BLUR_AMOUNT)
+        # Create glass effect, from the shared per-frame backdrop if available
+        if tier.glass_blur and backdrop.is_current(frame):
+            brightened = backdrop.brightened(
+                tier.glass_blur, x1, y1, x2, y2, box=tier.box_blur
+            )
+            glass = alpha_blend(brightened, bg_roi, GLASS_ALPHA)
+        else:
+            glass = create_glass_effect(
+                bg_roi.copy(), GLASS_ALPHA, tier.glass_blur, tier.box_blur
+            )
         
         # Add subtle gradient overlay
-        gradient = create_gradient(
+        gradient = get_cached_gradient(
             glass.shape[1], glass.shape[0],
             (40, 40, 60), (20, 20, 40), vertical=True
         )
@@ -44,42 +60,65 @@ class GlassCard(BaseComponent):
         # Place glass back
         frame[y1:y2, x1:x2] = glass
         
-        # Add glow if hovered
-        if self.state == "hover":
-            frame = add_glow_effect(
-                frame, self.x, self.y, self.width, self.height,
-                self.border_color, GLOW_INTENSITY
-            )
-        
-        # Draw border
-        border_alpha = GLASS_BORDER_ALPHA if self.state != "hover" else 0.6
-        border_overlay = frame.copy()
-        draw_rounded_rectangle(
-            border_overlay, self.x, self.y, self.width, self.height,
-            15, self.border_color, 2
+        # Pre-rendered chrome: glow when hovered, border and title bar
+        hover = self.state == "hover"
+        glow = hover and tier.glow
+        if hover:
+            # The glow dims the frame around the card as well, even at
+            # quality tiers that skip the glow
+            scale_brightness(frame, self.frame_brightness())
+        margin = GLOW_MARGIN if glow else CHROME_MARGIN
+        sprite = sprite_cache.get(
+            ('card', self.width, self.height, tuple(self.border_color), hover, glow,
+             self.title is not None, GLASS_BORDER_ALPHA, GLOW_INTENSITY),
+            lambda: self._build_chrome(hover, glow, margin)
         )
-        frame = alpha_blend(border_overlay, frame, border_alpha)
+        composite_sprite(frame, sprite, self.x - margin, self.y - margin)
         
-        # Draw title if present
         if self.title:
-            title_bg = frame.copy()
-            cv2.rectangle(
-                title_bg,
-                (self.x + CARD_PADDING, self.y + 10),
-                (self.x + self.width - CARD_PADDING, self.y + 35),
-                self.border_color, -1
-            )
-            frame = alpha_blend(title_bg, frame, 0.2)
-            
-            cv2.putText(
+            draw_text(
                 frame, self.title,
                 (self.x + CARD_PADDING + 5, self.y + 28),
                 FONT_FACE, FONT_SCALE_SMALL, COLOR_TEXT,
-                FONT_THICKNESS_THIN, cv2.LINE_AA
+                FONT_THICKNESS_THIN
             )
         
         return frame
     
+    def _build_chrome(self, hover, glow, margin):
+        """Rasterize the static parts of the card into a sprite"""
+        w, h = self.width, self.height
+        builder = SpriteBuilder(w, h, margin)
+        
+        if glow:
+            glow = create_glow_layer(w, h, self.border_color, margin)
+            builder.glow_layer(glow, GLOW_INTENSITY)
+        
+        # Border
+        border_alpha = GLASS_BORDER_ALPHA if not hover else 0.6
+        builder.shape_layer(
+            lambda mask, dx, dy, value: draw_rounded_rectangle(
+                mask, dx, dy, w, h, 15, value, 2
+            ),
+            self.border_color, border_alpha
+        )
+        
+        # Title bar
+        if self.title:
+            builder.shape_layer(
+                lambda mask, dx, dy, value: cv2.rectangle(
+                    mask, (dx + CARD_PADDING, dy + 10),
+                    (dx + w - CARD_PADDING, dy + 35), value, -1
+                ),
+                self.border_color, 0.2
+            )
+        
+        return builder.build()
+    
+    def frame_brightness(self):
+        """The hover glow dims the entire frame"""
+        return 1 - GLOW_INTENSITY if self.state == "hover" else 1.0
+    
     def get_content_area(self):
         """Get the usable content area inside the card"""
         return (
@@ -0,0 +1,133 @@
+"""
+Spatial Hit-Testing Index
+Uniform grid over hit target bounds, so hover and pinch lookups only test
+the targets near the cursor
+"""
+
+from collections import defaultdict
+
+from config import HIT_GRID_CELL_SIZE
+
+
+class _Layer:
+    """Targets sharing one coordinate transform (e.g. a scrolled list)"""
+
+    def __init__(self):
+        self.offset = (0, 0)  # Content scroll: screen = content - offset
+        self.clip = None  # Screen-space (x, y, w, h) outside which nothing hits
+        self.cells = defaultdict(set)
+
+
+class HitIndex:
+    """
+    Targets are hashable keys (components, or names for plain rects) with
+    an (x, y, w, h) rect in their layer's coordinates. The topmost target
+    is the one with the highest z; among equal z, the latest inserted
+    """
+
+    def __init__(self, cell_size=HIT_GRID_CELL_SIZE):
+        self.cell_size = cell_size
+        self._layers = {None: _Layer()}  # None: plain screen coordinates
+        self._entries = {}  # key -> [rect, z, layer, order, active, cells]
+        self._order = 0
+
+    def _cells_for(self, rect):
+        x, y, w, h = rect
+        size = self.cell_size
+        return [
+            (cx, cy)
+            for cx in range(int(x) // size, int(x + w) // size + 1)
+            for cy in range(int(y) // size, int(y + h) // size + 1)
+        ]
+
+    def set_layer(self, layer, offset=None, clip=None):
+        """Set a layer's scroll offset (dx, dy) and/or screen clip rect"""
+        state = self._layers.setdefault(layer, _Layer())
+        if offset is not None:
+            state.offset = offset
+        if clip is not None:
+            state.clip = clip
+
+    def insert(self, key, rect, z=0, layer=None):
+        """Add a target (or replace it if the key exists)"""
+        if key in self._entries:
+            self.remove(key)
+        state = self._layers.setdefault(layer, _Layer())
+        cells = self._cells_for(rect)
+        for cell in cells:
+            state.cells[cell].add(key)
+        self._order += 1
+        self._entries[key] = [rect, z, layer, self._order, True, cells]
+
+    def update(self, key, rect):
+        """Move a target; only the grid cells it enters or leaves change"""
+        entry = self._entries[key]
+        if rect == entry[0]:
+            return
+        cells = self._layers[entry[2]].cells
+        new_cells = self._cells_for(rect)
+        old_set, new_set = set(entry[5]), set(new_cells)
+        for cell in old_set - new_set:
+            cells[cell].discard(key)
+            if not cells[cell]:
+                del cells[cell]
+        for cell in new_set - old_set:
+            cells[cell].add(key)
+        entry[0] = rect
+        entry[5] = new_cells
+
+    def remove(self, key):
+        """Remove a target if present"""
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        cells = self._layers[entry[2]].cells
+        for cell in entry[5]:
+            cells[cell].discard(key)
+            if not cells[cell]:
+                del cells[cell]
+
+    def clear(self, layer=None):
+        """Remove every target in a layer"""
+        for key in [k for k, entry in self._entries.items() if entry[2] == layer]:
+            self.remove(key)
+
+    def set_active(self, key, active):
+        """Temporarily exclude a target from hits (e.g. a hidden button)"""
+        if key in self._entries:
+            self._entries[key][4] = active
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def query(self, x, y, accept=None):
+        """
+        Topmost active target containing screen point (x, y), or None
+        accept(key) can restrict which targets count
+        """
+        best = None
+        best_rank = None
+        size = self.cell_size
+        for state in self._layers.values():
+            if state.clip is not None:
+                cx, cy, cw, ch = state.clip
+                if not (cx <= x <= cx + cw and cy <= y <= cy + ch):
+                    continue
+            # Screen point into layer coordinates
+            lx, ly = x + state.offset[0], y + state.offset[1]
+            for key in state.cells.get((int(lx) // size, int(ly) // size), ()):
+                rect, z, _, order, active, _ = self._entries[key]
+                if not active or (accept is not None and not accept(key)):
+                    continue
+                rx, ry, rw, rh = rect
+                if rx <= lx <= rx + rw and ry <= ly <= ry + rh:
+                    rank = (z, order)
+                    if best_rank is None or rank > best_rank:
+                        best, best_rank = key, rank
+        return best
+
+    def to_screen(self, key):
+        """A target's rect in screen coordinates"""
+        rect, _, layer, _, _, _ = self._entries[key]
+        dx, dy = self._layers[layer].offset
+        return (rect[0] - dx, rect[1] - dy, rect[2], rect[3])
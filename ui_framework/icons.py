@@ -1,12 +1,15 @@
 """
 Icon Rendering using OpenCV Primitives
+Icons are rasterized once per size into the text/icon atlas and tinted
 """
 
 import cv2
 import numpy as np
+from ui_framework.text_atlas import cached_icon
 from config import *
 
 
+@cached_icon
 def draw_cart_icon(frame, x, y, size, color):
     """Draw a shopping cart icon"""
     # Cart body
@@ -27,6 +30,7 @@ def draw_cart_icon(frame, x, y, size, color):
     cv2.circle(frame, (x + 2*size//3, y + 3*size//4), size//10, color, -1)
 
 
+@cached_icon
 def draw_category_icon(frame, x, y, size, color, icon_type="food"):
     """Draw category icons"""
     if icon_type == "food":
@@ -75,6 +79,7 @@ def draw_category_icon(frame, x, y, size, color, icon_type="food"):
         cv2.polylines(frame, [pts], True, color, 2)
 
 
+@cached_icon
 def draw_plus_icon(frame, x, y, size, color):
     """Draw a plus (+) icon"""
     cv2.line(frame, (x + size//2, y + size//4), 
@@ -83,12 +88,14 @@ def draw_plus_icon(frame, x, y, size, color):
             (x + 3*size//4, y + size//2), color, 2)
 
 
+@cached_icon
 def draw_minus_icon(frame, x, y, size, color):
     """Draw a minus (-) icon"""
     cv2.line(frame, (x + size//4, y + size//2), 
             (x + 3*size//4, y + size//2), color, 2)
 
 
+@cached_icon
 def draw_back_arrow(frame, x, y, size, color):
     """Draw a back arrow <-"""
     # Arrow head
@@ -103,6 +110,7 @@ def draw_back_arrow(frame, x, y, size, color):
             (x + 2*size//3, y + size//2), color, 2)
 
 
+@cached_icon
 def draw_checkmark(frame, x, y, size, color):
     """Draw a checkmark icon"""
     pts = np.array([
@@ -113,6 +121,7 @@ def draw_checkmark(frame, x, y, size, color):
     cv2.polylines(frame, [pts], False, color, 3)
 
 
+@cached_icon
 def draw_home_icon(frame, x, y, size, color):
     """Draw a home icon"""
     # Roof
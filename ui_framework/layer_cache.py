@@ -0,0 +1,74 @@
+"""
+Layer Cache
+Bounded LRU cache for static image layers (gradients, backgrounds)
+that are identical from frame to frame
+"""
+
+from collections import OrderedDict
+
+from config import LAYER_CACHE_MAX_BYTES
+
+
+class LayerCache:
+    def __init__(self, max_bytes=LAYER_CACHE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._layers = OrderedDict()  # key -> read-only array, oldest first
+        self.current_bytes = 0
+
+        # Statistics
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key, factory):
+        """
+        Get the layer for key, building it with factory() on a miss
+        Returned arrays are shared and read-only
+        """
+        layer = self._layers.get(key)
+        if layer is not None:
+            self._layers.move_to_end(key)
+            self.hits += 1
+            return layer
+
+        self.misses += 1
+        layer = factory()
+        layer.flags.writeable = False
+
+        # Layers bigger than the whole cache are handed out uncached
+        if layer.nbytes > self.max_bytes:
+            return layer
+
+        self._layers[key] = layer
+        self.current_bytes += layer.nbytes
+        self._evict()
+        return layer
+
+    def _evict(self):
+        """Drop least recently used layers until under the memory cap"""
+        while self.current_bytes > self.max_bytes and self._layers:
+            _, layer = self._layers.popitem(last=False)
+            self.current_bytes -= layer.nbytes
+            self.evictions += 1
+
+    def clear(self):
+        """Remove all cached layers"""
+        self._layers.clear()
+        self.current_bytes = 0
+
+    def get_stats(self):
+        """Get cache statistics"""
+        lookups = self.hits + self.misses
+        return {
+            'entries': len(self._layers),
+            'bytes': self.current_bytes,
+            'max_bytes': self.max_bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+        }
+
+
+# Shared cache used by screens and components
+layer_cache = LayerCache()
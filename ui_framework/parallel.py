@@ -0,0 +1,105 @@
+"""
+Band-Parallel Compositing
+Splits full-frame blends, blurs and copies into horizontal bands and runs
+them on a thread pool; OpenCV releases the GIL while it works, so the
+bands use separate cores
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+import cv2
+import numpy as np
+from config import RENDER_WORKERS, RENDER_BAND_MIN_ROWS
+
+
+class BandCompositor:
+    """
+    Every operation gives exactly the same pixels as doing it in one
+    pass: blends and copies are per pixel, and blurs read a halo of real
+    neighbouring rows around each band
+    With fewer than two workers everything runs serially on the caller
+    """
+
+    def __init__(self, workers=RENDER_WORKERS, min_rows=RENDER_BAND_MIN_ROWS):
+        self.min_rows = min_rows  # Smaller bands cost more to hand off than to run
+        self.workers = 0
+        self._pool = None
+        self.set_workers(workers)
+
+    def set_workers(self, workers):
+        """Resize the pool (0 or 1 = serial)"""
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
+        self.workers = max(0, workers)
+        if self.workers > 1:
+            # The calling thread takes one band itself
+            self._pool = ThreadPoolExecutor(
+                max_workers=self.workers - 1, thread_name_prefix='render-band'
+            )
+
+    def bands(self, y1, y2):
+        """Split rows [y1, y2) into (band_y1, band_y2) ranges, one per worker"""
+        rows = y2 - y1
+        count = max(1, min(self.workers, rows // self.min_rows))
+        edges = [y1 + rows * i // count for i in range(count + 1)]
+        return list(zip(edges[:-1], edges[1:]))
+
+    def run(self, func, y1, y2):
+        """Call func(band_y1, band_y2) for every band of rows [y1, y2) and wait"""
+        if self._pool is None or y2 - y1 < 2 * self.min_rows:
+            func(y1, y2)
+            return
+        bands = self.bands(y1, y2)
+        futures = [self._pool.submit(func, a, b) for a, b in bands[1:]]
+        func(*bands[0])
+        for future in futures:
+            future.result()  # Re-raises worker errors
+
+    def blend(self, foreground, background, alpha):
+        """alpha_blend into a new image"""
+        if self._pool is None or background.shape[0] < 2 * self.min_rows:
+            return cv2.addWeighted(foreground, alpha, background, 1 - alpha, 0)
+        dst = np.empty_like(background)
+        self.run(
+            lambda a, b: cv2.addWeighted(
+                foreground[a:b], alpha, background[a:b], 1 - alpha, 0, dst=dst[a:b]
+            ),
+            0, dst.shape[0]
+        )
+        return dst
+
+    def scale(self, frame, factor):
+        """Scale every pixel of frame by factor, in place"""
+        self.run(
+            lambda a, b: cv2.addWeighted(frame[a:b], factor, frame[a:b], 0, 0, dst=frame[a:b]),
+            0, frame.shape[0]
+        )
+        return frame
+
+    def copy(self, dst, src):
+        """Copy src into dst (same shape)"""
+        def copy_band(a, b):
+            dst[a:b] = src[a:b]
+        self.run(copy_band, 0, src.shape[0])
+        return dst
+
+    def blur(self, src, dst, kernel_size, box=False):
+        """Gaussian (or box) blur src into dst (same shape)"""
+        h = src.shape[0]
+        radius = kernel_size // 2
+
+        def blur_band(a, b):
+            wa, wb = max(0, a - radius), min(h, b + radius)
+            if box:
+                window = cv2.blur(src[wa:wb], (kernel_size, kernel_size))
+            else:
+                window = cv2.GaussianBlur(src[wa:wb], (kernel_size, kernel_size), 0)
+            dst[a:b] = window[a - wa:b - wa]
+
+        self.run(blur_band, 0, h)
+        return dst
+
+
+# Shared compositor for the render path
+band_compositor = BandCompositor()
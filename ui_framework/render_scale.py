@@ -0,0 +1,68 @@
+"""
+Internal Render Resolution
+The camera background and full-frame effects can be composited at a
+fraction of the screen resolution and upscaled once; components, text
+and the cursor are then drawn at full resolution on top
+"""
+
+from fractions import Fraction
+
+import cv2
+import numpy as np
+from config import RENDER_SCALE, SCREEN_WIDTH, SCREEN_HEIGHT
+
+
+class RenderScaler:
+    """
+    Layout, hit-testing and the cursor always use screen pixels; only the
+    background passes (camera frame, gradient blend, glass blur) run at
+    the internal size
+    """
+
+    def __init__(self, scale=RENDER_SCALE, width=SCREEN_WIDTH, height=SCREEN_HEIGHT):
+        self.width = width
+        self.height = height
+        self._output = None  # Reused upscale target
+        self.set_scale(scale)
+
+    def set_scale(self, scale):
+        """
+        Change the internal resolution (1.0 = screen resolution)
+        The scale is snapped to a fraction with a small denominator, so
+        blurred regions can be aligned to whole internal pixels
+        """
+        ratio = Fraction(min(max(scale, 0.1), 1.0)).limit_denominator(8)
+        self.ratio = (ratio.numerator, ratio.denominator)
+        self.scale = float(ratio)
+        self.internal_size = (
+            max(1, round(self.width * self.scale)),
+            max(1, round(self.height * self.scale)),
+        )
+
+    @property
+    def enabled(self):
+        return self.scale < 1.0
+
+    def upscale(self, frame):
+        """
+        Bring an internal-resolution frame up to the screen size
+        Screen-size frames are returned as they are. The result is a
+        shared buffer, overwritten by the next call
+        """
+        if frame.shape[1] == self.width and frame.shape[0] == self.height:
+            return frame
+        if self._output is None:
+            self._output = np.empty((self.height, self.width, 3), dtype=np.uint8)
+        cv2.resize(frame, (self.width, self.height), dst=self._output,
+                   interpolation=cv2.INTER_LINEAR)
+        return self._output
+
+    def downscale(self, frame):
+        """A screen-size frame at the internal resolution (a new image)"""
+        if not self.enabled:
+            return frame
+        return cv2.resize(frame, self.internal_size, interpolation=cv2.INTER_LINEAR)
+
+
+# Shared scaler for the main loop, screens and backdrop
+render_scaler = RenderScaler()
@@ -5,6 +5,17 @@ Provides alpha blending, blur effects, gradients, shadows, and glow
 
 import cv2
 import numpy as np
+from ui_framework.layer_cache import layer_cache
+from ui_framework.parallel import band_compositor
+from ui_framework import text_atlas
+from ui_framework.text_atlas import draw_text, wrap_text, ellipsize_text
+
+
+# Glow geometry: outermost outline offset plus its thickness, and blur size
+GLOW_OUTLINE_MARGIN = 10 + 2
+GLOW_BLUR_SIZE = 25
+# Distance from a rectangle that its glow can reach
+GLOW_MARGIN = GLOW_OUTLINE_MARGIN + GLOW_BLUR_SIZE // 2
 
 
 def alpha_blend(foreground, background, alpha):
@@ -12,7 +23,7 @@ def alpha_blend(foreground, background, alpha):
     Blend foreground onto background with alpha transparency
     alpha: 0.0 (transparent) to 1.0 (opaque)
     """
-    return cv2.addWeighted(foreground, alpha, background, 1 - alpha, 0)
+    return band_compositor.blend(foreground, background, alpha)
 
 
 def apply_gaussian_blur(image, kernel_size=21):
@@ -22,84 +33,220 @@ def apply_gaussian_blur(image, kernel_size=21):
     return cv2.GaussianBlur(image, (kernel_size, kernel_size), 0)
 
 
+def apply_box_blur(image, kernel_size=21):
+    """Apply a box blur: cheaper than Gaussian, used at reduced quality"""
+    return cv2.blur(image, (kernel_size, kernel_size))
+
+
+def _interpolate_colors(ratio, color1, color2):
+    """
+    Blend two colors by ratio (array of any shape, 0-1)
+    Returns uint8 colors with shape ratio.shape + (3,)
+    """
+    ratio = ratio[..., None]
+    c1 = np.asarray(color1, dtype=np.float64)
+    c2 = np.asarray(color2, dtype=np.float64)
+    # Same arithmetic as the per-pixel int() version: truncate toward zero
+    return (c1 * (1 - ratio) + c2 * ratio).astype(np.uint8)
+
+
 def create_gradient(width, height, color1, color2, vertical=True):
     """
     Create a gradient image
     vertical: True for top-to-bottom, False for left-to-right
     """
-    gradient = np.zeros((height, width, 3), dtype=np.uint8)
+    if vertical:
+        ratio = np.arange(height) / height
+        colors = _interpolate_colors(ratio, color1, color2)
+        return np.ascontiguousarray(np.broadcast_to(colors[:, None, :], (height, width, 3)))
+    
+    ratio = np.arange(width) / width
+    colors = _interpolate_colors(ratio, color1, color2)
+    return np.ascontiguousarray(np.broadcast_to(colors[None, :, :], (height, width, 3)))
+
+
+def create_multi_stop_gradient(width, height, stops, vertical=True):
+    """
+    Create a gradient through several colors
+    stops: list of (position, color) with positions from 0.0 to 1.0
+    """
+    stops = sorted(stops, key=lambda stop: stop[0])
+    positions = np.array([position for position, _ in stops], dtype=np.float64)
+    colors = np.array([color for _, color in stops], dtype=np.float64)
+    
+    length = height if vertical else width
+    ratio = np.arange(length) / length
+    
+    # Interpolate each channel between the surrounding stops
+    line = np.stack(
+        [np.interp(ratio, positions, colors[:, i]) for i in range(3)], axis=-1
+    ).astype(np.uint8)
     
     if vertical:
-        for y in range(height):
-            ratio = y / height
-            color = [
-                int(color1[i] * (1 - ratio) + color2[i] * ratio)
-                for i in range(3)
-            ]
-            gradient[y, :] = color
-    else:
-        for x in range(width):
-            ratio = x / width
-            color = [
-                int(color1[i] * (1 - ratio) + color2[i] * ratio)
-                for i in range(3)
-            ]
-            gradient[:, x] = color
+        return np.ascontiguousarray(np.broadcast_to(line[:, None, :], (height, width, 3)))
+    return np.ascontiguousarray(np.broadcast_to(line[None, :, :], (height, width, 3)))
+
+
+def create_diagonal_gradient(width, height, color1, color2, reverse=False):
+    """
+    Create a diagonal gradient
+    Runs from top-left to bottom-right, or top-right to bottom-left if reverse
+    """
+    xs = np.arange(width)
+    if reverse:
+        xs = xs[::-1]
+    ys = np.arange(height)
     
-    return gradient
+    # Project each pixel onto the diagonal
+    ratio = (ys[:, None] + xs[None, :]) / max(width + height - 2, 1)
+    return _interpolate_colors(ratio, color1, color2)
 
 
 def create_radial_gradient(width, height, center_color, edge_color):
     """Create a radial gradient from center to edges"""
-    gradient = np.zeros((height, width, 3), dtype=np.uint8)
     center_x, center_y = width // 2, height // 2
     max_distance = np.sqrt(center_x**2 + center_y**2)
     
-    for y in range(height):
-        for x in range(width):
-            distance = np.sqrt((x - center_x)**2 + (y - center_y)**2)
-            ratio = min(distance / max_distance, 1.0)
-            color = [
-                int(center_color[i] * (1 - ratio) + edge_color[i] * ratio)
-                for i in range(3)
-            ]
-            gradient[y, x] = color
+    dx = (np.arange(width) - center_x) ** 2
+    dy = (np.arange(height) - center_y) ** 2
+    distance = np.sqrt(dy[:, None] + dx[None, :])
+    ratio = np.minimum(distance / max_distance, 1.0)
     
-    return gradient
+    return _interpolate_colors(ratio, center_color, edge_color)
 
 
-def add_soft_shadow(frame, x, y, w, h, offset=10, blur=15, alpha=0.3):
-    """Add a soft shadow behind a rectangle"""
-    shadow = np.zeros_like(frame)
-    cv2.rectangle(
-        shadow,
-        (x + offset, y + offset),
-        (x + w + offset, y + h + offset),
-        (0, 0, 0),
-        -1
+def get_cached_gradient(width, height, color1, color2, vertical=True):
+    """Shared read-only gradient layer from the layer cache"""
+    key = ('gradient', width, height, tuple(color1), tuple(color2), vertical)
+    return layer_cache.get(
+        key, lambda: create_gradient(width, height, color1, color2, vertical)
     )
-    shadow = cv2.GaussianBlur(shadow, (blur, blur), 0)
-    return alpha_blend(shadow, frame, alpha)
+
+
+def get_cached_radial_gradient(width, height, center_color, edge_color):
+    """Shared read-only radial gradient layer from the layer cache"""
+    key = ('radial', width, height, tuple(center_color), tuple(edge_color))
+    return layer_cache.get(
+        key, lambda: create_radial_gradient(width, height, center_color, edge_color)
+    )
+
+
+def scale_brightness(frame, factor):
+    """Scale every pixel of frame by factor, in place"""
+    return band_compositor.scale(frame, factor)
+
+
+def _blend_blurred_layer(frame, bounds, ksize, alpha, draw):
+    """
+    Blend a blurred layer onto frame in place, working only near bounds
+    Equivalent to drawing onto a full-frame black layer, blurring the
+    whole layer and alpha_blend-ing it: the layer is black everywhere
+    except within bounds plus the blur radius
+    draw(layer, dx, dy) draws the layer content shifted by (dx, dy)
+    """
+    h, w = frame.shape[:2]
+    radius = ksize // 2
+    x1, y1, x2, y2 = bounds
+    
+    # Region where the blurred layer can be non-zero
+    ox1, oy1 = max(0, x1 - radius), max(0, y1 - radius)
+    ox2, oy2 = min(w, x2 + radius), min(h, y2 + radius)
+    
+    blended = None
+    if ox2 > ox1 and oy2 > oy1:
+        # Blur input needs one more radius of (black) context
+        sx1, sy1 = max(0, ox1 - radius), max(0, oy1 - radius)
+        sx2, sy2 = min(w, ox2 + radius), min(h, oy2 + radius)
+        
+        layer = np.zeros((sy2 - sy1, sx2 - sx1) + frame.shape[2:], dtype=frame.dtype)
+        draw(layer, -sx1, -sy1)
+        layer = cv2.GaussianBlur(layer, (ksize, ksize), 0)
+        layer_roi = layer[oy1 - sy1:oy2 - sy1, ox1 - sx1:ox2 - sx1]
+        blended = alpha_blend(layer_roi, frame[oy1:oy2, ox1:ox2], alpha)
+    
+    # Outside that region the black layer only scales the frame
+    scale_brightness(frame, 1 - alpha)
+    
+    if blended is not None:
+        frame[oy1:oy2, ox1:ox2] = blended
+    return frame
+
+
+def add_soft_shadow(frame, x, y, w, h, offset=10, blur=15, alpha=0.3):
+    """
+    Add a soft shadow behind a rectangle
+    Modifies frame in place and returns it
+    """
+    def draw(layer, dx, dy):
+        cv2.rectangle(
+            layer,
+            (x + offset + dx, y + offset + dy),
+            (x + w + offset + dx, y + h + offset + dy),
+            (0, 0, 0),
+            -1
+        )
+    
+    bounds = (x + offset, y + offset, x + w + offset + 1, y + h + offset + 1)
+    return _blend_blurred_layer(frame, bounds, blur, alpha, draw)
 
 
 def add_glow_effect(frame, x, y, w, h, color, intensity=0.6):
-    """Add a glow effect around a rectangle"""
-    glow = np.zeros_like(frame)
+    """
+    Add a glow effect around a rectangle
+    Modifies frame in place and returns it
+    """
+    def draw(layer, dx, dy):
+        draw_glow_outline(layer, x + dx, y + dy, w, h, color)
     
+    margin = GLOW_OUTLINE_MARGIN
+    bounds = (x - margin, y - margin, x + w + margin + 1, y + h + margin + 1)
+    return _blend_blurred_layer(frame, bounds, GLOW_BLUR_SIZE, intensity, draw)
+
+
+def add_text_glow(frame, text, org, font_face, font_scale, color, thickness,
+                  blur=25, intensity=0.8):
+    """
+    Add a blurred glow behind text drawn at org (baseline, like cv2.putText)
+    Modifies frame in place and returns it
+    """
+    def draw(layer, dx, dy):
+        cv2.putText(
+            layer, text, (org[0] + dx, org[1] + dy),
+            font_face, font_scale, color, thickness, cv2.LINE_AA
+        )
+    
+    (text_w, text_h), baseline = cv2.getTextSize(text, font_face, font_scale, thickness)
+    margin = thickness + 2  # Stroke and anti-aliasing beyond the text box
+    bounds = (
+        org[0] - margin, org[1] - text_h - margin,
+        org[0] + text_w + margin, org[1] + baseline + margin
+    )
+    return _blend_blurred_layer(frame, bounds, blur, intensity, draw)
+
+
+def draw_glow_outline(layer, x, y, w, h, color):
+    """Draw the unblurred outlines that make up a glow"""
     # Multiple layers for soft glow
     for i in range(3):
         thickness = 3 - i
         offset = i * 5
         cv2.rectangle(
-            glow,
+            layer,
             (x - offset, y - offset),
             (x + w + offset, y + h + offset),
             color,
             thickness
         )
-    
-    glow = cv2.GaussianBlur(glow, (25, 25), 0)
-    return alpha_blend(glow, frame, intensity)
+
+
+def create_glow_layer(w, h, color, margin):
+    """
+    Blurred glow around a w x h rectangle, on a black layer with margin
+    pixels on every side (margin should be at least GLOW_MARGIN)
+    """
+    layer = np.zeros((h + 2 * margin + 1, w + 2 * margin + 1, 3), dtype=np.uint8)
+    draw_glow_outline(layer, margin, margin, w, h, color)
+    return cv2.GaussianBlur(layer, (GLOW_BLUR_SIZE, GLOW_BLUR_SIZE), 0)
 
 
 def safe_overlay(background, overlay, x, y):
@@ -130,13 +277,19 @@ def safe_overlay(background, overlay, x, y):
     return background
 
 
-def create_glass_effect(background_roi, alpha=0.15, blur_amount=21):
+def create_glass_effect(background_roi, alpha=0.15, blur_amount=21, box_blur=False):
     """
     Create glassmorphism effect on a region of interest
     Returns the glassy version of the ROI
+    blur_amount 0 skips the blur (tint only)
     """
     # Blur the background
-    blurred = apply_gaussian_blur(background_roi, blur_amount)
+    if not blur_amount:
+        blurred = background_roi
+    elif box_blur:
+        blurred = apply_box_blur(background_roi, blur_amount)
+    else:
+        blurred = apply_gaussian_blur(background_roi, blur_amount)
     
     # Lighten slightly
     brightened = cv2.addWeighted(blurred, 1.0, blurred, 0, 30)
@@ -171,11 +324,8 @@ def draw_rounded_rectangle(frame, x, y, w, h, radius, color, thickness=-1):
 
 
 def measure_text(text, font_face, font_scale, thickness):
-    """Measure text dimensions"""
-    (text_width, text_height), baseline = cv2.getTextSize(
-        text, font_face, font_scale, thickness
-    )
-    return text_width, text_height, baseline
+    """Measure text dimensions (memoized by the text atlas)"""
+    return text_atlas.measure_text(text, font_face, font_scale, thickness)
 
 
 def draw_text_centered(frame, text, x, y, w, h, color, font_face, font_scale, thickness):
@@ -185,7 +335,4 @@ def draw_text_centered(frame, text, x, y, w, h, color, font_face, font_scale, th
     text_x = x + (w - text_w) // 2
     text_y = y + (h + text_h) // 2
     
-    cv2.putText(
-        frame, text, (text_x, text_y),
-        font_face, font_scale, color, thickness, cv2.LINE_AA
-    )
+    draw_text(frame, text, (text_x, text_y), font_face, font_scale, color, thickness)
@@ -0,0 +1,72 @@
+"""
+Retained Scene Graph
+Keeps a screen's components as persistent nodes, drawn in z-order each
+frame, instead of rebuilding them on every render
+"""
+
+
+class SceneNode:
+    """
+    A component in a scene, plus optional content drawn on top of it
+    content(frame, node) draws the node's text, icons etc. from node.data
+    """
+
+    def __init__(self, component, z=0, content=None, data=None):
+        self.component = component
+        self.z = z
+        self.content = content
+        self.data = data
+
+    def set_data(self, data):
+        """Replace the data the content is drawn from"""
+        self.data = data
+
+    def draw(self, frame):
+        """Render the component and its content"""
+        frame = self.component.render(frame)
+        if self.content:
+            self.content(frame, self)
+        return frame
+
+
+class SceneGraph:
+    """
+    Nodes are drawn in z-order (insertion order for equal z)
+    Every visible node is redrawn each frame: glass blurs the camera
+    behind it, which changes every frame, so saved pixels are never valid
+    """
+
+    def __init__(self):
+        self.nodes = []
+
+    def add(self, component, z=0, content=None, data=None):
+        """Add a component; returns its node"""
+        node = SceneNode(component, z, content, data)
+        self.nodes.append(node)
+        self.nodes.sort(key=lambda n: n.z)  # Stable, so insertion order breaks ties
+        return node
+
+    def remove(self, node):
+        """Remove a node"""
+        self.nodes.remove(node)
+
+    def clear(self):
+        """Remove every node"""
+        self.nodes.clear()
+
+    def node_at(self, x, y):
+        """Topmost visible node containing (x, y), or None"""
+        for node in reversed(self.nodes):
+            if node.component.visible and node.component.is_point_inside(x, y):
+                return node
+        return None
+
+    def render(self, frame):
+        """
+        Draw every visible node onto frame
+        Call after the screen background and backdrop.update()
+        """
+        for node in self.nodes:
+            if node.component.visible:
+                frame = node.draw(frame)
+        return frame
@@ -0,0 +1,230 @@
+"""
+Text and Icon Atlas
+Pre-rasterizes strings and icons into alpha masks that are tinted and
+blitted onto the frame, instead of redrawing them every frame
+"""
+
+import functools
+import os
+
+import cv2
+import numpy as np
+from ui_framework.layer_cache import LayerCache
+from config import TEXT_ATLAS_MAX_BYTES, UNICODE_FONT_PATHS, GLYPH_FALLBACKS
+
+try:
+    from PIL import Image, ImageDraw, ImageFont
+except ImportError:  # Optional: without Pillow, non-ASCII text uses GLYPH_FALLBACKS
+    ImageFont = None
+
+
+# Extra room around text masks for anti-aliased edges
+MASK_PADDING = 2
+
+# Shared cache for text and icon masks
+atlas_cache = LayerCache(TEXT_ATLAS_MAX_BYTES)
+
+
+@functools.lru_cache(maxsize=1)
+def _unicode_font_path():
+    """First configured TrueType font that exists, or None"""
+    if ImageFont is None:
+        return None
+    for path in UNICODE_FONT_PATHS:
+        if os.path.exists(path):
+            return path
+    return None
+
+
+@functools.lru_cache(maxsize=32)
+def _unicode_font(font_face, font_scale, thickness):
+    """TrueType font sized so its capitals match the Hershey font"""
+    path = _unicode_font_path()
+    if path is None:
+        return None
+    (_, cap_height), _ = cv2.getTextSize("H", font_face, font_scale, thickness)
+    reference = ImageFont.truetype(path, 100)
+    _, top, _, bottom = reference.getbbox("H", anchor="ls")
+    size = max(1, round(100 * cap_height / (bottom - top)))
+    return ImageFont.truetype(path, size)
+
+
+@functools.lru_cache(maxsize=256)
+def _has_glyph(char):
+    """Check that the Unicode font has a real glyph (not the missing-glyph box)"""
+    font = _unicode_font(cv2.FONT_HERSHEY_SIMPLEX, 1.0, 1)
+    if font is None:
+        return False
+    missing = font.getmask("￿")
+    glyph = font.getmask(char)
+    return glyph.size != missing.size or bytes(glyph) != bytes(missing)
+
+
+@functools.lru_cache(maxsize=4096)
+def _segments(text):
+    """
+    Split text into ('ascii', str) runs drawn with Hershey fonts and
+    ('glyph', char) entries drawn with the Unicode font
+    """
+    segments = []
+    run = ""
+    for char in text:
+        if char.isascii():
+            run += char
+        elif _has_glyph(char):
+            if run:
+                segments.append(('ascii', run))
+                run = ""
+            segments.append(('glyph', char))
+        else:
+            run += GLYPH_FALLBACKS.get(char, "?")
+    if run:
+        segments.append(('ascii', run))
+    return tuple(segments)
+
+
+def _glyph_stroke(thickness):
+    return 1 if thickness >= 2 else 0
+
+
+@functools.lru_cache(maxsize=4096)
+def measure_text(text, font_face, font_scale, thickness):
+    """
+    Measure text as draw_text renders it
+    Returns (width, height above baseline, baseline), like cv2.getTextSize
+    """
+    width = height = baseline = 0
+    for kind, value in _segments(text):
+        if kind == 'ascii':
+            (w, h), b = cv2.getTextSize(value, font_face, font_scale, thickness)
+        else:
+            font = _unicode_font(font_face, font_scale, thickness)
+            stroke = _glyph_stroke(thickness)
+            left, top, right, bottom = font.getbbox(value, anchor="ls", stroke_width=stroke)
+            w = max(int(np.ceil(font.getlength(value))), right) + stroke
+            h, b = -top, max(0, bottom)
+        width += w
+        height = max(height, h)
+        baseline = max(baseline, b)
+    return width, height, baseline
+
+
+@functools.lru_cache(maxsize=1024)
+def wrap_text(text, max_width, font_face, font_scale, thickness):
+    """Break text into lines no wider than max_width (returns a tuple)"""
+    lines = []
+    line = ""
+    for word in text.split():
+        candidate = f"{line} {word}" if line else word
+        if line and measure_text(candidate, font_face, font_scale, thickness)[0] > max_width:
+            lines.append(line)
+            line = word
+        else:
+            line = candidate
+    if line:
+        lines.append(line)
+    return tuple(lines)
+
+
+@functools.lru_cache(maxsize=1024)
+def ellipsize_text(text, max_width, font_face, font_scale, thickness):
+    """Shorten text with a trailing '...' so it fits in max_width"""
+    if measure_text(text, font_face, font_scale, thickness)[0] <= max_width:
+        return text
+
+    # Longest prefix that still fits with the ellipsis
+    low, high = 0, len(text)
+    while low < high:
+        mid = (low + high + 1) // 2
+        if measure_text(text[:mid].rstrip() + "...", font_face, font_scale, thickness)[0] <= max_width:
+            low = mid
+        else:
+            high = mid - 1
+    return text[:low].rstrip() + "..."
+
+
+def _rasterize_text(text, font_face, font_scale, thickness):
+    """Render text into an anti-aliased alpha mask"""
+    width, height, baseline = measure_text(text, font_face, font_scale, thickness)
+    pad = MASK_PADDING + thickness
+    mask = np.zeros((height + baseline + 2 * pad, width + 2 * pad), dtype=np.uint8)
+
+    x = pad
+    origin_y = pad + height
+    for kind, value in _segments(text):
+        if kind == 'ascii':
+            cv2.putText(
+                mask, value, (x, origin_y),
+                font_face, font_scale, 255, thickness, cv2.LINE_AA
+            )
+            (w, _), _ = cv2.getTextSize(value, font_face, font_scale, thickness)
+        else:
+            font = _unicode_font(font_face, font_scale, thickness)
+            stroke = _glyph_stroke(thickness)
+            image = Image.fromarray(mask)
+            ImageDraw.Draw(image).text(
+                (x, origin_y), value, font=font, fill=255,
+                anchor="ls", stroke_width=stroke, stroke_fill=255
+            )
+            mask = np.array(image)
+            w = measure_text(value, font_face, font_scale, thickness)[0]
+        x += w
+    return mask
+
+
+def blit_mask(frame, mask, x, y, color):
+    """Tint an alpha mask with color and blend it onto frame at (x, y), in place"""
+    frame_h, frame_w = frame.shape[:2]
+    mask_h, mask_w = mask.shape[:2]
+
+    x1, y1 = max(0, x), max(0, y)
+    x2, y2 = min(frame_w, x + mask_w), min(frame_h, y + mask_h)
+    if x2 <= x1 or y2 <= y1:
+        return frame
+
+    alpha = mask[y1 - y:y2 - y, x1 - x:x2 - x, None].astype(np.uint16)
+    roi = frame[y1:y2, x1:x2]
+    color = np.asarray(color, dtype=np.uint16)
+    roi[:] = (roi * (255 - alpha) + color * alpha + 127) // 255
+    return frame
+
+
+def draw_text(frame, text, org, font_face, font_scale, color, thickness=1):
+    """
+    Draw text with its baseline starting at org, like cv2.putText
+    Supports non-ASCII characters such as the currency symbol
+    """
+    if not text:
+        return frame
+    _, height, _ = measure_text(text, font_face, font_scale, thickness)
+    mask = atlas_cache.get(
+        ('text', text, font_face, font_scale, thickness),
+        lambda: _rasterize_text(text, font_face, font_scale, thickness)
+    )
+    pad = MASK_PADDING + thickness
+    return blit_mask(frame, mask, org[0] - pad, org[1] - height - pad, color)
+
+
+def cached_icon(draw):
+    """
+    Decorator for icon functions draw(frame, x, y, size, color, ...)
+    The icon is rasterized once per size and extra arguments, then tinted
+    on every draw
+    """
+    @functools.wraps(draw)
+    def draw_cached(frame, x, y, size, color, *args, **kwargs):
+        pad = 4 + size // 4
+        mask = atlas_cache.get(
+            ('icon', draw.__name__, size, args, tuple(sorted(kwargs.items()))),
+            lambda: _rasterize_icon(draw, size, pad, args, kwargs)
+        )
+        return blit_mask(frame, mask, x - pad, y - pad, color)
+
+    draw_cached.uncached = draw
+    return draw_cached
+
+
+def _rasterize_icon(draw, size, pad, args, kwargs):
+    mask = np.zeros((size + 2 * pad, size + 2 * pad), dtype=np.uint8)
+    draw(mask, pad, pad, size, 255, *args, **kwargs)
+    return mask
@@ -0,0 +1,210 @@
+"""
+Virtualized Scrolling List
+Binds only the rows in view (plus a little overscan) to a small pool of
+recycled components, and scrolls them with drag and momentum
+"""
+
+import math
+
+from ui_framework.rendering_utils import GLOW_MARGIN, scale_brightness
+from ui_framework.scene_graph import SceneGraph
+from config import *
+
+
+class VirtualList:
+    """
+    Rows are laid out in content coordinates, one every row_height +
+    spacing pixels starting padding below the top of the viewport
+    (x, y, width, height); screen y = content y - scroll_offset. Only rows
+    intersecting the viewport are drawn, clipped to it
+
+    create_row() builds a new pooled component (sized width x row_height)
+    content(frame, node) draws a row's details; node.data is its item
+    bind(row, index) / release(row) are called as rows enter and leave
+    the bound range
+    """
+
+    def __init__(self, x, y, width, height, row_height, create_row, content=None,
+                 spacing=15, padding=0, bind=None, release=None,
+                 overscan=LIST_OVERSCAN_ROWS):
+        self.x = x
+        self.y = y
+        self.width = width
+        self.height = height
+        self.row_height = row_height
+        self.spacing = spacing
+        self.padding = padding  # Space above the first row and below the last
+        self.overscan = overscan
+        self.create_row = create_row
+        self.content = content
+        self.bind = bind
+        self.release = release
+
+        self.scene = SceneGraph()
+        self.items = []
+        self.rows = {}  # Item index -> bound scene node
+        self._pool = []  # Released nodes, ready for reuse
+
+        # Scrolling
+        self.scroll_offset = 0.0
+        self.velocity = 0.0  # Pixels/s, positive scrolls down the list
+        self.dragging = False
+        self._press_y = None  # Where the current drag started
+        self._drag_y = None
+        self._drag_time = None
+        self._last_update = None
+
+    @property
+    def pitch(self):
+        return self.row_height + self.spacing
+
+    @property
+    def max_offset(self):
+        content_height = len(self.items) * self.pitch - self.spacing + 2 * self.padding
+        return max(0, content_height - self.height)
+
+    def set_items(self, items):
+        """Show a new list of items, scrolled to the top"""
+        for index in list(self.rows):
+            self._release(index)
+        self.items = items
+        self.scroll_offset = 0.0
+        self.velocity = 0.0
+        self.dragging = False
+        self._press_y = None
+        self._last_update = None
+        self.layout()
+
+    def row_rect(self, index):
+        """A row's (x, y, w, h) in content coordinates"""
+        return (self.x, self.y + self.padding + index * self.pitch, self.width, self.row_height)
+
+    def contains(self, px, py):
+        """True if a screen point is inside the viewport"""
+        return (self.x <= px <= self.x + self.width
+                and self.y <= py <= self.y + self.height)
+
+    def visible_range(self):
+        """Item indices [first, last) intersecting the viewport"""
+        top = self.scroll_offset - self.padding
+        first = int(top // self.pitch)
+        last = int((top + self.height) // self.pitch) + 1
+        return max(0, first), min(len(self.items), last)
+
+    def _release(self, index):
+        node = self.rows.pop(index)
+        row = node.component
+        row.visible = False
+        if row.state == "hover":
+            row.state = "normal"
+        if self.release:
+            self.release(row)
+        self._pool.append(node)
+
+    def layout(self):
+        """Bind rows entering the overscanned range, recycle those leaving it"""
+        first, last = self.visible_range()
+        bound_first = max(0, first - self.overscan)
+        bound_last = min(len(self.items), last + self.overscan)
+
+        for index in list(self.rows):
+            if not bound_first <= index < bound_last:
+                self._release(index)
+
+        for index in range(bound_first, bound_last):
+            node = self.rows.get(index)
+            if node is None:
+                if self._pool:
+                    node = self._pool.pop()
+                else:
+                    node = self.scene.add(self.create_row(), content=self.content)
+                node.set_data(self.items[index])
+                node.component.index = index
+                self.rows[index] = node
+                if self.bind:
+                    self.bind(node.component, index)
+
+            row = node.component
+            row.x = self.x
+            row.y = int(round(self.row_rect(index)[1] - self.scroll_offset))
+            row.visible = first <= index < last
+
+    def scroll_to(self, offset):
+        """Jump to a scroll offset (clamped to the content)"""
+        self.scroll_offset = float(min(max(offset, 0), self.max_offset))
+        self.layout()
+
+    def drag(self, py, current_time):
+        """Follow a pinch or mouse drag at screen y"""
+        if self._press_y is None:
+            self._press_y = self._drag_y = py
+            self._drag_time = current_time
+            self.velocity = 0.0
+            return
+        if not self.dragging:
+            if abs(py - self._press_y) < SCROLL_DRAG_SLOP:
+                return
+            self.dragging = True
+
+        delta = py - self._drag_y
+        dt = current_time - self._drag_time
+        self.scroll_to(self.scroll_offset - delta)
+        if dt > 0:
+            # Smoothed, so one jittery sample doesn't decide the fling
+            self.velocity = 0.7 * (-delta / dt) + 0.3 * self.velocity
+        self._drag_y = py
+        self._drag_time = current_time
+
+    def release_drag(self, current_time):
+        """End a drag; the list keeps moving with the drag's velocity"""
+        if self.dragging and current_time - self._drag_time < 0.1:
+            self.velocity = max(-SCROLL_MAX_VELOCITY, min(self.velocity, SCROLL_MAX_VELOCITY))
+        else:
+            self.velocity = 0.0  # Held still before letting go
+        self.dragging = False
+        self._press_y = None
+
+    def update(self, current_time):
+        """Advance momentum scrolling"""
+        dt = 0.0 if self._last_update is None else current_time - self._last_update
+        self._last_update = current_time
+        if self.dragging or not self.velocity or dt <= 0:
+            return
+
+        self.scroll_to(self.scroll_offset + self.velocity * dt)
+        self.velocity *= math.exp(-SCROLL_FRICTION * dt)
+        if (abs(self.velocity) < SCROLL_MIN_VELOCITY
+                or self.scroll_offset in (0, self.max_offset)):
+            self.velocity = 0.0
+
+    def render(self, frame):
+        """
+        Draw the rows in view, clipped to the viewport
+        Call after the screen background and backdrop.update()
+        """
+        h = frame.shape[0]
+        reach = self.row_height + GLOW_MARGIN  # How far rows can draw past the edges
+        bands = [
+            (y1, y2) for y1, y2 in (
+                (max(0, self.y - reach), max(0, self.y)),
+                (min(h, self.y + self.height), min(h, self.y + self.height + reach)),
+            )
+            if y2 > y1
+        ]
+        saved = [frame[y1:y2].copy() for y1, y2 in bands]
+
+        frame = self.scene.render(frame)
+
+        # Put back what rows drew outside the viewport, keeping any
+        # whole-frame effect (hover dimming) they applied there
+        dims = [
+            node.component.frame_brightness()
+            for node in self.scene.nodes
+            if node.component.visible and node.component.affects_whole_frame()
+        ]
+        for (y1, y2), pixels in zip(bands, saved):
+            band = frame[y1:y2]
+            band[:] = pixels
+            for factor in dims:
+                scale_brightness(band, factor)
+        return frame